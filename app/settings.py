@@ -48,10 +48,14 @@ INSTALLED_APPS = [
     'task',
     'userdata',
     'book',
+    'search',
     'django_filters',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestLatencyMiddleware',
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.SQLProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,6 +63,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'app.urls'
@@ -85,13 +90,91 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
-DATABASES = {
+if os.environ.get('DB_HOST'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'HOST': os.environ.get('DB_HOST'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            'NAME': os.environ.get('DB_NAME'),
+            'USER': os.environ.get('DB_USER'),
+            'PASSWORD': os.environ.get('DB_PASS'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+            # Django 3.2 ignores this key; core.connections reads it to
+            # ping reused connections when a request starts.
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
+
+if os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ.get('DB_REPLICA_HOST'),
+        'PORT': os.environ.get(
+            'DB_REPLICA_PORT', DATABASES['default'].get('PORT'),
+        ),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.db_routers.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django_redis.cache.RedisCache',
+}
+
+# Response cache invalidation bumps versions stored in the default cache,
+# so deployments running several processes need a shared backend such as
+# redis; `manage.py check --deploy` warns about per-process ones.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': CACHE_BACKENDS.get(
+            os.environ.get('CACHE_BACKEND', 'locmem'),
+            os.environ.get('CACHE_BACKEND'),
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
     }
 }
 
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300))
+# Versions must outlive the responses keyed on them. They still expire
+# so the versions of idle users and tracks leave the cache.
+CACHE_VERSION_TIMEOUT = int(os.environ.get('CACHE_VERSION_TIMEOUT', 3600))
+
+
+# Password hashing
+# The preferred hasher is first; the others still verify existing
+# hashes, which are upgraded to the preferred hasher on login.
+
+PASSWORD_HASHER_CHOICES = {
+    'argon2': 'user.hashers.TunedArgon2PasswordHasher',
+    'bcrypt': 'user.hashers.TunedBCryptSHA256PasswordHasher',
+    'pbkdf2': 'user.hashers.TunedPBKDF2PasswordHasher',
+}
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_HASHERS = [PASSWORD_HASHER_CHOICES[PASSWORD_HASHER]] + [
+    hasher for name, hasher in PASSWORD_HASHER_CHOICES.items()
+    if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+PBKDF2_ITERATIONS = int(os.environ.get('PBKDF2_ITERATIONS', 260000))
+ARGON2_TIME_COST = int(os.environ.get('ARGON2_TIME_COST', 2))
+ARGON2_MEMORY_COST = int(os.environ.get('ARGON2_MEMORY_COST', 102400))
+ARGON2_PARALLELISM = int(os.environ.get('ARGON2_PARALLELISM', 8))
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -135,6 +218,26 @@ MEDIA_URL = '/static/media/'
 MEDIA_ROOT = '/vol/web/media'
 STATIC_ROOT = '/vol/web/static'
 
+DEFAULT_FILE_STORAGE = 'core.storage.ContentAddressedStorage'
+
+# Unreferenced media younger than this is kept, as an upload may not be
+# committed yet.
+MEDIA_GC_GRACE_SECONDS = int(os.environ.get('MEDIA_GC_GRACE_SECONDS', 3600))
+
+# Track image variants, as label: longest side in pixels
+TRACK_IMAGE_SIZES = {
+    'thumbnail': 160,
+    'small': 480,
+    'large': 1280,
+}
+TRACK_IMAGE_QUALITY = int(os.environ.get('TRACK_IMAGE_QUALITY', 80))
+# Quality of originals re-encoded to apply their EXIF orientation.
+TRACK_IMAGE_ORIGINAL_QUALITY = int(
+    os.environ.get('TRACK_IMAGE_ORIGINAL_QUALITY', 95),
+)
+TRACK_IMAGE_WORKERS = int(os.environ.get('TRACK_IMAGE_WORKERS', 2))
+TRACK_IMAGE_ASYNC = True
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -144,8 +247,38 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.environ.get('LOGIN_IP_RATE', '30/min'),
+        'login_email': os.environ.get('LOGIN_EMAIL_RATE', '10/min'),
+    },
 }
 
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 20))
+
+# Rows fetched per round trip by the streaming userdata export.
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 2000))
+
+# Rows validated and inserted per transaction by the bulk imports, and
+# the number of row errors an import report lists.
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))
+IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS', 100))
+
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 10000))
+TOKEN_CACHE_TTL = int(os.environ.get('TOKEN_CACHE_TTL', 60))
+TOKEN_EXPIRE_SECONDS = int(os.environ.get('TOKEN_EXPIRE_SECONDS', 0)) or None
+
+LATENCY_WINDOW_SIZE = int(os.environ.get('LATENCY_WINDOW_SIZE', 1000))
+LATENCY_WINDOW_SECONDS = int(os.environ.get('LATENCY_WINDOW_SECONDS', 60))
+READINESS_MAX_P99_MS = int(os.environ.get('READINESS_MAX_P99_MS', 0)) or None
+
+SQL_PROFILER_ENABLED = bool(int(os.environ.get('SQL_PROFILER_ENABLED', 0)))
+SQL_PROFILER_ALLOW_HEADER = bool(int(
+    os.environ.get('SQL_PROFILER_ALLOW_HEADER', int(DEBUG)),
+))
+SQL_PROFILER_NPLUSONE_THRESHOLD = int(
+    os.environ.get('SQL_PROFILER_NPLUSONE_THRESHOLD', 5),
+)
+
 SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
 }
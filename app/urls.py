@@ -29,6 +29,9 @@ from core import views as core_views
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/health-check/', core_views.health_check, name='health-check'),
+    path('api/health/live/', core_views.health_check, name='health-live'),
+    path('api/health/ready/', core_views.readiness, name='health-ready'),
+    path('metrics', core_views.metrics, name='metrics'),
     path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
     path(
         'api/docs/',
@@ -40,6 +43,7 @@ urlpatterns = [
     path('api/user/profile/', include('profiles.urls')),
     #path('api/track/book/', include('book.urls')),
     path('api/user/userdata/',include('userdata.urls')),
+    path('api/search/', include('search.urls')),
 ]
 
 if settings.DEBUG:
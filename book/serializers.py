@@ -1,6 +1,8 @@
 """
 Serializers for book APIs
 """
+import re
+
 from rest_framework import serializers
 
 from core.models import Book
@@ -23,3 +25,28 @@ class BookDetailSerializer(BookSerializer):
 
     class Meta(BookSerializer.Meta):
         fields = BookSerializer.Meta.fields + ['image_url']
+
+
+def normalize_isbn(value):
+    """Return an ISBN without separators and with an upper case X."""
+    return re.sub(r'[\s-]', '', value).upper()
+
+
+class BookImportSerializer(BookSerializer):
+    """Serializer for a book row of a bulk import."""
+
+    class Meta(BookSerializer.Meta):
+        fields = [
+            name for name in BookSerializer.Meta.fields if name != 'id'
+        ]
+        extra_kwargs = {'image_url': {'required': False}}
+
+    def validate_isbn(self, value):
+        """Normalize the ISBN so duplicates compare equal."""
+        isbn = normalize_isbn(value)
+        if not re.fullmatch(r'\d{9}[\dX]|\d{13}', isbn):
+            raise serializers.ValidationError(
+                'Enter a valid ISBN-10 or ISBN-13.',
+            )
+
+        return isbn
@@ -2,24 +2,27 @@
 Views for the book APIs
 """
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
+from core.fieldsets import SparseFieldsetMixin
 from core.models import Book
+from user.authentication import CachedTokenAuthentication
 from book import serializers
 # Create your views here.
 
 
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """View for manage book APIs."""
     serializer_class = serializers.BookDetailSerializer
     queryset = Book.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        """Retrieve Books for authenticated user."""
-        return self.queryset.filter(user=self.request.user).order_by('-id')
+        """Retrieve books of the tracks led by the authenticated user."""
+        return super().get_queryset().filter(
+            track__leader=self.request.user,
+        ).order_by('-id').distinct()
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
@@ -30,4 +33,4 @@ class BookViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """Create a new book."""
-        serializer.save(user=self.request.user)
\ No newline at end of file
+        serializer.save()
\ No newline at end of file
@@ -51,6 +51,7 @@ admin.site.register(models.User, UserAdmin)
 admin.site.register(models.Profile)
 admin.site.register(models.User_Data)
 admin.site.register(models.Track)
+admin.site.register(models.Track_Follow)
 admin.site.register(models.Task)
 admin.site.register(models.Book)
 admin.site.register(models.Comment_Track)
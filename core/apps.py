@@ -4,3 +4,21 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+
+        from core import cache, checks  # noqa: F401
+        from core.connections import check_connection_health
+        from core.profiling import install_collectors
+
+        # Runs after Django's own close_old_connections handler.
+        request_started.connect(
+            check_connection_health,
+            dispatch_uid='core.check_connection_health',
+        )
+        connection_created.connect(
+            install_collectors,
+            dispatch_uid='core.install_collectors',
+        )
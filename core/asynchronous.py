@@ -0,0 +1,55 @@
+"""
+Helpers for the async (ASGI) views.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+
+from django.db import close_old_connections
+
+
+def database_sync_to_async(func):
+    """Return func as a coroutine function run in a worker thread.
+
+    sync_to_async runs everything on the one thread shared by the sync
+    code of all requests by default, so concurrent async requests still
+    queried the database one at a time. Here each call may run on its own
+    thread of the executor, so it must not need the connection or the
+    transaction of other sync code of the request; the async views only
+    read. Django closes the connections of the shared thread when a
+    request ends, so the worker closes its own stale ones the same way.
+    """
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(run, thread_sensitive=False)
+
+
+def async_view(view):
+    """Return an async view serving the sync view in a worker thread.
+
+    view is a DRF view such as the one ViewSet.as_view returns, so the
+    async endpoint keeps its authentication, filters, pagination,
+    response cache and error responses. The response is rendered in the
+    worker too.
+    """
+    def render(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response.render()
+
+        return response
+
+    run = database_sync_to_async(render)
+
+    async def wrapper(request, *args, **kwargs):
+        return await run(request, *args, **kwargs)
+
+    wrapper.csrf_exempt = getattr(view, 'csrf_exempt', False)
+
+    return wrapper
@@ -0,0 +1,34 @@
+"""
+Bulk inserts for imports and generated datasets.
+"""
+import itertools
+
+from django.db import transaction
+from django.db.models import Max
+
+
+def bulk_insert(model, objs, batch_size):
+    """Insert objs with bulk_create and return how many were inserted.
+
+    objs may be any iterable; it is consumed batch_size objects at a
+    time, so generated datasets are never held whole. Objects inserted
+    without a key get the key of their row: bulk_create only returns
+    them on PostgreSQL in this Django version, but on SQLite the
+    transaction holds the only write lock, so the rows are the last ones
+    inserted, in order.
+    """
+    objs = iter(objs)
+    total = 0
+    while True:
+        batch = list(itertools.islice(objs, batch_size))
+        if not batch:
+            return total
+        with transaction.atomic(savepoint=False):
+            model.objects.bulk_create(batch, batch_size=batch_size)
+            if batch[0].pk is None:
+                last = model.objects.aggregate(last=Max('pk'))['last']
+                for pk, obj in enumerate(
+                    batch, start=last - len(batch) + 1,
+                ):
+                    obj.pk = pk
+        total += len(batch)
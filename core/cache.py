@@ -0,0 +1,262 @@
+"""
+Response caching with invalidation on model changes.
+"""
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.utils.http import parse_etags
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.models import (
+    Book,
+    Comment_Track,
+    Profile,
+    Task,
+    Track,
+    Track_Follow,
+    User_Data,
+)
+
+
+CATALOG_NAMESPACE = 'track-catalog'
+PROGRESS_NAMESPACE = 'user-progress'
+
+
+def _version_key(namespace):
+    """Return the cache key holding the version of namespace."""
+    return f'{namespace}:version'
+
+
+def get_version(namespace):
+    """Return the current version of namespace."""
+    return get_versions([namespace])[0]
+
+
+def get_versions(namespaces):
+    """Return the current versions of namespaces in one cache call."""
+    keys = [_version_key(namespace) for namespace in namespaces]
+    found = cache.get_many(keys)
+
+    return [
+        found.get(key) or bump_version(namespace)
+        for key, namespace in zip(keys, namespaces)
+    ]
+
+
+def bump_version(namespace):
+    """Invalidate every entry of namespace and return the new version."""
+    version = uuid.uuid4().hex
+    cache.set(
+        _version_key(namespace), version, settings.CACHE_VERSION_TIMEOUT,
+    )
+
+    return version
+
+
+def bump_versions(namespaces):
+    """Invalidate every entry of namespaces."""
+    versions = {
+        _version_key(namespace): uuid.uuid4().hex for namespace in namespaces
+    }
+    cache.set_many(versions, settings.CACHE_VERSION_TIMEOUT)
+
+
+def list_namespace(namespace):
+    """Return the namespace of the cached lists of namespace."""
+    return f'{namespace}:list'
+
+
+def object_namespace(namespace, pk):
+    """Return the namespace of the cached responses about one object."""
+    return f'{namespace}:object:{pk}'
+
+
+def invalidate_tracks(track_ids, lists=True):
+    """Drop the cached responses of track_ids and, if lists, the lists.
+
+    The versions are bumped once the current transaction commits, so a
+    concurrent request cannot cache the rows being replaced again.
+    """
+    namespaces = {list_namespace(CATALOG_NAMESPACE)} if lists else set()
+    namespaces.update(
+        object_namespace(CATALOG_NAMESPACE, track_id)
+        for track_id in track_ids
+        if track_id is not None
+    )
+    transaction.on_commit(lambda: bump_versions(namespaces))
+
+
+def progress_namespace(user_id):
+    """Return the namespace of the cached progress of a user."""
+    return f'{PROGRESS_NAMESPACE}:{user_id}'
+
+
+def make_etag(data):
+    """Return a strong ETag for response data."""
+    content = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+
+    return f'"{hashlib.sha1(content.encode()).hexdigest()}"'
+
+
+def etag_matches(etag, header):
+    """Return True if an If-None-Match header value matches etag.
+
+    The header is a list of entity tags compared weakly, or "*".
+    """
+    etags = parse_etags(header)
+    if '*' in etags:
+        return True
+
+    return _opaque_tag(etag) in {_opaque_tag(tag) for tag in etags}
+
+
+def _opaque_tag(etag):
+    """Return etag without its weakness indicator."""
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+class CachedResponseMixin:
+    """Cache list and retrieve responses of a viewset.
+
+    Entries are keyed on the version of the whole namespace and on the
+    version of the object they show, or of the lists for list responses.
+    Saving a model only bumps the lists and the objects showing it, while
+    bulk changes bump the namespace to drop every entry at once. Follows
+    and ratings only move counters, so they leave the lists cached and
+    only bump the objects of their tracks.
+
+    Versions live in the default cache, which must be shared by every
+    worker (see the core.W001 check) for invalidation to reach them all.
+    """
+    cache_namespace = CATALOG_NAMESPACE
+    # Seconds to keep responses, RESPONSE_CACHE_TIMEOUT when None.
+    cache_timeout = None
+
+    def get_cache_timeout(self):
+        """Return how long to keep cached responses."""
+        if self.cache_timeout is None:
+            return settings.RESPONSE_CACHE_TIMEOUT
+
+        return self.cache_timeout
+
+    def get_cache_namespaces(self, request):
+        """Return the namespaces whose versions key the response."""
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        pk = self.kwargs.get(lookup)
+        if pk is None:
+            resource = list_namespace(self.cache_namespace)
+        else:
+            resource = object_namespace(self.cache_namespace, pk)
+
+        return [self.cache_namespace, resource]
+
+    def get_cache_key(self, request):
+        """Return the cache key of the response to request."""
+        url = request.build_absolute_uri()
+        path = hashlib.sha1(url.encode()).hexdigest()
+        versions = ':'.join(get_versions(
+            self.get_cache_namespaces(request),
+        ))
+
+        return (
+            f'{self.cache_namespace}:{versions}:'
+            f'{request.accepted_renderer.format}:{path}'
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Return the cached response of handler or cache a fresh one."""
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            entry = (make_etag(response.data), response.data)
+            cache.set(key, entry, self.get_cache_timeout())
+
+        etag, data = entry
+        if etag_matches(etag, request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs,
+        )
+
+
+# Models whose rows only change the counters of their tracks.
+COUNTER_MODELS = (Track_Follow, Comment_Track)
+
+
+def _catalog_track_ids(instance):
+    """Return the ids of the tracks whose catalog entries show instance."""
+    if isinstance(instance, Track):
+        return [instance.pk]
+    if isinstance(instance, Track_Follow):
+        return [instance.track_id]
+    if isinstance(instance, Comment_Track):
+        # A moved comment also changes the rating of its previous track.
+        return [instance.track_id, getattr(instance, '_rated_track_id', None)]
+    if isinstance(instance, Task):
+        return [instance.track_id]
+    if isinstance(instance, Book):
+        return list(Track.objects.filter(book=instance).values_list(
+            'pk', flat=True,
+        ))
+    if isinstance(instance, Profile):
+        return list(Track.objects.filter(profile=instance).values_list(
+            'pk', flat=True,
+        ))
+
+    return []
+
+
+def _invalidate_catalog(sender, instance, **kwargs):
+    """Drop the cached catalog responses showing a saved or deleted row."""
+    track_ids = [pk for pk in _catalog_track_ids(instance) if pk is not None]
+    if track_ids:
+        invalidate_tracks(
+            track_ids, lists=not isinstance(instance, COUNTER_MODELS),
+        )
+
+
+def _invalidate_progress(sender, instance, **kwargs):
+    """Bump the progress version of the user owning a userdata row."""
+    namespace = progress_namespace(instance.user_id)
+    transaction.on_commit(lambda: bump_version(namespace))
+
+
+post_save.connect(
+    _invalidate_progress, sender=User_Data,
+    dispatch_uid=f'{PROGRESS_NAMESPACE}:save',
+)
+post_delete.connect(
+    _invalidate_progress, sender=User_Data,
+    dispatch_uid=f'{PROGRESS_NAMESPACE}:delete',
+)
+
+for model in [Track, Book, Task, Profile, Track_Follow, Comment_Track]:
+    post_save.connect(
+        _invalidate_catalog, sender=model,
+        dispatch_uid=f'{CATALOG_NAMESPACE}:{model.__name__}:save',
+    )
+    post_delete.connect(
+        _invalidate_catalog, sender=model,
+        dispatch_uid=f'{CATALOG_NAMESPACE}:{model.__name__}:delete',
+    )
@@ -0,0 +1,47 @@
+"""
+System checks for the core app.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+LOCAL_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Warn when the response cache versions are not shared by workers."""
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in LOCAL_CACHE_BACKENDS:
+        return []
+
+    return [Warning(
+        f'The default cache backend {backend} is local to each process.',
+        hint=(
+            'Cached responses are invalidated by bumping versions in the '
+            'default cache, so other workers keep serving stale responses. '
+            'Set CACHE_BACKEND=redis (or another shared backend) when '
+            'running more than one process.'
+        ),
+        id='core.W001',
+    )]
+
+
+@register(Tags.caches)
+def check_version_timeout(app_configs, **kwargs):
+    """Warn when cache versions expire before the responses they key."""
+    if settings.CACHE_VERSION_TIMEOUT > settings.RESPONSE_CACHE_TIMEOUT:
+        return []
+
+    return [Warning(
+        'CACHE_VERSION_TIMEOUT is not longer than RESPONSE_CACHE_TIMEOUT.',
+        hint=(
+            'Cached responses are keyed on versions, so responses outliving '
+            'their version can no longer be served. Set '
+            'CACHE_VERSION_TIMEOUT above RESPONSE_CACHE_TIMEOUT.'
+        ),
+        id='core.W002',
+    )]
@@ -0,0 +1,23 @@
+"""
+Health checks of persistent database connections.
+"""
+from django.db import connections
+
+
+def check_connection_health(**kwargs):
+    """Close persistent connections that stopped working.
+
+    Backports CONN_HEALTH_CHECKS from Django 4.1: at the start of each
+    request a connection kept open by CONN_MAX_AGE is pinged before being
+    reused, and closed if the server went away so the request opens a new
+    one instead of failing on its first query.
+    """
+    for conn in connections.all():
+        if conn.connection is None:
+            continue
+        if not conn.settings_dict.get('CONN_HEALTH_CHECKS'):
+            continue
+        if conn.in_atomic_block:
+            continue
+        if not conn.is_usable():
+            conn.close()
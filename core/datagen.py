@@ -0,0 +1,323 @@
+"""
+Synthetic dataset generation for performance testing and staging.
+"""
+import itertools
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import AutoField, BigAutoField, Max, SmallAutoField
+from django.utils import timezone
+
+from core.cache import CATALOG_NAMESPACE, bump_version
+from core.models import (
+    Book,
+    Profile,
+    Search_Document,
+    Task,
+    Track,
+    User_Data,
+    natural_order_key,
+)
+from search.index import DOCUMENT_TYPES, document_values
+
+
+SUBJECTS = {
+    'math': ['algebra', 'geometry', 'calculus', 'statistics'],
+    'science': ['physics', 'chemistry', 'biology'],
+    'english': ['reading', 'writing', 'grammar'],
+}
+TARGET_TESTS = ['sat', 'act', 'ap', 'csat']
+TARGET_GRADES = ['9', '10', '11', '12']
+AUTO_FIELDS = (AutoField, BigAutoField, SmallAutoField)
+
+
+def _next_id(model):
+    """Return the first primary key above the existing rows of model."""
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def insert_rows(model, columns, rows, batch_size):
+    """Insert rows of database values for columns and return the count.
+
+    Unlike core.bulk.bulk_insert this does not go through bulk_create:
+    rows skip model instantiation and the SQL compiler, which dominate
+    its cost for large tables. Generating 551,620 rows (5,000 users,
+    2,000 tracks of 20 tasks) on SQLite takes about 10s this way and 47s
+    with bulk_create. Columns left out are filled with the field
+    defaults, except auto primary keys.
+    """
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    defaults = [
+        (field, field.get_db_prep_save(field.get_default(), connection))
+        for attname, field in fields.items()
+        if attname not in columns and not isinstance(field, AUTO_FIELDS)
+    ]
+    names = list(columns) + [field.attname for field, _ in defaults]
+    default_values = tuple(value for _, value in defaults)
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        connection.ops.quote_name(model._meta.db_table),
+        ', '.join(
+            connection.ops.quote_name(fields[name].column) for name in names
+        ),
+        ', '.join(['%s'] * len(names)),
+    )
+
+    total = 0
+    rows = iter(rows)
+    with connection.cursor() as cursor:
+        while True:
+            batch = [
+                row + default_values
+                for row in itertools.islice(rows, batch_size)
+            ]
+            if not batch:
+                return total
+            cursor.executemany(sql, batch)
+            total += len(batch)
+
+
+class DataGenerator:
+    """Generate a referentially consistent dataset with bulk inserts.
+
+    Primary keys are assigned up front so related rows can be built
+    without reading the inserted rows back, and every choice is drawn
+    from a seeded random generator so a seed always yields the same
+    dataset.
+
+    Every user gets the same password, so its hash is computed once and
+    shared. The hasher is deliberately slow, and hashing per user would
+    dominate the generation of large datasets. Anyone reading the table
+    can tell the users share a password, which is fine for the
+    performance testing and staging data this is meant for.
+    """
+
+    def __init__(self, seed=0, batch_size=5000, email_prefix='user',
+                 password='testpass123'):
+        self.seed = seed
+        self.batch_size = batch_size
+        self.email_prefix = email_prefix
+        self.password = password
+
+    def _insert(self, model, columns, rows):
+        return insert_rows(model, columns, rows, self.batch_size)
+
+    def _users(self, start, count, password):
+        for index in range(count):
+            yield (
+                start + index,
+                f'{self.email_prefix}{index}@example.com',
+                f'User {index}',
+                password,
+            )
+
+    def _profiles(self, start, count, rng):
+        for index in range(count):
+            yield (
+                start + index,
+                start + index,
+                f'{self.email_prefix}{index}',
+                Profile.LEADER if rng.random() < 0.1 else Profile.USER,
+                rng.choice(list(SUBJECTS)),
+                f'https://example.com/profiles/{index}.png',
+            )
+
+    def _books(self, start, count, now):
+        for pk in range(start, start + count):
+            yield (
+                pk,
+                f'Book {pk}',
+                'Synthetic',
+                f'Author {pk % 97}',
+                f'https://example.com/books/{pk}.png',
+                f'979{pk:010d}',
+                f'Publisher {pk % 13}',
+                now,
+            )
+
+    def _tracks(self, start, count, users, books, now, rng):
+        user_start, user_count = users
+        book_start, book_count = books
+        for pk in range(start, start + count):
+            leader_id = user_start + rng.randrange(user_count)
+            subject = rng.choice(list(SUBJECTS))
+            yield (
+                pk,
+                leader_id,
+                leader_id,
+                book_start + rng.randrange(book_count),
+                subject,
+                rng.choice(SUBJECTS[subject]),
+                rng.choice(TARGET_TESTS),
+                rng.choice(TARGET_GRADES),
+                f'Track {pk}',
+                now,
+            )
+
+    def _steps(self, count):
+        """Return the (order_major, order_minor, keys) of count steps."""
+        steps = []
+        for step in range(count):
+            major, minor = str(step // 10 + 1), str(step % 10 + 1)
+            steps.append((
+                major, minor,
+                natural_order_key(major), natural_order_key(minor),
+            ))
+
+        return steps
+
+    def _tasks(self, start, tracks, tasks_per_track):
+        track_start, track_count = tracks
+        steps = self._steps(tasks_per_track)
+        pk = start
+        for track_id in range(track_start, track_start + track_count):
+            for step, (major, minor, major_key, minor_key) in enumerate(
+                steps,
+            ):
+                yield (
+                    pk,
+                    track_id,
+                    major,
+                    minor,
+                    major_key,
+                    minor_key,
+                    f'Task {step + 1}',
+                    f'{step * 10 + 1}-{step * 10 + 10}',
+                    '30',
+                    'Read and solve the problems.',
+                    '',
+                )
+                pk += 1
+
+    def _progress(self, users, tracks, tasks_per_track, tracks_per_user,
+                  now, rng):
+        user_start, user_count = users
+        track_start, track_count = tracks
+        steps = self._steps(tasks_per_track)
+        for user_id in range(user_start, user_start + user_count):
+            followed = rng.sample(
+                range(track_start, track_start + track_count),
+                min(tracks_per_user, track_count),
+            )
+            for track_id in followed:
+                done = rng.randint(0, tasks_per_track)
+                for major, minor, major_key, minor_key in steps[:done]:
+                    yield (
+                        user_id,
+                        track_id,
+                        major,
+                        minor,
+                        major_key,
+                        minor_key,
+                        now,
+                        rng.random() < 0.8,
+                    )
+
+    def _documents(self, starts):
+        """Yield the search documents of the generated rows.
+
+        The rows are read back so the text comes from the same functions
+        the search signals use.
+        """
+        for model in DOCUMENT_TYPES:
+            rows = model.objects.filter(pk__gte=starts[model]).order_by('pk')
+            for instance in rows.iterator(chunk_size=self.batch_size):
+                yield document_values(instance)
+
+    def _reset_sequences(self, models):
+        """Move the primary key sequences past the explicit keys."""
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def generate(self, users, books, tracks, tasks_per_track,
+                 tracks_per_user):
+        """Insert the dataset and return the number of rows per model."""
+        rng = random.Random(self.seed)
+        password = make_password(self.password)
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        User = get_user_model()
+        order_columns = [
+            'order_major', 'order_minor', 'order_major_key',
+            'order_minor_key',
+        ]
+
+        with transaction.atomic():
+            # Profiles share the user keys so tracks can point at both.
+            user_start = max(_next_id(User), _next_id(Profile))
+            book_start = _next_id(Book)
+            track_start = _next_id(Track)
+            task_start = _next_id(Task)
+            user_range = (user_start, users)
+            track_range = (track_start, tracks)
+
+            counts = {
+                'users': self._insert(
+                    User,
+                    ['id', 'email', 'name', 'password'],
+                    self._users(user_start, users, password),
+                ),
+                'profiles': self._insert(
+                    Profile,
+                    [
+                        'id', 'user_id', 'nickname', 'role', 'subjects',
+                        'image_url',
+                    ],
+                    self._profiles(user_start, users, rng),
+                ),
+                'books': self._insert(
+                    Book,
+                    [
+                        'id', 'title', 'sub_title', 'author', 'image_url',
+                        'isbn', 'publisher', 'published_date',
+                    ],
+                    self._books(book_start, books, now),
+                ),
+                'tracks': self._insert(
+                    Track,
+                    [
+                        'id', 'leader_id', 'profile_id', 'book_id',
+                        'subject_major', 'subject_minor', 'target_test',
+                        'target_grade', 'track_name', 'published_date',
+                    ],
+                    self._tracks(
+                        track_start, tracks, user_range,
+                        (book_start, books), now, rng,
+                    ),
+                ),
+                'tasks': self._insert(
+                    Task,
+                    ['id', 'track_id'] + order_columns + [
+                        'task_name', 'ranges', 'learning_time', 'guideline',
+                        'references',
+                    ],
+                    self._tasks(task_start, track_range, tasks_per_track),
+                ),
+            }
+            counts['user_data'] = self._insert(
+                User_Data,
+                ['user_id', 'track_id'] + order_columns + [
+                    'action_date', 'is_done',
+                ],
+                self._progress(
+                    user_range, track_range, tasks_per_track,
+                    tracks_per_user, now, rng,
+                ),
+            )
+            # Raw inserts send no signals, so the search index is filled
+            # here and the catalog cache is dropped after the commit.
+            self._insert(
+                Search_Document,
+                ['kind', 'object_id', 'title', 'body'],
+                self._documents({
+                    Book: book_start, Track: track_start, Task: task_start,
+                }),
+            )
+            self._reset_sequences([User, Profile, Book, Track, Task])
+        bump_version(CATALOG_NAMESPACE)
+
+        return counts
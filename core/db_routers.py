@@ -0,0 +1,45 @@
+"""
+Database routers for app.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+REPLICA_DATABASE = 'replica'
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+@contextmanager
+def use_replica():
+    """Send the reads made inside the block to the replica."""
+    marker = _read_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(marker)
+
+
+class ReplicaRouter:
+    """Route reads to the replica when enabled and writes to default."""
+
+    def db_for_read(self, model, **hints):
+        """Return the replica for reads inside use_replica()."""
+        if _read_from_replica.get() and REPLICA_DATABASE in settings.DATABASES:
+            return REPLICA_DATABASE
+
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        """Send every write to the primary."""
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow relations since both databases hold the same data."""
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Only migrate the primary, replicas follow through replication."""
+        return db == 'default'
@@ -0,0 +1,142 @@
+"""
+Sparse fieldsets and relation expansion for API responses.
+"""
+from rest_framework import serializers
+
+from core.prefetch import EagerLoadingMixin, eager_load
+
+
+def parse_fieldset(value):
+    """Return the tree of a comma separated list of dotted field paths.
+
+    'id,book.title,book.author' becomes
+    {'id': {}, 'book': {'title': {}, 'author': {}}}.
+    """
+    tree = {}
+    for path in (value or '').split(','):
+        node = tree
+        for name in filter(None, path.strip().split('.')):
+            node = node.setdefault(name, {})
+
+    return tree
+
+
+def _model_serializer(field):
+    """Return the model serializer rendered by field or None."""
+    target = field.child if isinstance(
+        field, serializers.ListSerializer,
+    ) else field
+
+    return target if isinstance(target, serializers.ModelSerializer) else None
+
+
+def _collapse(name, field):
+    """Return a field rendering the primary keys of a nested relation."""
+    kwargs = {} if field.source == name else {'source': field.source}
+
+    return serializers.PrimaryKeyRelatedField(
+        many=isinstance(field, serializers.ListSerializer),
+        read_only=True,
+        **kwargs,
+    )
+
+
+def sparse_fields(serializer, fields=None, expand=None):
+    """Trim the fields of serializer in place and return it.
+
+    fields is a tree from parse_fieldset naming the fields to keep, where
+    an empty subtree keeps every field of a nested serializer. When
+    expand is given, nested serializers not named in it render their
+    primary keys instead.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        sparse_fields(serializer.child, fields, expand)
+        return serializer
+
+    if fields:
+        for name in list(serializer.fields):
+            if name not in fields:
+                serializer.fields.pop(name)
+    for name, field in list(serializer.fields.items()):
+        nested = _model_serializer(field)
+        if nested is None:
+            continue
+        if expand is not None and name not in expand:
+            serializer.fields[name] = _collapse(name, field)
+            continue
+        subtree = (fields or {}).get(name) or None
+        sparse_fields(
+            nested, subtree, (expand or {}).get(name) if expand else None,
+        )
+
+    return serializer
+
+
+class SparseFieldsetMixin(EagerLoadingMixin):
+    """Trim responses with the `fields` and `expand` query parameters.
+
+    The trimmed serializer also drives the eager loading plan, and the
+    queryset only loads the columns the remaining fields read.
+    """
+    fields_param = 'fields'
+    expand_param = 'expand'
+
+    def get_fieldsets(self):
+        """Return the (fields, expand) trees requested, if any."""
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return None, None
+        params = request.query_params
+        fields = parse_fieldset(params.get(self.fields_param))
+        expand = (
+            parse_fieldset(params[self.expand_param])
+            if self.expand_param in params else None
+        )
+
+        return fields or None, expand
+
+    def is_sparse(self):
+        """Return True if the request asks for a trimmed response."""
+        fields, expand = self.get_fieldsets()
+
+        return fields is not None or expand is not None
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.is_sparse():
+            sparse_fields(serializer, *self.get_fieldsets())
+
+        return serializer
+
+    def get_eager_loading_serializer(self):
+        serializer = super().get_eager_loading_serializer()
+        if self.is_sparse():
+            sparse_fields(serializer, *self.get_fieldsets())
+
+        return serializer
+
+    def get_ordering_fields(self):
+        """Return the columns the ordering and pagination may read."""
+        names = set()
+        candidates = list(getattr(self, 'ordering_fields', None) or [])
+        candidates += list(getattr(self, 'ordering', None) or [])
+        paginator = getattr(self.pagination_class, 'ordering', None)
+        if isinstance(paginator, str):
+            candidates.append(paginator)
+        elif paginator:
+            candidates.extend(paginator)
+        for name in candidates:
+            names.add(name.lstrip('-'))
+
+        return names
+
+    def eager_load(self, queryset, serializer):
+        if not self.is_sparse():
+            return super().eager_load(queryset, serializer)
+
+        return eager_load(
+            queryset,
+            serializer,
+            narrow=True,
+            extra_fields=self.get_ordering_fields(),
+        )
@@ -0,0 +1,92 @@
+"""
+Dependency checks for the readiness endpoint.
+"""
+import time
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from core.db_routers import REPLICA_DATABASE
+
+
+_migrations_applied = set()
+
+
+def check_database(alias=DEFAULT_DB_ALIAS):
+    """Run a round trip query on the database."""
+    with connections[alias].cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+
+
+def check_migrations(alias=DEFAULT_DB_ALIAS):
+    """Fail if the database has unapplied migrations.
+
+    The migration graph is only loaded until the migrations are seen
+    applied, as they stay applied for the lifetime of the process.
+    """
+    if alias in _migrations_applied:
+        return
+    executor = MigrationExecutor(connections[alias])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if plan:
+        raise RuntimeError(f'{len(plan)} unapplied migrations')
+    _migrations_applied.add(alias)
+
+
+def check_media():
+    """Write and delete a probe file in the media storage."""
+    token = uuid.uuid4().hex
+    name = default_storage.save(
+        f'health/{token}.txt', ContentFile(token.encode()),
+    )
+    default_storage.delete(name)
+
+
+def check_cache():
+    """Write and read back a probe key in the cache."""
+    key = f'health:{uuid.uuid4().hex}'
+    cache.set(key, 'ok', 10)
+    if cache.get(key) != 'ok':
+        raise RuntimeError('cache did not return the probe value')
+    cache.delete(key)
+
+
+CHECKS = {
+    'database': check_database,
+    'migrations': check_migrations,
+    'media': check_media,
+    'cache': check_cache,
+}
+
+
+def get_checks():
+    """Return the checks to run, with the replica when one is set up."""
+    checks = dict(CHECKS)
+    if REPLICA_DATABASE in settings.DATABASES:
+        checks['replica'] = partial(check_database, REPLICA_DATABASE)
+
+    return checks
+
+
+def run_checks(checks=None):
+    """Run checks and return the health and latency of each one."""
+    results = {}
+    for name, check in (checks or get_checks()).items():
+        start = time.perf_counter()
+        try:
+            check()
+        except Exception as exc:
+            result = {'healthy': False, 'error': str(exc)}
+        else:
+            result = {'healthy': True}
+        result['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        results[name] = result
+
+    return results
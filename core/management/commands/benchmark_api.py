@@ -0,0 +1,330 @@
+"""
+Django command to benchmark the main API endpoints of a running server.
+"""
+import itertools
+import json
+import math
+import random
+import statistics
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+
+from core.datagen import DataGenerator
+from core.metrics import percentile
+from core.models import Track
+from core.profiling import parse_summary
+
+
+BENCHMARK_PREFIX = 'benchmark'
+BENCHMARK_PASSWORD = 'benchmark-pass-123'
+
+
+def seed_data(users, tracks, tasks, tracks_per_user, seed=0):
+    """Create the synthetic users, catalog and progress events."""
+    generator = DataGenerator(
+        seed=seed,
+        email_prefix=BENCHMARK_PREFIX,
+        password=BENCHMARK_PASSWORD,
+    )
+
+    return generator.generate(
+        users=users,
+        books=tracks,
+        tracks=tracks,
+        tasks_per_track=tasks,
+        tracks_per_user=tracks_per_user,
+    )
+
+
+class Client:
+    """Minimal JSON HTTP client recording the SQL profile of responses."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def request(self, method, path, body=None, token=None):
+        """Send a request and return its (status, latency, queries)."""
+        headers = {'Accept': 'application/json', 'X-Profile-SQL': '1'}
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        if token:
+            headers['Authorization'] = f'Token {token}'
+        request = urllib.request.Request(
+            self.base_url + path, data=data, headers=headers, method=method,
+        )
+
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as res:
+                res.read()
+                status, profile = res.status, res.headers.get('X-SQL-Profile')
+        except urllib.error.HTTPError as exc:
+            exc.read()
+            status, profile = exc.code, exc.headers.get('X-SQL-Profile')
+        except OSError:
+            status, profile = 0, None
+        latency = time.perf_counter() - start
+
+        queries = parse_summary(profile)['count'] if profile else None
+
+        return status, latency, queries
+
+
+class Scenarios:
+    """Requests issued against each benchmarked endpoint."""
+
+    def __init__(self, users, tokens, track_ids):
+        self.users = users
+        self.tokens = tokens
+        self.track_ids = track_ids
+        # Logins cycle through the users, so each email is throttled as
+        # late as possible.
+        self.login_users = itertools.cycle(users)
+
+    def track_catalog(self, rng):
+        return 'GET', reverse('track:track-all-list'), None, None
+
+    def track_detail(self, rng):
+        track_id = rng.choice(self.track_ids)
+        path = reverse('track:track-all-detail', args=[track_id])
+
+        return 'GET', path, None, None
+
+    def userdata_list(self, rng):
+        path = reverse('userdata:user_data-list')
+
+        return 'GET', path, None, rng.choice(self.tokens)
+
+    def userdata_create(self, rng):
+        body = {
+            'track_id': rng.choice(self.track_ids),
+            'order_major': str(rng.randint(1, 10)),
+            'order_minor': str(rng.randint(1, 10)),
+            'is_done': rng.random() < 0.5,
+        }
+        path = reverse('userdata:user_data-list')
+
+        return 'POST', path, body, rng.choice(self.tokens)
+
+    def token_auth(self, rng):
+        body = {
+            'email': next(self.login_users),
+            'password': BENCHMARK_PASSWORD,
+        }
+
+        return 'POST', reverse('user:token'), body, None
+
+
+ENDPOINTS = [
+    'track_catalog',
+    'track_detail',
+    'userdata_list',
+    'userdata_create',
+    'token_auth',
+]
+
+
+def check_login_rates(requests, users):
+    """Return the login throttles that would reject benchmark requests.
+
+    The server is assumed to run with the same settings. All requests
+    come from one address and are spread evenly over the users.
+    """
+    rates = settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {})
+    needed = {
+        'login_ip': ('LOGIN_IP_RATE', requests),
+        'login_email': ('LOGIN_EMAIL_RATE', math.ceil(requests / users)),
+    }
+    problems = []
+    for scope, (variable, count) in needed.items():
+        rate = rates.get(scope)
+        allowed = int(rate.split('/')[0]) if rate else None
+        if allowed is not None and allowed < count:
+            problems.append(
+                f'{scope} allows {allowed} requests, {count} are needed; '
+                f'start the server with a higher {variable}',
+            )
+
+    return problems
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+def run_endpoint(client, scenario, requests, concurrency, seed):
+    """Issue requests of scenario from concurrency threads."""
+    results = []
+    lock = threading.Lock()
+
+    def send(index):
+        method, path, body, token = scenario(random.Random(f'{seed}-{index}'))
+        result = client.request(method, path, body, token)
+        with lock:
+            results.append(result)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for _, latency, _ in results)
+    queries = [count for _, _, count in results if count is not None]
+    statuses = Counter(str(status) for status, _, _ in results)
+
+    return {
+        'requests': len(results),
+        'errors': sum(
+            1 for status, _, _ in results if not 200 <= status < 300
+        ),
+        'statuses': dict(sorted(statuses.items())),
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(results) / elapsed, 1),
+        'latency_ms': {
+            'mean': _ms(statistics.mean(latencies)),
+            'p50': _ms(percentile(latencies, 50)),
+            'p90': _ms(percentile(latencies, 90)),
+            'p99': _ms(percentile(latencies, 99)),
+            'max': _ms(latencies[-1]),
+        },
+        'queries': {
+            'mean': round(statistics.mean(queries), 2),
+            'max': max(queries),
+        } if queries else None,
+    }
+
+
+def git_revision():
+    """Return the current git revision or None outside a checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, check=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the API against a local server."""
+
+    help = (
+        'Seed synthetic data and report throughput, latency and query '
+        'counts of the main API endpoints as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument(
+            '--requests', type=int, default=500,
+            help='Requests sent to each endpoint.',
+        )
+        parser.add_argument(
+            '--endpoints', default=','.join(ENDPOINTS),
+            help='Comma separated endpoints to benchmark.',
+        )
+        parser.add_argument('--timeout', type=float, default=30)
+        parser.add_argument('--random-seed', type=int, default=1)
+        parser.add_argument('--output', help='Write the report to a file.')
+        parser.add_argument(
+            '--seed', action='store_true',
+            help='Create the synthetic dataset before benchmarking.',
+        )
+        parser.add_argument('--users', type=int, default=2000)
+        parser.add_argument('--tracks', type=int, default=500)
+        parser.add_argument('--tasks', type=int, default=20)
+        parser.add_argument(
+            '--tracks-per-user', type=int, default=50,
+            help='Tracks each user has progress on, about a million '
+                 'userdata events with the defaults.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        endpoints = [name for name in options['endpoints'].split(',') if name]
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(
+                f'Unknown endpoints: {", ".join(sorted(unknown))}',
+            )
+
+        if options['seed']:
+            if get_user_model().objects.filter(
+                email=f'{BENCHMARK_PREFIX}0@example.com',
+            ).exists():
+                raise CommandError('The benchmark data is already seeded.')
+            counts = seed_data(
+                options['users'], options['tracks'], options['tasks'],
+                options['tracks_per_user'], seed=options['random_seed'],
+            )
+            self.stderr.write(f'Seeded {counts}')
+
+        users = list(get_user_model().objects.filter(
+            email__startswith=BENCHMARK_PREFIX,
+        ).order_by('id')[:options['users']])
+        track_ids = list(
+            Track.objects.order_by('id').values_list('id', flat=True)[:1000],
+        )
+        if not users or not track_ids:
+            raise CommandError('No benchmark data, run with --seed first.')
+        if 'token_auth' in endpoints:
+            problems = check_login_rates(options['requests'], len(users))
+            if problems:
+                raise CommandError(
+                    'token_auth would be throttled: ' + '; '.join(problems),
+                )
+        tokens = [
+            Token.objects.get_or_create(user=user)[0].key for user in users
+        ]
+
+        client = Client(options['base_url'], options['timeout'])
+        scenarios = Scenarios(
+            [user.email for user in users], tokens, track_ids,
+        )
+        report = {
+            'revision': git_revision(),
+            'base_url': options['base_url'],
+            'concurrency': options['concurrency'],
+            'requests': options['requests'],
+            'endpoints': {},
+        }
+        for name in endpoints:
+            report['endpoints'][name] = run_endpoint(
+                client,
+                getattr(scenarios, name),
+                options['requests'],
+                options['concurrency'],
+                options['random_seed'],
+            )
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output + '\n')
+        self.stdout.write(output)
+
+        failed = [
+            name for name, result in report['endpoints'].items()
+            if result['errors']
+        ]
+        if failed:
+            raise CommandError(
+                f'Non 2xx responses from {", ".join(failed)}; the '
+                f'figures above do not measure successful requests.',
+            )
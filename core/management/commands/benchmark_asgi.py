@@ -0,0 +1,149 @@
+"""
+Django command to compare the async and sync read endpoints.
+"""
+import asyncio
+import json
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from core.metrics import percentile
+
+
+ENDPOINTS = {
+    'catalog': ('track:track-all-list', 'track:async-track-all-list'),
+    'profiles': ('profiles:profile-list', 'profiles:async-profile-list'),
+    'userdata': ('userdata:user_data-list', 'userdata:async-user_data-list'),
+}
+
+
+def _summary(latencies, elapsed, errors):
+    """Return the throughput and latency figures of a run."""
+    ordered = sorted(latencies)
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2),
+        'p50_ms': round(percentile(ordered, 50) * 1000, 2),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 2),
+    }
+
+
+def run_wsgi(url, requests, concurrency, headers):
+    """Drive url through the WSGI handler from concurrency threads."""
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def worker(count):
+        client = Client()
+        try:
+            for _ in range(count):
+                start = time.perf_counter()
+                response = client.get(url, **headers)
+                latency = time.perf_counter() - start
+                with lock:
+                    latencies.append(latency)
+                    if response.status_code != 200:
+                        errors.append(response.status_code)
+        finally:
+            connection.close()
+
+    shares = [
+        requests // concurrency + (1 if index < requests % concurrency else 0)
+        for index in range(concurrency)
+    ]
+    threads = [
+        threading.Thread(target=worker, args=(share,)) for share in shares
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return _summary(latencies, time.perf_counter() - start, len(errors))
+
+
+async def _run_asgi(url, requests, concurrency, headers):
+    """Drive url through the ASGI handler with concurrency tasks."""
+    latencies, errors = [], []
+    semaphore = asyncio.Semaphore(concurrency)
+    client = AsyncClient()
+
+    async def fetch():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(url, **headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(fetch() for _ in range(requests)))
+
+    return _summary(latencies, time.perf_counter() - start, len(errors))
+
+
+def run_asgi(url, requests, concurrency, headers):
+    """Drive url through the ASGI handler with concurrency tasks."""
+    return asyncio.run(_run_asgi(url, requests, concurrency, headers))
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the ASGI and WSGI read paths."""
+
+    help = 'Compare throughput of the async views to the sync views.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--endpoint',
+            choices=sorted(ENDPOINTS),
+            default='catalog',
+        )
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument(
+            '--token',
+            default='',
+            help='API token for the endpoints requiring authentication.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        sync_name, async_name = ENDPOINTS[options['endpoint']]
+        requests = max(1, options['requests'])
+        concurrency = max(1, min(options['concurrency'], requests))
+        authorization = (
+            f'Token {options["token"]}' if options['token'] else ''
+        )
+        wsgi_headers = (
+            {'HTTP_AUTHORIZATION': authorization} if authorization else {}
+        )
+        asgi_headers = (
+            {'authorization': authorization} if authorization else {}
+        )
+
+        # The test clients send requests for the 'testserver' host.
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        ):
+            result = {
+                'endpoint': options['endpoint'],
+                'concurrency': concurrency,
+                'wsgi': run_wsgi(
+                    reverse(sync_name), requests, concurrency, wsgi_headers,
+                ),
+                'asgi': run_asgi(
+                    reverse(async_name), requests, concurrency, asgi_headers,
+                ),
+            }
+        self.stdout.write(json.dumps(result, indent=2))
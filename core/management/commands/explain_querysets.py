@@ -0,0 +1,154 @@
+"""
+Django command to EXPLAIN the list querysets of the API viewsets.
+"""
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+from django.test import RequestFactory
+from django.utils.module_loading import import_string
+
+from rest_framework.pagination import CursorPagination
+from rest_framework.request import Request
+
+
+# (name, viewset, query parameters) of the list requests served most.
+QUERYSETS = [
+    ('track_catalog', 'track.views.TrackAllViewSet', {}),
+    (
+        'track_catalog_subject',
+        'track.views.TrackAllViewSet',
+        {'subject_major': 'math', 'subject_minor': 'algebra'},
+    ),
+    (
+        'track_catalog_target',
+        'track.views.TrackAllViewSet',
+        {'target_test': 'sat', 'target_grade': '11'},
+    ),
+    (
+        'track_catalog_popular',
+        'track.views.TrackAllViewSet',
+        {'ordering': '-followers_num'},
+    ),
+    ('track_owned', 'track.views.TrackViewSet', {}),
+    ('task_list', 'track.views.TaskViewSet', {}),
+    ('book_list', 'track.views.BookViewSet', {}),
+    ('profile_list', 'profiles.views.ProfileViewSet', {}),
+    ('userdata_list', 'userdata.views.UserDataViewSet', {}),
+]
+
+# PostgreSQL reports "Seq Scan on <table>", SQLite "SCAN [TABLE] <table>"
+# unless the table is walked through one of its indexes.
+POSTGRES_SCAN = re.compile(r'\bSeq Scan on (\S+)')
+SQLITE_SCAN = re.compile(r'\bSCAN (?:TABLE )?(\S+)(.*)')
+SORT = re.compile(r'(\bTEMP B-TREE FOR ORDER BY\b|^[\s>-]*Sort\b)')
+
+
+def build_queryset(viewset_class, params, user):
+    """Return the queryset a list request with params would evaluate.
+
+    The filter backends and the keyset paginator ordering are applied,
+    sliced to one page, without running the query.
+    """
+    request = Request(RequestFactory().get('/', params))
+    request.user = user
+    view = viewset_class(
+        request=request, args=(), kwargs={}, format_kwarg=None,
+        action='list',
+    )
+    queryset = view.filter_queryset(view.get_queryset())
+
+    paginator = view.paginator
+    if isinstance(paginator, CursorPagination):
+        ordering = paginator.get_ordering(request, queryset, view)
+        page_size = paginator.get_page_size(request)
+        queryset = queryset.order_by(*ordering)[:page_size + 1]
+
+    return queryset
+
+
+def analyze_plan(plan):
+    """Return the (sequentially scanned tables, sorts) of a query plan."""
+    scans, sorts = [], 0
+    for line in plan.splitlines():
+        match = POSTGRES_SCAN.search(line)
+        if match:
+            scans.append(match.group(1))
+        else:
+            match = SQLITE_SCAN.search(line)
+            if match and 'USING' not in match.group(2):
+                scans.append(match.group(1))
+        if SORT.search(line):
+            sorts += 1
+
+    return scans, sorts
+
+
+class Command(BaseCommand):
+    """Django command to report sequential scans of the API querysets."""
+
+    help = (
+        'Run EXPLAIN on the list queryset of each API viewset and report '
+        'sequential scans and sorts. Planners favour scans on small '
+        'tables, so run it against a realistically sized dataset.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            help='Comma separated names of the querysets to explain.',
+        )
+        parser.add_argument(
+            '--fail-on-scan', action='store_true',
+            help='Exit with an error if any queryset scans a table.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        querysets = QUERYSETS
+        if options['only']:
+            names = set(options['only'].split(','))
+            querysets = [entry for entry in QUERYSETS if entry[0] in names]
+            unknown = names - {name for name, _, _ in querysets}
+            if unknown:
+                raise CommandError(
+                    f'Unknown querysets: {", ".join(sorted(unknown))}',
+                )
+
+        User = get_user_model()
+        # An unsaved user still filters by its key, even on an empty table.
+        user = User.objects.order_by('pk').first() or User(pk=0)
+
+        scanned = []
+        for name, viewset, params in querysets:
+            try:
+                queryset = build_queryset(
+                    import_string(viewset), params, user,
+                )
+                plan = queryset.explain()
+            except (DatabaseError, FieldError) as exc:
+                self.stdout.write(self.style.ERROR(f'{name}: error: {exc}'))
+                continue
+
+            scans, sorts = analyze_plan(plan)
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{name}:\n{queryset.query}\n{plan}\n')
+            notes = [f'sequential scan on {table}' for table in scans]
+            if sorts:
+                notes.append(f'{sorts} sort(s)')
+            if scans:
+                scanned.append(name)
+                self.stdout.write(
+                    self.style.WARNING(f'{name}: {", ".join(notes)}'),
+                )
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(f'{name}: {", ".join(notes) or "ok"}'),
+                )
+
+        if scanned and options['fail_on_scan']:
+            raise CommandError(
+                f'Sequential scans in: {", ".join(scanned)}',
+            )
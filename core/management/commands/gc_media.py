@@ -0,0 +1,52 @@
+"""
+Django command to delete media files no track references.
+"""
+import os
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from track.images import image_reference_counts, is_past_grace_period
+
+
+class Command(BaseCommand):
+    """Django command to garbage collect orphaned track media."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--directory',
+            default=os.path.join('uploads', 'track'),
+            help='Storage directory to collect.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report orphaned files without deleting them.',
+        )
+
+    def _walk(self, directory):
+        """Yield the names of every file stored under directory."""
+        if not default_storage.exists(directory):
+            return
+        directories, files = default_storage.listdir(directory)
+        for filename in files:
+            yield f'{directory}/{filename}'
+        for subdirectory in directories:
+            yield from self._walk(f'{directory}/{subdirectory}')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        references = image_reference_counts()
+        deleted = freed = 0
+        for name in self._walk(options['directory'].strip('/')):
+            if references[name] or not is_past_grace_period(name):
+                continue
+            deleted += 1
+            freed += default_storage.size(name)
+            if not options['dry_run']:
+                default_storage.delete(name)
+
+        action = 'Found' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} {deleted} orphaned files ({freed} bytes).'
+        ))
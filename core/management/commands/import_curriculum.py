@@ -0,0 +1,65 @@
+"""
+Django command to bulk import books or tasks from a file.
+"""
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from track.imports import FILE_FORMATS, IMPORTERS, guess_format, read_rows
+
+
+class Command(BaseCommand):
+    """Django command to import books or tasks from CSV or JSON."""
+
+    help = (
+        'Import books or tasks from a CSV, JSON or NDJSON file, streaming '
+        'the file and inserting valid rows in batches. Books whose ISBN '
+        'already exists are skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=list(IMPORTERS))
+        parser.add_argument('path')
+        parser.add_argument(
+            '--file-format',
+            choices=FILE_FORMATS,
+            help='Defaults to the extension of the file.',
+        )
+        parser.add_argument(
+            '--user',
+            help='Email of the leader importing tasks; tasks may then '
+                 'only go into tracks this user leads.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Rows per transaction, IMPORT_BATCH_SIZE by default.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        file_format = options['file_format'] or guess_format(options['path'])
+        if file_format is None:
+            raise CommandError('Cannot tell the format, use --file-format.')
+
+        user = None
+        if options['user']:
+            try:
+                user = get_user_model().objects.get(email=options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'No user with email {options["user"]}.')
+
+        importer = IMPORTERS[options['kind']](
+            user=user, batch_size=options['batch_size'],
+        )
+        with open(options['path'], 'rb') as file:
+            report = importer.run(read_rows(file, file_format))
+
+        for error in report['errors']:
+            errors = json.dumps(error['errors'])
+            self.stderr.write(f'Row {error["row"]}: {errors}')
+        self.stdout.write(self.style.SUCCESS(
+            'Read {rows} rows: created {created}, skipped {skipped}, '
+            'failed {failed}.'.format(**report)
+        ))
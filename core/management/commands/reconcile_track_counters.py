@@ -0,0 +1,74 @@
+"""
+Django command to recompute the denormalized track counters.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import (
+    Count,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Sum,
+)
+from django.db.models.functions import Coalesce
+
+from core.cache import CATALOG_NAMESPACE, bump_version
+from core.models import (
+    Comment_Track,
+    Track,
+    Track_Follow,
+    track_rating_avg,
+)
+
+
+def _aggregate(queryset, aggregate):
+    """Return a subquery of aggregate over queryset grouped by track."""
+    values = queryset.filter(
+        track=OuterRef('pk'),
+    ).order_by().values('track').annotate(value=aggregate).values('value')
+
+    return Coalesce(
+        Subquery(values, output_field=IntegerField()),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    """Django command to reconcile track followers and ratings."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of tracks updated per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        batch_size = options['batch_size']
+        track_ids = list(
+            Track.objects.order_by('pk').values_list('pk', flat=True)
+        )
+        for start in range(0, len(track_ids), batch_size):
+            batch = track_ids[start:start + batch_size]
+            tracks = Track.objects.filter(pk__in=batch)
+            with transaction.atomic():
+                tracks.update(
+                    followers_num=_aggregate(
+                        Track_Follow.objects, Count('id'),
+                    ),
+                    rating_sum=_aggregate(
+                        Comment_Track.objects, Sum('rating'),
+                    ),
+                    rating_count=_aggregate(
+                        Comment_Track.objects, Count('id'),
+                    ),
+                )
+                tracks.update(rating_avg=track_rating_avg())
+
+        bump_version(CATALOG_NAMESPACE)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled counters of {len(track_ids)} tracks.'
+        ))
@@ -0,0 +1,48 @@
+"""
+Django command to report the tasks and userdata without a track.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Task, User_Data
+
+
+class Command(BaseCommand):
+    """Django command to list tasks and userdata whose track is gone."""
+
+    help = (
+        'Report the tasks and userdata with no track: rows of deleted '
+        'tracks, and rows the foreign key migration found pointing at '
+        'missing tracks. Nothing is changed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Number of primary keys listed per model.',
+        )
+        parser.add_argument(
+            '--fail-on-orphans', action='store_true',
+            help='Exit with an error if any row has no track.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        total = 0
+        for model in (Task, User_Data):
+            orphans = model.objects.filter(track__isnull=True)
+            count = orphans.count()
+            total += count
+            line = f'{model.__name__}: {count} without a track'
+            if count:
+                pks = orphans.order_by('pk').values_list('pk', flat=True)
+                line += ': ' + ', '.join(
+                    str(pk) for pk in pks[:options['limit']]
+                )
+                if count > options['limit']:
+                    line += ', ...'
+            self.stdout.write(line)
+
+        if total and options['fail_on_orphans']:
+            raise CommandError(f'{total} rows have no track.')
@@ -0,0 +1,231 @@
+"""
+In-process request metrics.
+"""
+import bisect
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+
+def percentile(values, percent):
+    """Return the percent percentile of sorted values (nearest rank)."""
+    if not values:
+        return None
+    index = min(len(values) - 1, int(len(values) * percent / 100))
+
+    return values[index]
+
+
+class LatencyWindow:
+    """Rolling window of the request latencies of the last seconds.
+
+    Latencies older than max_age seconds are dropped, so a slow spike
+    stops counting once it has passed. The window also keeps at most
+    size latencies.
+    """
+
+    def __init__(self, size=None, max_age=None):
+        self._latencies = deque(maxlen=size or settings.LATENCY_WINDOW_SIZE)
+        self._max_age = max_age or settings.LATENCY_WINDOW_SECONDS
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        """Add a request latency in seconds to the window."""
+        with self._lock:
+            self._latencies.append((time.monotonic(), seconds))
+
+    def clear(self):
+        """Drop every recorded latency."""
+        with self._lock:
+            self._latencies.clear()
+
+    def summary(self):
+        """Return the count, p50 and p99 in milliseconds of the window."""
+        cutoff = time.monotonic() - self._max_age
+        with self._lock:
+            while self._latencies and self._latencies[0][0] < cutoff:
+                self._latencies.popleft()
+            latencies = sorted(seconds for _, seconds in self._latencies)
+
+        def to_ms(value):
+            return None if value is None else round(value * 1000, 2)
+
+        return {
+            'count': len(latencies),
+            'p50_ms': to_ms(percentile(latencies, 50)),
+            'p99_ms': to_ms(percentile(latencies, 99)),
+        }
+
+
+request_latency = LatencyWindow()
+
+
+def _format_labels(labels):
+    """Return labels in the text exposition format."""
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'),
+        )
+        for name, value in labels
+    )
+
+    return '{' + pairs + '}'
+
+
+def _format_value(value):
+    """Return a sample value in the text exposition format."""
+    if value == float('inf'):
+        return '+Inf'
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with one series per label set."""
+    kind = 'counter'
+
+    def __init__(self, name, documentation, label_names):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        """Add amount to the series of labels."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        """Yield the (suffix, labels, value) samples of the counter."""
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield '_total', zip(self.label_names, labels), value
+
+
+class Histogram:
+    """Bucketed distribution with one series per label set."""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, label_names, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        """Record value in the series of labels."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [
+                    [0] * len(self.buckets), 0.0,
+                ]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        """Yield the (suffix, labels, value) samples of the histogram."""
+        with self._lock:
+            series = {
+                labels: (list(counts), total)
+                for labels, (counts, total) in self._series.items()
+            }
+        for labels, (counts, total) in sorted(series.items()):
+            named = list(zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield '_bucket', named + [('le', _format_value(bound))], \
+                    cumulative
+            yield '_sum', named, total
+            yield '_count', named, cumulative
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        """Add metric to the registry and return it."""
+        self._metrics.append(metric)
+
+        return metric
+
+    def render(self):
+        """Return every metric in the text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for suffix, labels, value in metric.samples():
+                lines.append('{}{}{} {}'.format(
+                    metric.name, suffix, _format_labels(labels),
+                    _format_value(value),
+                ))
+
+        return '\n'.join(lines) + '\n'
+
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+VIEW_LABELS = ('view', 'action')
+
+registry = Registry()
+request_duration = registry.register(Histogram(
+    'http_request_duration_seconds',
+    'Request latency by view and action.',
+    VIEW_LABELS + ('status',),
+    LATENCY_BUCKETS,
+))
+request_queries = registry.register(Histogram(
+    'http_request_db_queries',
+    'Database queries run per request by view and action.',
+    VIEW_LABELS,
+    QUERY_BUCKETS,
+))
+request_query_seconds = registry.register(Counter(
+    'http_request_db_query_seconds',
+    'Time spent in database queries by view and action.',
+    VIEW_LABELS,
+))
+response_bytes = registry.register(Counter(
+    'http_response_bytes',
+    'Response body bytes by view and action.',
+    VIEW_LABELS,
+))
+
+
+def get_view_labels(request):
+    """Return the (view, action) labels of a resolved request.
+
+    DRF viewsets are labelled with their class and the action the
+    request method maps to, other views with their class or function.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved', request.method.lower()
+    func = match.func
+    view_class = getattr(func, 'cls', None) or getattr(func, 'view_class', None)
+    target = view_class or func
+    actions = getattr(func, 'actions', None) or {}
+    method = request.method.lower()
+
+    return (
+        f'{target.__module__}.{target.__name__}',
+        actions.get(method, method),
+    )
@@ -0,0 +1,201 @@
+"""
+Middleware for app.
+"""
+import asyncio
+import logging
+import time
+
+from asgiref.sync import markcoroutinefunction
+
+from django.conf import settings
+
+from core import metrics
+from core.db_routers import use_replica
+from core.metrics import request_latency
+from core.profiling import (
+    QueryProfiler,
+    collect_queries,
+    format_nplusone,
+    format_summary,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCapableMiddleware:
+    """Base of middleware running in the mode of the rest of the chain.
+
+    Under ASGI, Django hands async capable middleware an async
+    get_response when what follows is async, and awaits the middleware
+    itself, so these never block the event loop. Django's own
+    middleware still runs its hooks through sync_to_async in an async
+    chain. Subclasses start __call__ by returning __acall__ when
+    is_async.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+
+class ReplicaRoutingMiddleware(AsyncCapableMiddleware):
+    """Serve the reads of safe requests from the read replica.
+
+    The routing flag is a context variable, so it also reaches the
+    threads sync_to_async runs the async views' queries in.
+    """
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if request.method not in self.safe_methods:
+            return self.get_response(request)
+
+        with use_replica():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if request.method not in self.safe_methods:
+            return await self.get_response(request)
+
+        with use_replica():
+            return await self.get_response(request)
+
+
+class RequestLatencyMiddleware(AsyncCapableMiddleware):
+    """Record the latency of each request in the rolling window."""
+    untracked_url_names = ('health-check', 'health-live', 'health-ready')
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, start)
+
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, start)
+
+        return response
+
+    def record(self, request, start):
+        """Record the latency of request unless its view is untracked."""
+        match = getattr(request, 'resolver_match', None)
+        if match is None or match.url_name not in self.untracked_url_names:
+            request_latency.record(time.perf_counter() - start)
+
+
+class QueryStats:
+    """Database execute wrapper counting queries and their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """Record latency, queries and response size per view and action."""
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats = QueryStats()
+        start = time.perf_counter()
+        with collect_queries(stats):
+            response = self.get_response(request)
+        self.record(request, response, stats, time.perf_counter() - start)
+
+        return response
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        start = time.perf_counter()
+        with collect_queries(stats):
+            response = await self.get_response(request)
+        self.record(request, response, stats, time.perf_counter() - start)
+
+        return response
+
+    def record(self, request, response, stats, duration):
+        """Record the metrics of a finished request."""
+        labels = metrics.get_view_labels(request)
+        metrics.request_duration.observe(
+            labels + (str(response.status_code),), duration,
+        )
+        metrics.request_queries.observe(labels, stats.count)
+        metrics.request_query_seconds.inc(labels, stats.seconds)
+        if not response.streaming:
+            metrics.response_bytes.inc(labels, len(response.content))
+
+
+class SQLProfilerMiddleware(AsyncCapableMiddleware):
+    """Summarize the SQL run by a request in response headers.
+
+    Profiling runs for every request when SQL_PROFILER_ENABLED is set,
+    or for requests sending an X-Profile-SQL header when
+    SQL_PROFILER_ALLOW_HEADER is set.
+    """
+
+    def is_enabled(self, request):
+        """Return True if the queries of request should be profiled."""
+        if settings.SQL_PROFILER_ENABLED:
+            return True
+
+        return settings.SQL_PROFILER_ALLOW_HEADER and request.META.get(
+            'HTTP_X_PROFILE_SQL', '',
+        ).lower() in ('1', 'true', 'yes')
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.is_enabled(request):
+            return self.get_response(request)
+
+        profiler = QueryProfiler()
+        with profiler.capture():
+            response = self.get_response(request)
+
+        return self.annotate(request, response, profiler)
+
+    async def __acall__(self, request):
+        if not self.is_enabled(request):
+            return await self.get_response(request)
+
+        profiler = QueryProfiler()
+        with profiler.capture():
+            response = await self.get_response(request)
+
+        return self.annotate(request, response, profiler)
+
+    def annotate(self, request, response, profiler):
+        """Add the profile headers to response and log N+1 queries."""
+        summary = profiler.summary()
+        response['X-SQL-Profile'] = format_summary(summary)
+        if summary['nplusone']:
+            response['X-SQL-NPlusOne'] = format_nplusone(summary)
+            logger.warning(
+                'N+1 queries in %s %s: %s',
+                request.method,
+                request.path,
+                summary['nplusone'],
+            )
+
+        return response
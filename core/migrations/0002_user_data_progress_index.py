@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user_data',
+            index=models.Index(fields=['user', 'track_id', 'is_done'], name='core_user_d_user_id_6d5ef9_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:25
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Q
+
+
+def remove_duplicate_steps(apps, schema_editor):
+    """Keep only the latest event for each user, track and order.
+
+    The unique constraint below allows one row per step, so the older
+    events of a step recorded more than once are deleted for good, and
+    history exports only hold the latest one. Reversing the migration
+    drops the constraint but cannot bring them back. The rows go in one
+    DELETE on the database rather than being read into memory.
+    """
+    User_Data = apps.get_model('core', 'User_Data')
+    newer = User_Data.objects.filter(
+        user_id=OuterRef('user_id'),
+        track_id=OuterRef('track_id'),
+        order_major=OuterRef('order_major'),
+        order_minor=OuterRef('order_minor'),
+    ).filter(
+        Q(action_date__gt=OuterRef('action_date'))
+        | Q(action_date=OuterRef('action_date'), id__gt=OuterRef('id'))
+    )
+    User_Data.objects.filter(Exists(newer)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_user_data_progress_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_steps,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='user_data',
+            constraint=models.UniqueConstraint(fields=('user', 'track_id', 'order_major', 'order_minor'), name='unique_user_data_step'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_user_data_unique_step'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Track_Follow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('followed_date', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='comment_track',
+            name='track',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='core.track'),
+        ),
+        migrations.AddField(
+            model_name='track',
+            name='rating_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='track',
+            name='rating_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='track',
+            name='followers_num',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='track',
+            name='rating_avg',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=5),
+        ),
+        migrations.AddIndex(
+            model_name='track',
+            index=models.Index(fields=['-followers_num', '-id'], name='core_track_followe_8526a4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='track',
+            index=models.Index(fields=['-rating_avg', '-id'], name='core_track_rating__10a9ec_idx'),
+        ),
+        migrations.AddField(
+            model_name='track_follow',
+            name='track',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.track'),
+        ),
+        migrations.AddField(
+            model_name='track_follow',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='track_follow',
+            constraint=models.UniqueConstraint(fields=('user', 'track'), name='unique_track_follow'),
+        ),
+    ]
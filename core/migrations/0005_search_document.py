@@ -0,0 +1,113 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:27
+
+from django.db import migrations, models
+
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE core_search_document_fts USING fts5(
+        title, body,
+        content='core_search_document',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER core_search_document_ai
+    AFTER INSERT ON core_search_document BEGIN
+        INSERT INTO core_search_document_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER core_search_document_ad
+    AFTER DELETE ON core_search_document BEGIN
+        INSERT INTO core_search_document_fts(
+            core_search_document_fts, rowid, title, body
+        ) VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER core_search_document_au
+    AFTER UPDATE ON core_search_document BEGIN
+        INSERT INTO core_search_document_fts(
+            core_search_document_fts, rowid, title, body
+        ) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO core_search_document_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS core_search_document_au',
+    'DROP TRIGGER IF EXISTS core_search_document_ad',
+    'DROP TRIGGER IF EXISTS core_search_document_ai',
+    'DROP TABLE IF EXISTS core_search_document_fts',
+]
+
+POSTGRESQL_FORWARD = [
+    """
+    ALTER TABLE core_search_document ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX core_search_document_vector_idx
+    ON core_search_document USING GIN (search_vector)
+    """,
+]
+
+POSTGRESQL_REVERSE = [
+    'DROP INDEX IF EXISTS core_search_document_vector_idx',
+    'ALTER TABLE core_search_document DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def _run(schema_editor, statements):
+    """Execute statements for the database vendor."""
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    """Create the full-text index over search documents."""
+    _run(schema_editor, {
+        'sqlite': SQLITE_FORWARD,
+        'postgresql': POSTGRESQL_FORWARD,
+    })
+
+
+def drop_search_index(apps, schema_editor):
+    """Drop the full-text index over search documents."""
+    _run(schema_editor, {
+        'sqlite': SQLITE_REVERSE,
+        'postgresql': POSTGRESQL_REVERSE,
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_track_follow_and_rating_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Search_Document',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('track', 'Track'), ('book', 'Book'), ('task', 'Task')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='search_document',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
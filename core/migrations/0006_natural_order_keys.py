@@ -0,0 +1,85 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:32
+
+import re
+
+from django.db import migrations, models
+
+
+ORDER_KEY_MAX = 2 ** 31 - 1
+
+
+def natural_order_key(value):
+    """Return the integer sort key of an order_major/order_minor value.
+
+    A copy of core.models.natural_order_key as of this migration, so
+    later changes to the model helper do not rewrite history.
+    """
+    match = re.match(r'\s*(\d+)', value or '')
+    if not match:
+        return 0
+
+    return min(int(match.group(1)), ORDER_KEY_MAX)
+
+
+def fill_order_keys(apps, schema_editor):
+    """Compute the order keys of existing tasks and userdata."""
+    for model_name in ('Task', 'User_Data'):
+        model = apps.get_model('core', model_name)
+        batch = []
+        for obj in model.objects.only(
+            'id', 'order_major', 'order_minor',
+        ).iterator(chunk_size=1000):
+            obj.order_major_key = natural_order_key(obj.order_major)
+            obj.order_minor_key = natural_order_key(obj.order_minor)
+            batch.append(obj)
+            if len(batch) >= 1000:
+                model.objects.bulk_update(
+                    batch, ['order_major_key', 'order_minor_key'],
+                )
+                batch = []
+        model.objects.bulk_update(
+            batch, ['order_major_key', 'order_minor_key'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_search_document'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['order_major_key', 'order_minor_key', 'id']},
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='order_major_key',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='order_minor_key',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user_data',
+            name='order_major_key',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user_data',
+            name='order_minor_key',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_order_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['track_id', 'order_major_key', 'order_minor_key', 'id'], name='core_task_track_i_939ff1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user_data',
+            index=models.Index(fields=['user', 'track_id', 'order_major_key', 'order_minor_key'], name='core_user_d_user_id_5d7595_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_natural_order_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='track',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_track_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='track',
+            index=models.Index(fields=['-published_date'], name='core_track_publish_66b2b0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='track',
+            index=models.Index(fields=['subject_major', 'subject_minor', '-published_date'], name='core_track_subject_2fbf01_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='track',
+            index=models.Index(fields=['target_test', 'target_grade', '-published_date'], name='core_track_target__f00802_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user_data',
+            index=models.Index(fields=['user', '-action_date'], name='core_user_d_user_id_55eba1_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='track',
+            constraint=models.CheckConstraint(check=models.Q(('followers_num__gte', 0)), name='track_followers_num_gte_0'),
+        ),
+        migrations.AddConstraint(
+            model_name='track',
+            constraint=models.CheckConstraint(check=models.Q(('rating_count__gte', 0)), name='track_rating_count_gte_0'),
+        ),
+    ]
@@ -0,0 +1,229 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:01
+
+from django.db import migrations, models, transaction
+from django.db.migrations.exceptions import IrreversibleError
+from django.db.models import Max
+import django.db.models.deletion
+
+
+FK_SUFFIX = '_fk_%(to_table)s_%(to_column)s'
+BATCH_SIZE = 1000
+
+
+def _chunks(model):
+    """Yield the [start, stop) primary key ranges covering model."""
+    last = model.objects.aggregate(last=Max('pk'))['last'] or 0
+    for start in range(0, last + 1, BATCH_SIZE):
+        yield start, start + BATCH_SIZE
+
+
+def _orphans(model, Track, start, stop):
+    """Return the rows of a key range whose track does not exist."""
+    return model.objects.filter(
+        pk__gte=start, pk__lt=stop, track_id__isnull=False,
+    ).exclude(track_id__in=Track.objects.values('pk'))
+
+
+def repair_references(Track, Task, User_Data):
+    """Fix the rows pointing at missing tracks before the keys are checked.
+
+    Tasks linked to exactly one existing track through Track.task are
+    moved to it. Every other orphan keeps its row with a NULL track, the
+    state SET_NULL leaves the rows of a deleted track in, so no task or
+    progress is lost; report_track_orphans lists them. One committed
+    chunk of keys is fixed at a time so no table is locked for long.
+    """
+    Through = Track.task.through
+
+    for start, stop in _chunks(Task):
+        with transaction.atomic():
+            orphans = set(
+                _orphans(Task, Track, start, stop).values_list(
+                    'pk', flat=True,
+                )
+            )
+            links = {}
+            for task_id, track_id in Through.objects.filter(
+                task_id__in=orphans,
+                track_id__in=Track.objects.values('pk'),
+            ).values_list('task_id', 'track_id'):
+                links.setdefault(task_id, set()).add(track_id)
+            for task_id, track_ids in links.items():
+                if len(track_ids) == 1:
+                    Task.objects.filter(pk=task_id).update(
+                        track_id=track_ids.pop(),
+                    )
+                    orphans.discard(task_id)
+            Task.objects.filter(pk__in=orphans).update(track_id=None)
+
+    for start, stop in _chunks(User_Data):
+        with transaction.atomic():
+            _orphans(User_Data, Track, start, stop).update(track_id=None)
+
+
+def _integer_field(model):
+    """Return the bare integer field the track reference used to be."""
+    field = models.IntegerField()
+    field.set_attributes_from_name('track_id')
+    field.model = model
+
+    return field
+
+
+def _existing_constraints(schema_editor, model, field):
+    """Return the (foreign key, index) names already on the column."""
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, model._meta.db_table,
+        )
+    foreign_keys, indexes = [], []
+    for name, details in constraints.items():
+        if details['columns'] != [field.column]:
+            continue
+        if details['foreign_key']:
+            foreign_keys.append(name)
+        elif details['index'] and not details['unique']:
+            indexes.append(name)
+
+    return foreign_keys, indexes
+
+
+def _add_postgresql(schema_editor, model, field):
+    """Add the key without rewriting or write-locking the table.
+
+    The column keeps its integer type, which PostgreSQL accepts as a
+    reference to the bigint key, since widening it rewrites the table.
+    The index is built concurrently and the constraint is validated
+    separately, which only takes a lock that lets writes through.
+    """
+    quote = schema_editor.quote_name
+    table = model._meta.db_table
+    foreign_keys, indexes = _existing_constraints(schema_editor, model, field)
+    if field.db_index and not indexes:
+        schema_editor.execute('CREATE INDEX CONCURRENTLY %s ON %s (%s)' % (
+            quote(schema_editor._create_index_name(table, [field.column])),
+            quote(table),
+            quote(field.column),
+        ))
+    if foreign_keys:
+        name = quote(foreign_keys[0])
+    else:
+        name = str(schema_editor._fk_constraint_name(model, field, FK_SUFFIX))
+        schema_editor.execute('%s NOT VALID' % schema_editor._create_fk_sql(
+            model, field, FK_SUFFIX,
+        ))
+    schema_editor.execute(
+        'ALTER TABLE %s VALIDATE CONSTRAINT %s' % (quote(table), name),
+    )
+
+
+def add_foreign_keys(apps, schema_editor):
+    """Turn the track_id columns into nullable, indexed foreign keys.
+
+    The columns accept NULL before the orphans are repaired. On SQLite
+    the keys are only checked once the migration ends, after the repair.
+    """
+    Track = apps.get_model('core', 'Track')
+    Task = apps.get_model('core', 'Task')
+    User_Data = apps.get_model('core', 'User_Data')
+    postgresql = schema_editor.connection.vendor == 'postgresql'
+    quote = schema_editor.quote_name
+
+    for model in (Task, User_Data):
+        field = model._meta.get_field('track')
+        if postgresql:
+            schema_editor.execute(
+                'ALTER TABLE %s ALTER COLUMN %s DROP NOT NULL' % (
+                    quote(model._meta.db_table), quote(field.column),
+                ),
+            )
+        else:
+            schema_editor.alter_field(model, _integer_field(model), field)
+
+    repair_references(Track, Task, User_Data)
+
+    if postgresql:
+        for model in (Task, User_Data):
+            _add_postgresql(schema_editor, model, model._meta.get_field(
+                'track',
+            ))
+
+
+def remove_foreign_keys(apps, schema_editor):
+    """Turn the track foreign keys back into bare integer columns.
+
+    Rows whose track was cleared have no track to go back to, so this
+    fails while any are left.
+    """
+    quote = schema_editor.quote_name
+    for model_name in ('Task', 'User_Data'):
+        model = apps.get_model('core', model_name)
+        if model.objects.filter(track__isnull=True).exists():
+            raise IrreversibleError(
+                f'{model_name} rows without a track cannot be restored; '
+                f'see report_track_orphans.'
+            )
+    for model_name in ('Task', 'User_Data'):
+        model = apps.get_model('core', model_name)
+        field = model._meta.get_field('track')
+        if schema_editor.connection.vendor == 'postgresql':
+            foreign_keys, indexes = _existing_constraints(
+                schema_editor, model, field,
+            )
+            for name in foreign_keys:
+                schema_editor.execute(schema_editor._delete_fk_sql(
+                    model, name,
+                ))
+            for name in indexes:
+                schema_editor.execute(schema_editor._delete_index_sql(
+                    model, name,
+                ))
+            schema_editor.execute(
+                'ALTER TABLE %s ALTER COLUMN %s SET NOT NULL' % (
+                    quote(model._meta.db_table), quote(field.column),
+                ),
+            )
+        else:
+            schema_editor.alter_field(model, field, _integer_field(model))
+
+
+class Migration(migrations.Migration):
+    # The reference repair commits per chunk and PostgreSQL builds the
+    # index concurrently, neither of which can run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('core', '0008_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='track',
+            name='task',
+            field=models.ManyToManyField(related_name='linked_tracks', to='core.Task'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveField(
+                    model_name='task',
+                    name='track_id',
+                ),
+                migrations.AddField(
+                    model_name='task',
+                    name='track',
+                    field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tasks', to='core.track'),
+                ),
+                migrations.RemoveField(
+                    model_name='user_data',
+                    name='track_id',
+                ),
+                migrations.AddField(
+                    model_name='user_data',
+                    name='track',
+                    field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='user_data', to='core.track'),
+                ),
+            ],
+        ),
+        migrations.RunPython(add_foreign_keys, remove_foreign_keys),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_book_isbn_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user_data',
+            index=models.Index(fields=['user', '-id'], name='core_user_d_user_id_6708e2_idx'),
+        ),
+    ]
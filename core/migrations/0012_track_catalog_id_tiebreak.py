@@ -0,0 +1,37 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_user_data_id_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='track',
+            name='core_track_publish_66b2b0_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='track',
+            name='core_track_subject_2fbf01_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='track',
+            name='core_track_target__f00802_idx',
+        ),
+        migrations.AddIndex(
+            model_name='track',
+            index=models.Index(fields=['-published_date', '-id'], name='core_track_publish_3fd449_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='track',
+            index=models.Index(fields=['subject_major', 'subject_minor', '-published_date', '-id'], name='core_track_subject_7410dc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='track',
+            index=models.Index(fields=['target_test', 'target_grade', '-published_date', '-id'], name='core_track_target__ffd22c_idx'),
+        ),
+    ]
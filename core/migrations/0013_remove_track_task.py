@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:16
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_track_catalog_id_tiebreak'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='track',
+            name='task',
+        ),
+    ]
@@ -3,16 +3,25 @@ Database models.
 """
 import uuid
 import os
+import re
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (
+    Case,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    When,
+)
+from django.db.models.functions import Cast
 from django.utils import timezone
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin,
 )
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 
 
@@ -24,6 +33,33 @@ def track_image_file_path(instance, filename):
     return os.path.join('uploads', 'track', filename)
 
 
+ORDER_KEY_MAX = 2 ** 31 - 1
+# Largest key a 64 bit column holds; larger ids overflow in lookups.
+ID_MAX = 2 ** 63 - 1
+
+
+def natural_order_key(value):
+    """Return the integer sort key of an order_major/order_minor value."""
+    match = re.match(r'\s*(\d+)', value or '')
+    if not match:
+        return 0
+
+    return min(int(match.group(1)), ORDER_KEY_MAX)
+
+
+class OrderKeyMixin:
+    """Keep the integer order keys in sync with the order fields."""
+
+    def set_order_keys(self):
+        """Compute the order keys from order_major and order_minor."""
+        self.order_major_key = natural_order_key(self.order_major)
+        self.order_minor_key = natural_order_key(self.order_minor)
+
+    def save(self, *args, **kwargs):
+        self.set_order_keys()
+        super().save(*args, **kwargs)
+
+
 class UserManager(BaseUserManager):
     """Manager for users."""
 
@@ -79,21 +115,41 @@ class Profile(models.Model):
         return self.user.nickname
 
 
-class User_Data(models.Model):
-    '''track = models.ForeignKey(
-        'Track',
-        on_delete=models.CASCADE,
-    )'''
+class User_Data(OrderKeyMixin, models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
-    track_id = models.IntegerField()
+    # Progress outlives its track, so deleting one keeps the history.
+    track = models.ForeignKey(
+        'Track',
+        on_delete=models.SET_NULL,
+        related_name='user_data',
+        null=True,
+    )
     action_date = models.DateTimeField(default=timezone.now)
     order_major = models.CharField(max_length=255)
     order_minor = models.CharField(max_length=255)
+    order_major_key = models.IntegerField(default=0, editable=False)
+    order_minor_key = models.IntegerField(default=0, editable=False)
     is_done = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'track_id', 'is_done']),
+            models.Index(fields=[
+                'user', 'track_id', 'order_major_key', 'order_minor_key',
+            ]),
+            models.Index(fields=['user', '-action_date']),
+            models.Index(fields=['user', '-id']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'track_id', 'order_major', 'order_minor'],
+                name='unique_user_data_step',
+            ),
+        ]
+
 
 class Track(models.Model):
     """Trkack object."""
@@ -119,21 +175,78 @@ class Track(models.Model):
     description = models.TextField(blank=True)
     link = models.CharField(max_length=255, blank=True)
     #followers = models.ManyToManyField('User', blank =True)
-    followers_num = models.IntegerField()
+    followers_num = models.IntegerField(default=0)
     #comment_track = models.ManyToManyField('Comment_Track', blank=True)
-    rating_avg = models.DecimalField(max_digits=5, decimal_places=2)
-    task = models.ManyToManyField('Task')
+    rating_avg = models.DecimalField(
+        max_digits=5, decimal_places=2, default=0,
+    )
+    rating_sum = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
     image = models.ImageField(null=True, upload_to=track_image_file_path)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     published_date = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-followers_num', '-id']),
+            models.Index(fields=['-rating_avg', '-id']),
+            models.Index(fields=['-published_date', '-id']),
+            models.Index(fields=[
+                'subject_major', 'subject_minor', '-published_date', '-id',
+            ]),
+            models.Index(fields=[
+                'target_test', 'target_grade', '-published_date', '-id',
+            ]),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(followers_num__gte=0),
+                name='track_followers_num_gte_0',
+            ),
+            models.CheckConstraint(
+                check=models.Q(rating_count__gte=0),
+                name='track_rating_count_gte_0',
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
 
-class Task(models.Model):
-    track_id = models.IntegerField()
+class Track_Follow(models.Model):
+    """Follow of a track by a user."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    track = models.ForeignKey(
+        'Track',
+        on_delete=models.CASCADE,
+    )
+    followed_date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'track'],
+                name='unique_track_follow',
+            ),
+        ]
+
+
+class Task(OrderKeyMixin, models.Model):
+    # The (track_id, order keys) index below also serves the foreign key.
+    track = models.ForeignKey(
+        'Track',
+        on_delete=models.SET_NULL,
+        related_name='tasks',
+        db_index=False,
+        null=True,
+    )
     order_major = models.CharField(max_length=255)
     order_minor = models.CharField(max_length=255)
+    order_major_key = models.IntegerField(default=0, editable=False)
+    order_minor_key = models.IntegerField(default=0, editable=False)
     task_name = models.CharField(max_length=255)
     ranges = models.CharField(max_length=255)
     learning_time = models.CharField(max_length=255)
@@ -141,13 +254,21 @@ class Task(models.Model):
     #comment_task = models.CharField(max_length=255)
     references = models.CharField(max_length=255)
 
+    class Meta:
+        ordering = ['order_major_key', 'order_minor_key', 'id']
+        indexes = [
+            models.Index(fields=[
+                'track_id', 'order_major_key', 'order_minor_key', 'id',
+            ]),
+        ]
+
 
 class Book(models.Model):
     title = models.CharField(max_length=255)
     sub_title = models.CharField(max_length=255)
     author = models.CharField(max_length=255)
     image_url = models.CharField(max_length=255)
-    isbn = models.CharField(max_length=255)
+    isbn = models.CharField(max_length=255, db_index=True)
     publisher = models.CharField(max_length=255)
     published_date = models.DateTimeField(default=timezone.now)
 
@@ -157,6 +278,12 @@ class Comment_Track(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    track = models.ForeignKey(
+        'Track',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+    )
     comment = models.CharField(max_length=225)
     rating = models.IntegerField()
 
@@ -169,6 +296,30 @@ class Comment_Task(models.Model):
     comment = models.CharField(max_length=225)
 
 
+class Search_Document(models.Model):
+    """Searchable text of a track, book or task."""
+    TRACK = 'track'
+    BOOK = 'book'
+    TASK = 'task'
+    KIND_CHOICES = (
+        (TRACK, 'Track'),
+        (BOOK, 'Book'),
+        (TASK, 'Task'),
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'object_id'],
+                name='unique_search_document',
+            ),
+        ]
+
+
 '''class Recipe(models.Model):
     """Recipe object."""
     user = models.ForeignKey(
@@ -235,3 +386,89 @@ class Tag_Target_Grade(models.Model):
     def __str__(self):
         return self.name
 
+
+def track_rating_avg():
+    """Return an expression computing rating_avg from the track counters."""
+    return Case(
+        When(rating_count__lte=0, then=0),
+        default=ExpressionWrapper(
+            Cast('rating_sum', output_field=FloatField()) / F('rating_count'),
+            output_field=FloatField(),
+        ),
+        output_field=FloatField(),
+    )
+
+
+def update_track_rating(track_id, rating_delta, count_delta):
+    """Apply a rating change to the counters of a track."""
+    tracks = Track.objects.filter(pk=track_id)
+    with transaction.atomic():
+        tracks.update(
+            rating_sum=F('rating_sum') + rating_delta,
+            rating_count=F('rating_count') + count_delta,
+        )
+        tracks.update(rating_avg=track_rating_avg())
+
+
+def refresh_track_rating(track_id):
+    """Recompute the rating counters of a track from its comments."""
+    ratings = Comment_Track.objects.filter(
+        track_id=track_id,
+    ).aggregate(
+        total=models.Sum('rating'),
+        count=models.Count('id'),
+    )
+    with transaction.atomic():
+        Track.objects.filter(pk=track_id).update(
+            rating_sum=ratings['total'] or 0,
+            rating_count=ratings['count'],
+        )
+        update_track_rating(track_id, 0, 0)
+
+
+@receiver(post_save, sender=Track_Follow)
+def increment_followers_num(sender, instance, created, **kwargs):
+    """Count a new follower of the track."""
+    if created:
+        Track.objects.filter(pk=instance.track_id).update(
+            followers_num=F('followers_num') + 1,
+        )
+
+
+@receiver(post_delete, sender=Track_Follow)
+def decrement_followers_num(sender, instance, **kwargs):
+    """Stop counting a follower of the track."""
+    Track.objects.filter(pk=instance.track_id).update(
+        followers_num=F('followers_num') - 1,
+    )
+
+
+@receiver(pre_save, sender=Comment_Track)
+def remember_rated_track(sender, instance, **kwargs):
+    """Remember the track a saved comment was counted in."""
+    instance._rated_track_id = None
+    if instance.pk is not None:
+        instance._rated_track_id = Comment_Track.objects.filter(
+            pk=instance.pk,
+        ).values_list('track_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment_Track)
+def add_track_rating(sender, instance, created, **kwargs):
+    """Count the rating of a comment in its track."""
+    previous = getattr(instance, '_rated_track_id', None)
+    if previous is not None and previous != instance.track_id:
+        refresh_track_rating(previous)
+    if instance.track_id is None:
+        return
+    if created:
+        update_track_rating(instance.track_id, instance.rating, 1)
+    else:
+        refresh_track_rating(instance.track_id)
+
+
+@receiver(post_delete, sender=Comment_Track)
+def remove_track_rating(sender, instance, **kwargs):
+    """Stop counting the rating of a comment in its track."""
+    if instance.track_id is not None:
+        update_track_rating(instance.track_id, -instance.rating, -1)
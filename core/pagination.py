@@ -0,0 +1,153 @@
+"""
+Pagination classes for the list APIs.
+"""
+import json
+
+from django.conf import settings
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+def _reverse_ordering(ordering):
+    """Return ordering with the direction of every field flipped."""
+    return tuple(
+        field[1:] if field.startswith('-') else f'-{field}'
+        for field in ordering
+    )
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor based pagination over a stable ordering.
+
+    Pages are fetched with a WHERE clause on the ordering columns instead
+    of an OFFSET, so deep pages cost the same as the first one. The id is
+    appended to every ordering and the cursor holds the values of all the
+    ordering columns, so rows sharing a value never fall back to OFFSET
+    and always come in the same order.
+    """
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-id'
+
+    def get_ordering(self, request, queryset, view):
+        """Return the requested ordering with an id tie-breaker."""
+        ordering = super().get_ordering(request, queryset, view)
+        names = {field.lstrip('-') for field in ordering}
+        if not names & {'id', 'pk'}:
+            direction = '-' if ordering[0].startswith('-') else ''
+            ordering += (f'{direction}id',)
+
+        return ordering
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            name = field.lstrip('-')
+            if isinstance(instance, dict):
+                values.append(instance[name])
+            else:
+                values.append(getattr(instance, name))
+
+        return json.dumps([str(value) for value in values])
+
+    def _position_filter(self, ordering, position):
+        """Return a filter for the rows after position in ordering."""
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        after = Q()
+        for index, field in enumerate(ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = Q(**{f'{field.lstrip("-")}__{lookup}': values[index]})
+            for previous, value in zip(ordering[:index], values):
+                step &= Q(**{previous.lstrip('-'): value})
+            after |= step
+
+        return after
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return a page of queryset following the request cursor.
+
+        This follows CursorPagination.paginate_queryset, filtering on the
+        whole position instead of the first ordering column only.
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        ordering = self.ordering
+        if reverse:
+            ordering = _reverse_ordering(ordering)
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            queryset = queryset.filter(
+                self._position_filter(ordering, current_position),
+            )
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering,
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+
+class TrackCursorPagination(KeysetPagination):
+    """Paginate tracks from the most recently published."""
+    ordering = '-published_date'
+
+
+class TaskCursorPagination(KeysetPagination):
+    """Paginate tasks from the most recently created."""
+    ordering = '-id'
+
+
+class UserDataCursorPagination(KeysetPagination):
+    """Paginate user data from the most recently recorded.
+
+    The bulk upsert rewrites action_date, so paging on it would move
+    rows between pages while a client walks them.
+    """
+    ordering = '-id'
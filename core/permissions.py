@@ -0,0 +1,20 @@
+"""
+Permissions shared by the API views.
+"""
+from rest_framework.permissions import BasePermission
+
+from core.models import Profile
+
+
+class IsLeader(BasePermission):
+    """Allow staff and users whose profile has the leader role."""
+    message = 'Only curriculum leaders can do this.'
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        if user.is_staff:
+            return True
+
+        return Profile.objects.filter(user=user, role=Profile.LEADER).exists()
@@ -0,0 +1,216 @@
+"""
+Eager loading plans derived from serializer field trees.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+
+from rest_framework import serializers
+
+
+def _resolve_relation(model, source_attrs):
+    """Return the lookup path, relation kind and target model for a source.
+
+    The kind is 'select' when every hop is a forward single-valued
+    relation, 'prefetch' when any hop is multi-valued and None when the
+    source does not end on a model relation.
+    """
+    path = []
+    kind = 'select'
+    for attr in source_attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None, None, None
+        if not field.is_relation or attr != field.name:
+            # Not a relation, or the raw key column of a foreign key.
+            return None, None, None
+        if field.many_to_many or field.one_to_many:
+            kind = 'prefetch'
+        path.append(attr)
+        model = field.related_model
+
+    return '__'.join(path), kind, model
+
+
+def _uses_pk_only(field):
+    """Return True if a related field only needs the foreign key value."""
+    return (
+        isinstance(field, serializers.RelatedField)
+        and field.use_pk_only_optimization()
+    )
+
+
+def get_eager_loading(serializer, model=None, prefix='', prefetching=False):
+    """Return the (select_related, prefetch_related) paths for serializer.
+
+    Nested serializers and related fields are walked recursively so any
+    relation that would be fetched row by row is loaded up front.
+    """
+    if model is None:
+        model = serializer.Meta.model
+    select_related, prefetch_related = [], []
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        if isinstance(field, serializers.ListSerializer):
+            target = field.child
+        elif isinstance(field, serializers.ManyRelatedField):
+            target = field.child_relation
+        else:
+            target = field
+
+        path, kind, related_model = _resolve_relation(
+            model, field.source_attrs,
+        )
+        if path is None:
+            continue
+        path = prefix + path
+        if kind == 'select' and _uses_pk_only(target):
+            continue
+
+        nested_prefetching = prefetching or kind == 'prefetch'
+        if nested_prefetching:
+            prefetch_related.append(path)
+        else:
+            select_related.append(path)
+
+        if isinstance(target, serializers.BaseSerializer):
+            nested_select, nested_prefetch = get_eager_loading(
+                target,
+                model=related_model,
+                prefix=f'{path}__',
+                prefetching=nested_prefetching,
+            )
+            select_related.extend(nested_select)
+            prefetch_related.extend(nested_prefetch)
+
+    return select_related, prefetch_related
+
+
+def get_only_fields(serializer, model=None, prefix=''):
+    """Return the columns serializer reads, as only() lookups.
+
+    Forward relations rendered by nested serializers are followed so
+    their columns can be narrowed through select_related. Returns None
+    when a field reads something other than a model column, as
+    deferring columns would then cost a query per row.
+    """
+    if model is None:
+        model = serializer.Meta.model
+    names = {prefix + model._meta.pk.name}
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*' or len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if model_field.many_to_many or model_field.one_to_many:
+            continue
+        if not model_field.concrete:
+            return None
+        names.add(prefix + model_field.name)
+
+        if (
+            not model_field.is_relation
+            or _uses_pk_only(field)
+            or field.source_attrs[0] == model_field.attname
+        ):
+            continue
+        if not isinstance(field, serializers.BaseSerializer):
+            return None
+        nested = get_only_fields(
+            field,
+            model=model_field.related_model,
+            prefix=f'{prefix}{model_field.name}__',
+        )
+        if nested is None:
+            return None
+        names |= nested
+
+    return names
+
+
+def _narrow_prefetch(serializer, model, path):
+    """Return a Prefetch loading only the columns a leaf relation needs."""
+    field = next(
+        (
+            field for field in serializer.fields.values()
+            if field.source_attrs == [path]
+        ),
+        None,
+    )
+    if field is None:
+        return path
+    target = field.child if isinstance(
+        field, serializers.ListSerializer,
+    ) else field
+    if not isinstance(target, serializers.ModelSerializer):
+        return path
+    model_field = model._meta.get_field(field.source_attrs[0])
+    related_model = model_field.related_model
+    if any(get_eager_loading(target, model=related_model)):
+        return path
+    only = get_only_fields(target, model=related_model)
+    if only is None:
+        return path
+    if model_field.one_to_many:
+        only.add(model_field.field.name)
+
+    return Prefetch(path, queryset=related_model.objects.only(*only))
+
+
+def eager_load(queryset, serializer, narrow=False, extra_fields=()):
+    """Apply the eager loading plan of serializer to queryset.
+
+    With narrow, only the columns serializer reads are loaded, plus
+    extra_fields such as the ordering columns of the paginator.
+    """
+    select_related, prefetch_related = get_eager_loading(
+        serializer, model=queryset.model,
+    )
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if narrow:
+        only = get_only_fields(serializer, model=queryset.model)
+        if only is not None:
+            queryset = queryset.only(*only, *extra_fields)
+        prefetch_related = [
+            _narrow_prefetch(serializer, queryset.model, path)
+            if '__' not in path else path
+            for path in prefetch_related
+        ]
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+
+    return queryset
+
+
+class EagerLoadingMixin:
+    """Load the relations used by the serializer alongside the queryset."""
+
+    def get_eager_loading_serializer(self):
+        """Return the serializer whose fields drive the eager loading."""
+        return self.get_serializer_class()()
+
+    def eager_load(self, queryset, serializer):
+        """Apply the eager loading plan of serializer to queryset."""
+        return eager_load(queryset, serializer)
+
+    def get_queryset(self):
+        """Return the queryset with the serializer's relations loaded."""
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if serializer_class is None or not issubclass(
+            serializer_class, serializers.ModelSerializer,
+        ):
+            return queryset
+
+        return self.eager_load(
+            queryset, self.get_eager_loading_serializer(),
+        )
@@ -0,0 +1,183 @@
+"""
+SQL profiling and N+1 detection.
+"""
+import functools
+import re
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from rest_framework.fields import Field
+
+
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def query_shape(sql):
+    """Return sql with literals, placeholders and IN lists collapsed."""
+    for pattern, replacement in _LITERALS:
+        sql = pattern.sub(replacement, sql)
+
+    return sql.replace('%s', '?').strip()
+
+
+def serializer_field_source():
+    """Return the serializer field being rendered by the current stack.
+
+    DRF renders each field from Serializer.to_representation with the
+    field bound to a `field` local, so the innermost such frame names
+    the field whose attribute access ran the query.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code.co_name == 'to_representation':
+            field = frame.f_locals.get('field')
+            if isinstance(field, Field) and field.parent is not None:
+                return f'{type(field.parent).__name__}.{field.field_name}'
+        frame = frame.f_back
+
+    return None
+
+
+_collectors = ContextVar('query_collectors', default=())
+
+
+def run_collectors(execute, sql, params, many, context):
+    """Execute wrapper passing a query through the active collectors.
+
+    It is installed on every connection, and the collectors are held in
+    a context variable. Under ASGI, the queries of a request run in the
+    threads of sync_to_async, on connections other than the ones of the
+    thread that started collecting, and the context follows them there.
+    """
+    for collector in reversed(_collectors.get()):
+        execute = functools.partial(collector, execute)
+
+    return execute(sql, params, many, context)
+
+
+def install_collectors(sender, connection, **kwargs):
+    """Add run_collectors to a new connection, once."""
+    if run_collectors not in connection.execute_wrappers:
+        # First, so the pop of connection.execute_wrapper() blocks
+        # entered before the connection opened removes their own wrapper.
+        connection.execute_wrappers.insert(0, run_collectors)
+
+
+@contextmanager
+def collect_queries(collector):
+    """Pass the queries of the current context through collector.
+
+    collector is called like a database execute wrapper.
+    """
+    marker = _collectors.set(_collectors.get() + (collector,))
+    try:
+        yield collector
+    finally:
+        _collectors.reset(marker)
+
+
+class QueryProfiler:
+    """Database execute wrapper recording every statement."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'shape': query_shape(sql),
+                'seconds': time.perf_counter() - start,
+                'source': serializer_field_source(),
+            })
+
+    def capture(self):
+        """Record the queries of the current context inside the block."""
+        return collect_queries(self)
+
+    def summary(self, threshold=None):
+        """Return counts, repeated shapes and suspected N+1 patterns.
+
+        A SELECT shape run at least threshold times is reported as an
+        N+1 pattern along with the serializer fields that ran it.
+        """
+        if threshold is None:
+            threshold = settings.SQL_PROFILER_NPLUSONE_THRESHOLD
+        shapes = defaultdict(
+            lambda: {'count': 0, 'seconds': 0.0, 'sources': set()},
+        )
+        for query in self.queries:
+            shape = shapes[query['shape']]
+            shape['count'] += 1
+            shape['seconds'] += query['seconds']
+            if query['source']:
+                shape['sources'].add(query['source'])
+
+        repeated = [
+            {
+                'shape': sql,
+                'count': shape['count'],
+                'time_ms': round(shape['seconds'] * 1000, 2),
+                'sources': sorted(shape['sources']),
+            }
+            for sql, shape in shapes.items()
+            if shape['count'] > 1
+        ]
+        repeated.sort(key=lambda shape: shape['count'], reverse=True)
+
+        return {
+            'count': len(self.queries),
+            'time_ms': round(
+                sum(query['seconds'] for query in self.queries) * 1000, 2,
+            ),
+            'shapes': len(shapes),
+            'repeated': repeated,
+            'nplusone': [
+                shape for shape in repeated
+                if shape['count'] >= threshold
+                and shape['shape'].upper().startswith('SELECT')
+            ],
+        }
+
+
+def format_summary(summary):
+    """Return the one line header value of a profile summary."""
+    return 'count={}, time_ms={}, shapes={}, nplusone={}'.format(
+        summary['count'],
+        summary['time_ms'],
+        summary['shapes'],
+        len(summary['nplusone']),
+    )
+
+
+def format_nplusone(summary):
+    """Return the header value naming the suspected N+1 patterns."""
+    return '; '.join(
+        '{} x{}'.format(
+            ','.join(shape['sources']) or 'unknown', shape['count'],
+        )
+        for shape in summary['nplusone']
+    )
+
+
+def parse_summary(value):
+    """Return the counters of a formatted summary header value."""
+    counters = {}
+    for item in value.split(','):
+        name, _, number = item.strip().partition('=')
+        counters[name] = float(number) if '.' in number else int(number)
+
+    return counters
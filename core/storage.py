@@ -0,0 +1,57 @@
+"""
+Content-addressed file storage.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage naming files after the SHA-256 of their content.
+
+    Uploads are hashed while they are streamed to a temporary file, then
+    moved to <directory>/<aa>/<bb>/<sha256><ext>. Identical uploads end
+    up at the same path and are only stored once.
+    """
+    temp_suffix = '.part'
+
+    def content_name(self, name, digest):
+        """Return the content-addressed name for name with digest."""
+        directory = os.path.dirname(name)
+        ext = os.path.splitext(name)[1].lower()
+
+        return os.path.join(
+            directory, digest[:2], digest[2:4], f'{digest}{ext}',
+        ).replace('\\', '/')
+
+    def _save(self, name, content):
+        directory = self.path(os.path.dirname(name))
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(
+            dir=directory, suffix=self.temp_suffix,
+        )
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+
+            name = self.content_name(name, digest.hexdigest())
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                # Refresh the mtime so the garbage collector treats the
+                # file as freshly referenced.
+                os.utime(full_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, full_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return name
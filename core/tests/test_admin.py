@@ -6,8 +6,10 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.test import Client
 
+from core.tests.utils import QueryBudgetMixin
 
-class AdminSiteTests(TestCase):
+
+class AdminSiteTests(QueryBudgetMixin, TestCase):
     """Tests for Django admin."""
 
     def setUp(self):
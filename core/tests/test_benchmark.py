@@ -0,0 +1,65 @@
+"""
+Tests for the API benchmark command.
+"""
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core.management.commands.benchmark_api import seed_data
+from core.models import Profile, Track, User_Data
+from core.tests.utils import QueryBudgetMixin
+
+
+class BenchmarkCommandTests(QueryBudgetMixin, TestCase):
+    """Test seeding and running the benchmark command."""
+
+    def test_seed_data(self):
+        """Test the synthetic dataset is created for benchmark users."""
+        counts = seed_data(users=2, tracks=3, tasks=4, tracks_per_user=2)
+
+        self.assertEqual(Profile.objects.count(), 2)
+        self.assertEqual(Track.objects.count(), 3)
+        self.assertEqual(User_Data.objects.count(), counts['user_data'])
+        self.assertTrue(
+            get_user_model().objects.filter(
+                email='benchmark1@example.com',
+            ).exists(),
+        )
+
+    def test_requires_seeded_data(self):
+        """Test the benchmark refuses to run without a dataset."""
+        with self.assertRaisesMessage(CommandError, 'run with --seed'):
+            call_command('benchmark_api', requests=1)
+
+    def test_unknown_endpoint(self):
+        """Test unknown endpoints are rejected."""
+        with self.assertRaisesMessage(CommandError, 'Unknown endpoints'):
+            call_command('benchmark_api', endpoints='nope')
+
+    def test_token_auth_throttled(self):
+        """Test token_auth refuses rates that would answer 429."""
+        seed_data(users=2, tracks=1, tasks=1, tracks_per_user=1)
+
+        with self.assertRaisesMessage(CommandError, 'LOGIN_IP_RATE'):
+            call_command(
+                'benchmark_api', endpoints='token_auth', requests=100,
+            )
+
+    @patch('core.management.commands.benchmark_api.Client.request')
+    def test_non_2xx_responses_fail(self, request):
+        """Test the run fails when an endpoint answers with errors."""
+        seed_data(users=2, tracks=1, tasks=1, tracks_per_user=1)
+        request.return_value = (429, 0.001, None)
+        out = StringIO()
+
+        with self.assertRaisesMessage(CommandError, 'track_catalog'):
+            call_command(
+                'benchmark_api', endpoints='track_catalog', requests=2,
+                stdout=out,
+            )
+
+        self.assertIn('"429": 2', out.getvalue())
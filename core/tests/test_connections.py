@@ -0,0 +1,39 @@
+"""
+Tests for the persistent connection health checks.
+"""
+from unittest.mock import patch
+
+from django.core.signals import request_started
+from django.db import connection
+from django.test import TransactionTestCase
+
+
+class ConnectionHealthTests(TransactionTestCase):
+    """Test reused connections are checked when a request starts."""
+
+    def start_request(self, usable, health_checks=True):
+        """Send request_started and return the mocked close."""
+        connection.ensure_connection()
+        settings_dict = {'CONN_HEALTH_CHECKS': health_checks}
+        # Keep the connection persistent, as CONN_MAX_AGE would.
+        with patch.object(connection, 'close_at', None), \
+                patch.dict(connection.settings_dict, settings_dict), \
+                patch.object(connection, 'is_usable', return_value=usable), \
+                patch.object(connection, 'close') as close:
+            request_started.send(sender=self.__class__)
+
+        return close
+
+    def test_broken_connection_closed(self):
+        """Test an unusable connection is closed before it is reused."""
+        self.assertTrue(self.start_request(usable=False).called)
+
+    def test_working_connection_kept(self):
+        """Test a usable connection is kept open."""
+        self.assertFalse(self.start_request(usable=True).called)
+
+    def test_disabled_without_setting(self):
+        """Test connections are not pinged without CONN_HEALTH_CHECKS."""
+        close = self.start_request(usable=False, health_checks=False)
+
+        self.assertFalse(close.called)
@@ -0,0 +1,127 @@
+"""
+Tests for the synthetic data generator.
+"""
+from io import StringIO
+
+from django.contrib.auth import authenticate
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core.cache import CATALOG_NAMESPACE, get_version
+from core.datagen import DataGenerator
+from core.models import (
+    Book,
+    Profile,
+    Search_Document,
+    Task,
+    Track,
+    User_Data,
+)
+from core.tests.utils import QueryBudgetMixin
+from search.index import search
+
+
+def track_shapes(tracks):
+    """Return the generated attributes of tracks."""
+    return [
+        (track.subject_major, track.subject_minor, track.target_test)
+        for track in tracks
+    ]
+
+
+class DataGeneratorTests(QueryBudgetMixin, TestCase):
+    """Test generating datasets with bulk inserts."""
+
+    def generate(self, prefix='user', seed=0):
+        generator = DataGenerator(seed=seed, email_prefix=prefix)
+
+        return generator.generate(
+            users=5, books=2, tracks=4, tasks_per_track=3, tracks_per_user=2,
+        )
+
+    def test_generate_counts(self):
+        """Test the requested number of rows is created."""
+        counts = self.generate()
+
+        self.assertEqual(counts['users'], 5)
+        self.assertEqual(Profile.objects.count(), 5)
+        self.assertEqual(Book.objects.count(), 2)
+        self.assertEqual(Track.objects.count(), 4)
+        self.assertEqual(Task.objects.count(), 12)
+        self.assertEqual(User_Data.objects.count(), counts['user_data'])
+
+    def test_referentially_consistent(self):
+        """Test generated rows point at each other consistently."""
+        self.generate()
+
+        for track in Track.objects.all():
+            self.assertEqual(track.profile.user_id, track.leader_id)
+            self.assertEqual(track.tasks.count(), 3)
+        for event in User_Data.objects.all():
+            self.assertTrue(Track.objects.filter(id=event.track_id).exists())
+            self.assertEqual(
+                event.order_minor_key, int(event.order_minor),
+            )
+
+    def test_deterministic(self):
+        """Test the same seed generates the same dataset."""
+        self.generate(prefix='first')
+        first = Track.objects.order_by('id')
+        first_shapes = track_shapes(first)
+        first_ids = list(first.values_list('id', flat=True))
+
+        self.generate(prefix='second')
+
+        second = Track.objects.exclude(id__in=first_ids).order_by('id')
+        self.assertEqual(track_shapes(second), first_shapes)
+
+    def test_search_index_and_cache_updated(self):
+        """Test generated rows are searchable and the catalog refreshed."""
+        version = get_version(CATALOG_NAMESPACE)
+
+        self.generate()
+
+        self.assertEqual(Search_Document.objects.count(), 2 + 4 + 12)
+        track = Track.objects.order_by('id').last()
+        self.assertIn(
+            track.pk,
+            [
+                result['object_id']
+                for result in search(track.track_name, kind='track')
+            ],
+        )
+        self.assertNotEqual(get_version(CATALOG_NAMESPACE), version)
+
+    def test_users_can_log_in(self):
+        """Test generated users share a working password."""
+        self.generate()
+
+        user = authenticate(email='user3@example.com', password='testpass123')
+
+        self.assertIsNotNone(user)
+
+    def test_rows_created_after_generation(self):
+        """Test new rows get keys after the generated ones."""
+        self.generate()
+        track = Track.objects.first()
+
+        book = Book.objects.create(
+            title='New', sub_title='', author='', image_url='', isbn='',
+            publisher='',
+        )
+
+        self.assertGreater(book.id, track.book_id)
+
+    def test_command(self):
+        """Test the command reports the generated rows."""
+        out = StringIO()
+
+        call_command(
+            'generate_data', users=3, books=1, tracks=2, tasks_per_track=2,
+            tracks_per_user=1, stdout=out,
+        )
+
+        self.assertIn('users: 3', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('generate_data', users=3, stdout=StringIO())
@@ -0,0 +1,50 @@
+"""
+Tests for the database routers.
+"""
+from django.test import RequestFactory, SimpleTestCase
+
+from core.db_routers import ReplicaRouter, use_replica
+from core.middleware import ReplicaRoutingMiddleware
+from core.models import Track
+from core.tests.utils import QueryBudgetMixin
+
+
+DATABASES = {
+    'default': {'ENGINE': 'django.db.backends.sqlite3'},
+    'replica': {'ENGINE': 'django.db.backends.sqlite3'},
+}
+
+
+class ReplicaRouterTests(QueryBudgetMixin, SimpleTestCase):
+    """Test read replica routing."""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_use_default_without_replica(self):
+        """Test reads stay on default when no replica is configured."""
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Track), 'default')
+
+    def test_reads_use_replica_when_enabled(self):
+        """Test reads go to the replica only inside use_replica()."""
+        with self.settings(DATABASES=DATABASES):
+            self.assertEqual(self.router.db_for_read(Track), 'default')
+            with use_replica():
+                self.assertEqual(self.router.db_for_read(Track), 'replica')
+                self.assertEqual(self.router.db_for_write(Track), 'default')
+
+    def test_middleware_routes_safe_methods(self):
+        """Test only safe requests are served from the replica."""
+        databases = []
+
+        def get_response(request):
+            databases.append(self.router.db_for_read(Track))
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        factory = RequestFactory()
+        with self.settings(DATABASES=DATABASES):
+            middleware(factory.get('/'))
+            middleware(factory.post('/'))
+
+        self.assertEqual(databases, ['replica', 'default'])
@@ -0,0 +1,79 @@
+"""
+Tests for the explain_querysets command.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from core.management.commands.explain_querysets import analyze_plan
+from core.tests.utils import QueryBudgetMixin
+
+
+class AnalyzePlanTests(SimpleTestCase):
+    """Test detecting sequential scans in query plans."""
+
+    def test_sqlite_scan(self):
+        """Test a SQLite table scan without an index is reported."""
+        plan = (
+            '7 0 0 SCAN core_track\n'
+            '9 0 0 USE TEMP B-TREE FOR ORDER BY'
+        )
+
+        self.assertEqual(analyze_plan(plan), (['core_track'], 1))
+
+    def test_sqlite_index(self):
+        """Test SQLite index searches and index scans are not reported."""
+        plan = (
+            '7 0 0 SCAN core_track USING INDEX core_track_publish_idx\n'
+            '10 0 0 SEARCH core_book USING INTEGER PRIMARY KEY (rowid=?)'
+        )
+
+        self.assertEqual(analyze_plan(plan), ([], 0))
+
+    def test_postgres_scan(self):
+        """Test a PostgreSQL sequential scan and sort are reported."""
+        plan = (
+            'Limit  (cost=10.1..10.2 rows=21 width=8)\n'
+            '  ->  Sort  (cost=10.1..10.5 rows=120 width=8)\n'
+            '        ->  Seq Scan on core_track  (cost=0.0..8.2 rows=120)'
+        )
+
+        self.assertEqual(analyze_plan(plan), (['core_track'], 1))
+
+
+class ExplainQuerysetsCommandTests(QueryBudgetMixin, TestCase):
+    """Test explaining the viewset querysets."""
+
+    def call(self, *args):
+        out = StringIO()
+        call_command('explain_querysets', *args, stdout=out)
+
+        return out.getvalue()
+
+    def test_catalog_uses_indexes(self):
+        """Test the filtered and ordered catalog avoids table scans."""
+        out = self.call(
+            '--only=track_catalog,track_catalog_subject,'
+            'track_catalog_target,userdata_list',
+            '--fail-on-scan',
+        )
+
+        self.assertIn('track_catalog: ok', out)
+        self.assertIn('track_catalog_subject: ok', out)
+        self.assertIn('track_catalog_target: ok', out)
+        self.assertIn('userdata_list: ok', out)
+
+    def test_task_and_book_lists_resolve(self):
+        """Test the task and book querysets build and explain."""
+        out = self.call('--only=task_list,book_list')
+
+        self.assertNotIn('error', out)
+        self.assertIn('task_list:', out)
+        self.assertIn('book_list:', out)
+
+    def test_unknown_queryset(self):
+        """Test an unknown queryset name is rejected."""
+        with self.assertRaises(CommandError):
+            self.call('--only=nonexistent')
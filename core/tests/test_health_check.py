@@ -1,14 +1,23 @@
 """
 Tests for the health check API.
 """
-from django.test import TestCase
+import tempfile
+from unittest.mock import Mock, patch
+
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from core.metrics import LatencyWindow, request_latency
+from core.tests.utils import QueryBudgetMixin
+
+
+READY_URL = reverse('health-ready')
 
-class HealthCheckTests(TestCase):
+
+class HealthCheckTests(QueryBudgetMixin, TestCase):
     """Test the health check API."""
 
     def test_health_check(self):
@@ -18,3 +27,121 @@ class HealthCheckTests(TestCase):
         res = client.get(url)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_liveness(self):
+        """Test the liveness endpoint."""
+        res = APIClient().get(reverse('health-live'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class LatencyWindowTests(QueryBudgetMixin, TestCase):
+    """Test the rolling latency window."""
+
+    def test_summary(self):
+        """Test the window reports p50 and p99 of recent latencies."""
+        window = LatencyWindow(size=100)
+        for ms in range(1, 201):
+            window.record(ms / 1000)
+
+        summary = window.summary()
+
+        self.assertEqual(summary['count'], 100)
+        self.assertEqual(summary['p50_ms'], 151)
+        self.assertEqual(summary['p99_ms'], 200)
+
+    def test_old_latencies_dropped(self):
+        """Test latencies older than the window age stop counting."""
+        window = LatencyWindow(size=100, max_age=60)
+        with patch('core.metrics.time.monotonic', return_value=1000):
+            window.record(0.5)
+        with patch('core.metrics.time.monotonic', return_value=1030):
+            window.record(0.01)
+            self.assertEqual(window.summary()['count'], 2)
+
+        with patch('core.metrics.time.monotonic', return_value=1061):
+            summary = window.summary()
+
+        self.assertEqual(summary['count'], 1)
+        self.assertEqual(summary['p99_ms'], 10)
+
+    def test_empty_summary(self):
+        """Test an empty window has no percentiles."""
+        summary = LatencyWindow(size=10).summary()
+
+        self.assertEqual(summary, {'count': 0, 'p50_ms': None, 'p99_ms': None})
+
+
+class ReadinessTests(QueryBudgetMixin, TestCase):
+    """Test the readiness endpoint."""
+
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        settings = override_settings(MEDIA_ROOT=self.media_root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        request_latency.clear()
+        self.addCleanup(request_latency.clear)
+        self.client = APIClient()
+
+    def test_ready(self):
+        """Test readiness reports each dependency and request latency."""
+        self.client.get(reverse('health-check'))
+        self.client.get(reverse('track:track-all-list'))
+
+        res = self.client.get(READY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.data['healthy'])
+        self.assertEqual(
+            set(res.data['checks']),
+            {'database', 'migrations', 'media', 'cache'},
+        )
+        for check in res.data['checks'].values():
+            self.assertTrue(check['healthy'])
+            self.assertIn('latency_ms', check)
+        self.assertEqual(res.data['latency']['count'], 1)
+
+    def test_failing_dependency(self):
+        """Test readiness fails when a dependency check fails."""
+        failing_check = Mock(side_effect=RuntimeError('down'))
+        with patch.dict('core.health.CHECKS', {'cache': failing_check}):
+            res = self.client.get(READY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(res.data['checks']['cache']['healthy'])
+        self.assertEqual(res.data['checks']['cache']['error'], 'down')
+
+    @override_settings(READINESS_MAX_P99_MS=50)
+    def test_slow_requests_not_ready(self):
+        """Test readiness fails when the latency p99 is over budget."""
+        request_latency.record(0.2)
+
+        res = self.client.get(READY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(res.data['latency']['healthy'])
+
+    @override_settings(READINESS_MAX_P99_MS=50, LATENCY_WINDOW_SECONDS=60)
+    def test_ready_again_after_slow_requests(self):
+        """Test readiness recovers once slow requests leave the window."""
+        with patch('core.metrics.time.monotonic', return_value=1000):
+            request_latency.record(0.2)
+        with patch('core.metrics.time.monotonic', return_value=1061):
+            res = self.client.get(READY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['latency']['count'], 0)
+
+    def test_replica_checked(self):
+        """Test readiness checks the replica when one is configured."""
+        databases = {'default': {}, 'replica': {}}
+        with patch('core.health.settings', DATABASES=databases), patch(
+            'core.health.check_database',
+        ) as check_database:
+            res = self.client.get(READY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('replica', res.data['checks'])
+        check_database.assert_any_call('replica')
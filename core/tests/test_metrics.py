@@ -0,0 +1,73 @@
+"""
+Tests for the request metrics.
+"""
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.metrics import Counter, Histogram, Registry
+from core.tests.utils import QueryBudgetMixin
+
+
+class RegistryTests(QueryBudgetMixin, TestCase):
+    """Test rendering metrics in the text exposition format."""
+
+    def test_render(self):
+        """Test counters and cumulative histogram buckets are rendered."""
+        registry = Registry()
+        histogram = registry.register(
+            Histogram('latency_seconds', 'Latency.', ['view'], [0.1, 1]),
+        )
+        counter = registry.register(Counter('bytes', 'Bytes.', ['view']))
+        histogram.observe(('a',), 0.05)
+        histogram.observe(('a',), 0.5)
+        counter.inc(('a',), 10)
+        counter.inc(('a',), 5)
+
+        text = registry.render()
+
+        self.assertIn('# TYPE latency_seconds histogram', text)
+        self.assertIn('latency_seconds_bucket{view="a",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{view="a",le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{view="a",le="+Inf"} 2', text)
+        self.assertIn('latency_seconds_sum{view="a"} 0.55', text)
+        self.assertIn('latency_seconds_count{view="a"} 2', text)
+        self.assertIn('# TYPE bytes counter', text)
+        self.assertIn('bytes_total{view="a"} 15', text)
+
+    def test_label_values_escaped(self):
+        """Test quotes in label values are escaped."""
+        registry = Registry()
+        counter = registry.register(Counter('hits', 'Hits.', ['path']))
+        counter.inc(('say "hi"',))
+
+        self.assertIn(r'hits_total{path="say \"hi\""} 1', registry.render())
+
+
+class MetricsMiddlewareTests(QueryBudgetMixin, TestCase):
+    """Test the metrics recorded per view and action."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_viewset_action_recorded(self):
+        """Test requests are recorded under their viewset and action."""
+        self.client.get(reverse('track:track-all-list'))
+
+        res = self.client.get(reverse('metrics'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['Content-Type'].startswith('text/plain'))
+        text = res.content.decode()
+        labels = 'view="track.views.TrackAllViewSet",action="list"'
+        self.assertIn(
+            f'http_request_duration_seconds_count{{{labels},status="200"}}',
+            text,
+        )
+        self.assertIn(f'http_request_db_queries_count{{{labels}}}', text)
+        self.assertIn(f'http_request_db_query_seconds_total{{{labels}}}', text)
+        self.assertIn(f'http_response_bytes_total{{{labels}}}', text)
@@ -3,11 +3,14 @@ Tests for models.
 """
 from unittest.mock import patch
 from decimal import Decimal
+from io import StringIO
 
+from django.core.management import call_command
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
 from core import models
+from core.tests.utils import QueryBudgetMixin
 
 
 def create_user(email='user@example.com', password='testpass123'):
@@ -15,7 +18,36 @@ def create_user(email='user@example.com', password='testpass123'):
     return get_user_model().objects.create_user(email, password)
 
 
-class ModelTests(TestCase):
+def create_track(user):
+    """Create and return a track led by user."""
+    profile = models.Profile.objects.create(
+        user=user,
+        nickname='leader',
+        subjects='math',
+        image_url='http://example.com/profile.png',
+    )
+    book = models.Book.objects.create(
+        title='Sample book',
+        sub_title='Sample sub title',
+        author='Author',
+        image_url='http://example.com/book.png',
+        isbn='9780000000000',
+        publisher='Publisher',
+    )
+
+    return models.Track.objects.create(
+        leader=user,
+        profile=profile,
+        book=book,
+        subject_major='math',
+        subject_minor='algebra',
+        target_test='sat',
+        target_grade='12',
+        track_name='Sample track',
+    )
+
+
+class ModelTests(QueryBudgetMixin, TestCase):
     """Test models."""
 
     def test_create_user_with_email_successful(self):
@@ -98,3 +130,129 @@ class ModelTests(TestCase):
         file_path = models.recipe_image_file_path(None, 'example.jpg')
 
         self.assertEqual(file_path, f'uploads/recipe/{uuid}.jpg')
+
+    def test_natural_order_key(self):
+        """Test order values are converted to numeric sort keys."""
+        self.assertEqual(models.natural_order_key('10'), 10)
+        self.assertEqual(models.natural_order_key(' 2-3'), 2)
+        self.assertEqual(models.natural_order_key('intro'), 0)
+
+    def test_task_order_keys_set_on_save(self):
+        """Test saving a task fills in its order keys."""
+        task = models.Task.objects.create(
+            track=create_track(create_user()),
+            order_major='12',
+            order_minor='3',
+            task_name='Task',
+            ranges='1-10',
+            learning_time='30',
+            guideline='Read',
+            references='None',
+        )
+
+        self.assertEqual((task.order_major_key, task.order_minor_key), (12, 3))
+
+    def test_track_delete_keeps_rows(self):
+        """Test deleting a track unlinks its tasks and userdata."""
+        user = create_user()
+        track = create_track(user)
+        task = models.Task.objects.create(
+            track=track,
+            order_major='1',
+            order_minor='1',
+            task_name='Task',
+            ranges='1-10',
+            learning_time='30',
+            guideline='Read',
+            references='None',
+        )
+        event = models.User_Data.objects.create(
+            user=user, track=track, order_major='1', order_minor='1',
+        )
+        self.assertEqual(list(track.tasks.all()), [task])
+
+        track.delete()
+
+        task.refresh_from_db()
+        event.refresh_from_db()
+        self.assertIsNone(task.track_id)
+        self.assertIsNone(event.track_id)
+
+
+class TrackCounterTests(QueryBudgetMixin, TestCase):
+    """Test the denormalized track counters."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.track = create_track(self.user)
+
+    def test_follow_updates_followers_num(self):
+        """Test following and unfollowing updates followers_num."""
+        follow = models.Track_Follow.objects.create(
+            user=self.user, track=self.track,
+        )
+        models.Track_Follow.objects.create(
+            user=create_user(email='other@example.com'), track=self.track,
+        )
+        self.track.refresh_from_db()
+        self.assertEqual(self.track.followers_num, 2)
+
+        follow.delete()
+
+        self.track.refresh_from_db()
+        self.assertEqual(self.track.followers_num, 1)
+
+    def test_comment_updates_rating(self):
+        """Test rating comments keep rating_avg up to date."""
+        comment = models.Comment_Track.objects.create(
+            user=self.user, track=self.track, comment='Good', rating=5,
+        )
+        models.Comment_Track.objects.create(
+            user=self.user, track=self.track, comment='Fine', rating=2,
+        )
+        self.track.refresh_from_db()
+        self.assertEqual(self.track.rating_avg, Decimal('3.50'))
+
+        comment.rating = 3
+        comment.save()
+        self.track.refresh_from_db()
+        self.assertEqual(self.track.rating_avg, Decimal('2.50'))
+
+        comment.delete()
+        self.track.refresh_from_db()
+        self.assertEqual(self.track.rating_count, 1)
+        self.assertEqual(self.track.rating_avg, Decimal('2.00'))
+
+    def test_comment_moved_updates_both_tracks(self):
+        """Test moving a comment to another track updates both ratings."""
+        other = create_track(create_user(email='other@example.com'))
+        comment = models.Comment_Track.objects.create(
+            user=self.user, track=self.track, comment='Good', rating=4,
+        )
+
+        comment.track = other
+        comment.save()
+
+        self.track.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.track.rating_count, 0)
+        self.assertEqual(self.track.rating_avg, Decimal('0.00'))
+        self.assertEqual(other.rating_count, 1)
+        self.assertEqual(other.rating_avg, Decimal('4.00'))
+
+    def test_reconcile_track_counters(self):
+        """Test the reconcile command recomputes drifted counters."""
+        models.Track_Follow.objects.create(user=self.user, track=self.track)
+        models.Comment_Track.objects.create(
+            user=self.user, track=self.track, comment='Good', rating=4,
+        )
+        models.Track.objects.update(
+            followers_num=10, rating_sum=0, rating_count=0, rating_avg=0,
+        )
+
+        call_command('reconcile_track_counters', stdout=StringIO())
+
+        self.track.refresh_from_db()
+        self.assertEqual(self.track.followers_num, 1)
+        self.assertEqual(self.track.rating_count, 1)
+        self.assertEqual(self.track.rating_avg, Decimal('4.00'))
@@ -0,0 +1,57 @@
+"""
+Tests for the report_track_orphans command.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core.datagen import DataGenerator
+from core.models import Task, Track, User_Data
+from core.tests.utils import QueryBudgetMixin
+
+
+class ReportTrackOrphansTests(QueryBudgetMixin, TestCase):
+    """Test reporting the rows of deleted tracks."""
+
+    def setUp(self):
+        DataGenerator(seed=0).generate(
+            users=3, books=1, tracks=2, tasks_per_track=2, tracks_per_user=2,
+        )
+
+    def call(self, *args):
+        out = StringIO()
+        call_command('report_track_orphans', *args, stdout=out)
+
+        return out.getvalue()
+
+    def test_deleted_track_keeps_rows(self):
+        """Test deleting a track keeps its tasks and progress unlinked."""
+        track = Track.objects.order_by('pk').first()
+        task_ids = list(track.tasks.values_list('pk', flat=True))
+        user_data_count = User_Data.objects.count()
+        orphaned = track.user_data.count()
+
+        track.delete()
+
+        self.assertEqual(User_Data.objects.count(), user_data_count)
+        out = self.call('--limit=1')
+        self.assertIn(
+            f'Task: 2 without a track: {min(task_ids)}, ...', out,
+        )
+        self.assertIn(f'User_Data: {orphaned} without a track', out)
+        self.assertTrue(
+            Task.objects.filter(pk__in=task_ids, track=None).exists(),
+        )
+
+    def test_fail_on_orphans(self):
+        """Test --fail-on-orphans only fails when a row has no track."""
+        self.assertIn('Task: 0 without a track', self.call(
+            '--fail-on-orphans',
+        ))
+
+        Track.objects.order_by('pk').first().delete()
+
+        with self.assertRaises(CommandError):
+            self.call('--fail-on-orphans')
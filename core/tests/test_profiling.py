@@ -0,0 +1,146 @@
+"""
+Tests for the SQL profiler.
+"""
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from core.models import Profile
+from core.profiling import QueryProfiler, parse_summary, query_shape
+from core.tests.utils import QueryBudgetMixin, query_budget
+
+
+class ProfileUserSerializer(serializers.ModelSerializer):
+    """Serializer reading a relation that is not eager loaded."""
+    user = serializers.StringRelatedField()
+
+    class Meta:
+        model = Profile
+        fields = ['id', 'user']
+
+
+def create_profiles(count):
+    """Create count users with a profile each."""
+    for index in range(count):
+        user = get_user_model().objects.create_user(
+            f'user{index}@example.com', 'testpass123',
+        )
+        Profile.objects.create(
+            user=user,
+            nickname=f'user{index}',
+            role=Profile.LEADER,
+            subjects='math',
+            image_url='http://example.com/profile.png',
+        )
+
+
+class QueryProfilerTests(QueryBudgetMixin, TestCase):
+    """Test grouping queries and detecting N+1 patterns."""
+
+    def test_query_shape(self):
+        """Test literals and IN lists are collapsed in query shapes."""
+        self.assertEqual(
+            query_shape(
+                'SELECT * FROM t WHERE id IN (%s, %s, %s)  AND name = \'a\''
+                ' LIMIT 21',
+            ),
+            "SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?",
+        )
+
+    @override_settings(SQL_PROFILER_NPLUSONE_THRESHOLD=5)
+    @query_budget(50, allow_nplusone=True)
+    def test_nplusone_attributed_to_serializer_field(self):
+        """Test repeated queries name the serializer field running them."""
+        create_profiles(5)
+        profiler = QueryProfiler()
+
+        with profiler.capture():
+            ProfileUserSerializer(Profile.objects.all(), many=True).data
+
+        summary = profiler.summary()
+        self.assertEqual(summary['count'], 6)
+        self.assertEqual(len(summary['nplusone']), 1)
+        self.assertEqual(summary['nplusone'][0]['count'], 5)
+        self.assertEqual(
+            summary['nplusone'][0]['sources'],
+            ['ProfileUserSerializer.user'],
+        )
+
+    def test_query_budget_exceeded(self):
+        """Test the budget mixin fails tests running too many queries."""
+        class BudgetTest(QueryBudgetMixin, unittest.TestCase):
+            @query_budget(1)
+            def test_queries(self):
+                list(Profile.objects.all())
+                list(Profile.objects.all())
+
+        result = unittest.TestResult()
+        BudgetTest('test_queries').run(result)
+
+        self.assertEqual(len(result.failures), 1)
+        self.assertIn('exceeded the budget of 1', result.failures[0][1])
+
+    def test_default_query_budget_exceeded(self):
+        """Test undecorated tests are held to the class budget."""
+        class BudgetTest(QueryBudgetMixin, unittest.TestCase):
+            query_budget = 1
+
+            def test_queries(self):
+                list(Profile.objects.all())
+                list(Profile.objects.all())
+
+        result = unittest.TestResult()
+        BudgetTest('test_queries').run(result)
+
+        self.assertEqual(len(result.failures), 1)
+        self.assertIn('exceeded the budget of 1', result.failures[0][1])
+
+
+@override_settings(SQL_PROFILER_ENABLED=False, SQL_PROFILER_ALLOW_HEADER=True)
+class SQLProfilerMiddlewareTests(QueryBudgetMixin, TestCase):
+    """Test the SQL profile response headers."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_profile_header(self):
+        """Test requests asking for a profile get a summary header."""
+        res = self.client.get(
+            reverse('track:track-all-list'), HTTP_X_PROFILE_SQL='1',
+        )
+
+        summary = parse_summary(res['X-SQL-Profile'])
+        self.assertGreater(summary['count'], 0)
+        self.assertEqual(summary['nplusone'], 0)
+        self.assertNotIn('X-SQL-NPlusOne', res)
+
+    def test_profile_not_requested(self):
+        """Test requests are not profiled unless asked to."""
+        res = self.client.get(reverse('track:track-all-list'))
+
+        self.assertNotIn('X-SQL-Profile', res)
+
+
+@override_settings(SQL_PROFILER_ENABLED=False, SQL_PROFILER_ALLOW_HEADER=True)
+class AsyncSQLProfilerMiddlewareTests(TransactionTestCase):
+    """Test profiling the async views, which query in worker threads."""
+
+    def setUp(self):
+        cache.clear()
+
+    async def test_profile_header(self):
+        """Test queries run outside the request thread are profiled."""
+        res = await self.async_client.get(
+            reverse('track:async-track-all-list'),
+            **{'x-profile-sql': '1'},
+        )
+
+        summary = parse_summary(res['X-SQL-Profile'])
+        self.assertGreater(summary['count'], 0)
@@ -0,0 +1,94 @@
+"""
+Helpers shared by the API tests.
+"""
+import functools
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.profiling import QueryProfiler
+
+
+class QueryCountMixin:
+    """Assertions about the number of queries run by a request."""
+
+    def count_queries(self, func, *args, **kwargs):
+        """Call func and return the number of queries it ran."""
+        with CaptureQueriesContext(connection) as context:
+            func(*args, **kwargs)
+
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, func, add_rows, rounds=2):
+        """Assert func runs the same number of queries as rows are added."""
+        expected = self.count_queries(func)
+        for _ in range(rounds):
+            add_rows()
+            self.assertEqual(
+                self.count_queries(func),
+                expected,
+                'Query count grew with the number of rows.',
+            )
+
+
+def enforce_query_budget(test, method, budget, allow_nplusone):
+    """Call a test method and fail the test if it broke its budget."""
+    profiler = QueryProfiler()
+    with profiler.capture():
+        method(test)
+
+    summary = profiler.summary()
+    if summary['count'] > budget:
+        test.fail(
+            f'{summary["count"]} queries exceeded the budget of '
+            f'{budget}: {summary["repeated"][:3]}',
+        )
+    nplusone = [
+        shape for shape in summary['nplusone'] if shape['sources']
+    ]
+    if nplusone and not allow_nplusone:
+        test.fail(f'N+1 queries from serializer fields: {nplusone}')
+
+
+def query_budget(budget=None, allow_nplusone=False):
+    """Enforce a query budget on a single test method.
+
+    Without a budget, the query_budget attribute of the test case is
+    used.
+    """
+    def decorator(test_method):
+        @functools.wraps(test_method)
+        def wrapper(self):
+            enforce_query_budget(
+                self,
+                test_method,
+                self.query_budget if budget is None else budget,
+                allow_nplusone,
+            )
+
+        wrapper.query_budget = budget
+        return wrapper
+
+    return decorator
+
+
+class QueryBudgetMixin:
+    """Fail tests that exceed their query budget or run N+1 queries.
+
+    The budget covers the queries run by the test method itself, not
+    setUp, and defaults to the class attribute query_budget. Repeated
+    SELECTs attributed to a serializer field fail the test as N+1.
+    Test methods not decorated with query_budget get the default one
+    when the class is defined.
+    """
+    query_budget = 50
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, value in list(vars(cls).items()):
+            if (
+                name.startswith('test')
+                and callable(value)
+                and not hasattr(value, 'query_budget')
+            ):
+                setattr(cls, name, query_budget()(value))
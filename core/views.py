@@ -1,11 +1,53 @@
 """
 Core views for app.
 """
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+from core.health import run_checks
+from core.metrics import registry, request_latency
+
 
 @api_view(['GET'])
 def health_check(request):
     """Returns successful response."""
     return Response({'healthy': True})
+
+
+@api_view(['GET'])
+def readiness(request):
+    """Report whether the instance can serve traffic.
+
+    Fails when a dependency check fails or when the p99 of the request
+    latencies of the last LATENCY_WINDOW_SECONDS exceeds
+    READINESS_MAX_P99_MS.
+    """
+    checks = run_checks()
+    latency = request_latency.summary()
+    healthy = all(check['healthy'] for check in checks.values())
+    max_p99 = settings.READINESS_MAX_P99_MS
+    if max_p99 and latency['p99_ms'] is not None:
+        latency['healthy'] = latency['p99_ms'] <= max_p99
+        healthy = healthy and latency['healthy']
+
+    return Response(
+        {'healthy': healthy, 'checks': checks, 'latency': latency},
+        status=(
+            status.HTTP_200_OK if healthy
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+    )
+
+
+@require_GET
+def metrics(request):
+    """Expose the request metrics in the Prometheus text format."""
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
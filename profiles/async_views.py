@@ -0,0 +1,8 @@
+"""
+Async views for the profile APIs.
+"""
+from core.asynchronous import async_view
+from profiles.views import ProfileViewSet
+
+
+profile_list = async_view(ProfileViewSet.as_view({'get': 'list'}))
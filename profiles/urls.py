@@ -8,7 +8,7 @@ from django.urls import (
 
 from rest_framework.routers import DefaultRouter
 
-from profiles import views
+from profiles import async_views, views
 
 
 router = DefaultRouter()
@@ -17,5 +17,10 @@ router.register('profiles', views.ProfileViewSet)
 app_name = 'profiles'
 
 urlpatterns = [
+    path(
+        'async/profiles/',
+        async_views.profile_list,
+        name='async-profile-list',
+    ),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -2,24 +2,27 @@
 Views for the profile APIs
 """
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
+from core.fieldsets import SparseFieldsetMixin
 from core.models import Profile
+from user.authentication import CachedTokenAuthentication
 from profiles import serializers
 # Create your views here.
 
 
-class ProfileViewSet(viewsets.ModelViewSet):
+class ProfileViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """View for manage profile APIs."""
     serializer_class = serializers.ProfileDetailSerializer
     queryset = Profile.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         """Retrieve profiles for authenticated user."""
-        return self.queryset.filter(user=self.request.user).order_by('-id')
+        return super().get_queryset().filter(
+            user=self.request.user,
+        ).order_by('-id')
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
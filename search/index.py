@@ -0,0 +1,158 @@
+"""
+Full-text index over tracks, books and tasks.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from core.models import (
+    Book,
+    Search_Document,
+    Task,
+    Track,
+)
+
+
+def _track_text(track):
+    """Return the searchable title and body of a track."""
+    return track.track_name, track.description
+
+
+def _book_text(book):
+    """Return the searchable title and body of a book."""
+    return book.title, f'{book.author} {book.isbn}'
+
+
+def _task_text(task):
+    """Return the searchable title and body of a task."""
+    return task.task_name, ''
+
+
+DOCUMENT_TYPES = {
+    Track: (Search_Document.TRACK, _track_text),
+    Book: (Search_Document.BOOK, _book_text),
+    Task: (Search_Document.TASK, _task_text),
+}
+
+
+def document_values(instance):
+    """Return the (kind, object_id, title, body) of instance."""
+    kind, get_text = DOCUMENT_TYPES[type(instance)]
+    title, body = get_text(instance)
+
+    return kind, instance.pk, title, body or ''
+
+
+def build_document(instance):
+    """Return an unsaved search document for instance."""
+    kind, object_id, title, body = document_values(instance)
+
+    return Search_Document(
+        kind=kind, object_id=object_id, title=title, body=body,
+    )
+
+
+def index_instance(instance):
+    """Add or refresh the search document of instance."""
+    document = build_document(instance)
+    Search_Document.objects.update_or_create(
+        kind=document.kind,
+        object_id=document.object_id,
+        defaults={'title': document.title, 'body': document.body},
+    )
+
+
+def remove_instance(instance):
+    """Remove the search document of instance."""
+    kind, _ = DOCUMENT_TYPES[type(instance)]
+    Search_Document.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+def _terms(query):
+    """Split a search query into its words."""
+    return re.findall(r'\w+', query)
+
+
+def _search_sqlite(terms, kind, limit):
+    """Run a ranked FTS5 query."""
+    match = ' '.join(f'"{term}"*' for term in terms)
+    sql = (
+        'SELECT d.kind, d.object_id, d.title, '
+        'bm25(core_search_document_fts, 10.0, 1.0) AS rank '
+        'FROM core_search_document_fts '
+        'JOIN core_search_document d '
+        'ON d.id = core_search_document_fts.rowid '
+        'WHERE core_search_document_fts MATCH %s'
+    )
+    params = [match]
+    if kind:
+        sql += ' AND d.kind = %s'
+        params.append(kind)
+    sql += ' ORDER BY rank LIMIT %s'
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            {'kind': row[0], 'object_id': row[1], 'title': row[2],
+             'rank': -row[3]}
+            for row in cursor.fetchall()
+        ]
+
+
+def _search_postgresql(terms, kind, limit):
+    """Run a ranked tsvector query over the GIN index."""
+    tsquery = ' & '.join(f'{term}:*' for term in terms)
+    sql = (
+        'SELECT kind, object_id, title, '
+        'ts_rank(search_vector, query) AS rank '
+        'FROM core_search_document, '
+        "to_tsquery('simple', %s) query "
+        'WHERE search_vector @@ query'
+    )
+    params = [tsquery]
+    if kind:
+        sql += ' AND kind = %s'
+        params.append(kind)
+    sql += ' ORDER BY rank DESC LIMIT %s'
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            {'kind': row[0], 'object_id': row[1], 'title': row[2],
+             'rank': row[3]}
+            for row in cursor.fetchall()
+        ]
+
+
+def _search_fallback(terms, kind, limit):
+    """Match every term with LIKE on databases without a text index."""
+    queryset = Search_Document.objects.all()
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(body__icontains=term)
+        )
+    if kind:
+        queryset = queryset.filter(kind=kind)
+
+    return [
+        {'kind': document.kind, 'object_id': document.object_id,
+         'title': document.title, 'rank': 0.0}
+        for document in queryset[:limit]
+    ]
+
+
+def search(query, kind=None, limit=20):
+    """Return the documents matching query, best match first."""
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    backend = {
+        'sqlite': _search_sqlite,
+        'postgresql': _search_postgresql,
+    }.get(connection.vendor, _search_fallback)
+
+    return backend(terms, kind, limit)
@@ -0,0 +1,39 @@
+"""
+Django command to rebuild the full-text search index.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import Search_Document
+from search.index import DOCUMENT_TYPES, build_document
+
+
+class Command(BaseCommand):
+    """Django command to rebuild the search index from scratch."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of documents inserted per query.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        batch_size = options['batch_size']
+        total = 0
+        with transaction.atomic():
+            Search_Document.objects.all().delete()
+            for model in DOCUMENT_TYPES:
+                batch = []
+                for instance in model.objects.iterator(chunk_size=batch_size):
+                    batch.append(build_document(instance))
+                    if len(batch) >= batch_size:
+                        Search_Document.objects.bulk_create(batch)
+                        total += len(batch)
+                        batch = []
+                Search_Document.objects.bulk_create(batch)
+                total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} documents.'))
@@ -0,0 +1,28 @@
+"""
+Serializers for search APIs
+"""
+from rest_framework import serializers
+
+from core.models import Search_Document
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Serializer for search query parameters."""
+    q = serializers.CharField(max_length=255)
+    kind = serializers.ChoiceField(
+        choices=Search_Document.KIND_CHOICES,
+        required=False,
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=100,
+        default=20,
+    )
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """Serializer for search results."""
+    kind = serializers.CharField()
+    object_id = serializers.IntegerField()
+    title = serializers.CharField()
+    rank = serializers.FloatField()
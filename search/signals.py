@@ -0,0 +1,25 @@
+"""
+Signal handlers keeping the search index up to date.
+"""
+from django.db.models.signals import post_save, post_delete
+
+from search.index import (
+    DOCUMENT_TYPES,
+    index_instance,
+    remove_instance,
+)
+
+
+def update_search_document(sender, instance, **kwargs):
+    """Index a saved track, book or task."""
+    index_instance(instance)
+
+
+def delete_search_document(sender, instance, **kwargs):
+    """Remove a deleted track, book or task from the index."""
+    remove_instance(instance)
+
+
+for model in DOCUMENT_TYPES:
+    post_save.connect(update_search_document, sender=model)
+    post_delete.connect(delete_search_document, sender=model)
@@ -0,0 +1,155 @@
+"""
+Tests for the search API.
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Book,
+    Profile,
+    Search_Document,
+    Task,
+    Track,
+)
+
+
+SEARCH_URL = reverse('search:search')
+
+
+def create_book(**params):
+    """Create and return a book."""
+    defaults = {
+        'title': 'Sample book',
+        'sub_title': 'Sample sub title',
+        'author': 'Author',
+        'image_url': 'http://example.com/book.png',
+        'isbn': '9780000000000',
+        'publisher': 'Publisher',
+    }
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
+
+
+def create_track():
+    """Create and return a track with its leader, profile and book."""
+    leader = get_user_model().objects.create_user(
+        'leader@example.com', 'testpass123',
+    )
+    profile = Profile.objects.create(
+        user=leader,
+        nickname='leader',
+        subjects='math',
+        image_url='http://example.com/profile.png',
+    )
+
+    return Track.objects.create(
+        leader=leader,
+        profile=profile,
+        book=create_book(title='Workbook'),
+        subject_major='math',
+        subject_minor='algebra',
+        target_test='sat',
+        target_grade='12',
+        track_name='Sample track',
+    )
+
+
+def create_task(**params):
+    """Create and return a task."""
+    defaults = {
+        'order_major': '1',
+        'order_minor': '1',
+        'task_name': 'Sample task',
+        'ranges': '1-10',
+        'learning_time': '30',
+        'guideline': 'Read',
+        'references': 'None',
+    }
+    defaults.update(params)
+    if 'track' not in defaults:
+        defaults['track'] = create_track()
+
+    return Task.objects.create(**defaults)
+
+
+class SearchApiTests(TestCase):
+    """Test the search API."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_search_requires_query(self):
+        """Test a search without a query is rejected."""
+        res = self.client.get(SEARCH_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_books_and_tasks(self):
+        """Test books and tasks are found by their text."""
+        book = create_book(title='Calculus made easy')
+        task = create_task(task_name='Calculus drills')
+        create_book(title='Organic chemistry')
+
+        res = self.client.get(SEARCH_URL, {'q': 'calculus'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {(r['kind'], r['object_id']) for r in res.data},
+            {('book', book.id), ('task', task.id)},
+        )
+
+    def test_search_prefix_and_kind(self):
+        """Test prefixes match and results can be limited to a kind."""
+        book = create_book(title='Calculus made easy')
+        create_task(task_name='Calculus drills')
+
+        res = self.client.get(SEARCH_URL, {'q': 'calc', 'kind': 'book'})
+
+        self.assertEqual([r['object_id'] for r in res.data], [book.id])
+
+    def test_search_ranks_title_above_body(self):
+        """Test a title match ranks above a match on the author."""
+        by_author = create_book(title='Geometry', author='Euler')
+        by_title = create_book(title='Euler and his work', author='Dunham')
+
+        res = self.client.get(SEARCH_URL, {'q': 'euler'})
+
+        self.assertEqual(
+            [r['object_id'] for r in res.data], [by_title.id, by_author.id],
+        )
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test the index is updated when objects change."""
+        book = create_book(title='Algebra')
+
+        book.title = 'Topology'
+        book.save()
+
+        res = self.client.get(SEARCH_URL, {'q': 'algebra'})
+        self.assertEqual(res.data, [])
+        res = self.client.get(SEARCH_URL, {'q': 'topology'})
+        self.assertEqual(len(res.data), 1)
+
+        book.delete()
+
+        res = self.client.get(SEARCH_URL, {'q': 'topology'})
+        self.assertEqual(res.data, [])
+
+    def test_rebuild_search_index(self):
+        """Test the rebuild command indexes existing objects."""
+        create_book(title='Algebra')
+        create_task(task_name='Algebra drills')
+        Search_Document.objects.all().delete()
+
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        res = self.client.get(SEARCH_URL, {'q': 'algebra'})
+        self.assertEqual(len(res.data), 2)
@@ -0,0 +1,29 @@
+"""
+Views for the search APIs
+"""
+from drf_spectacular.utils import extend_schema
+
+from rest_framework import generics
+from rest_framework.response import Response
+
+from search import serializers
+from search.index import search
+
+
+class SearchView(generics.GenericAPIView):
+    """Search tracks, books and tasks."""
+    serializer_class = serializers.SearchResultSerializer
+
+    @extend_schema(parameters=[serializers.SearchQuerySerializer])
+    def get(self, request):
+        """Return the ranked documents matching the query."""
+        params = serializers.SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        results = search(
+            params.validated_data['q'],
+            kind=params.validated_data.get('kind'),
+            limit=params.validated_data['limit'],
+        )
+
+        serializer = self.get_serializer(results, many=True)
+        return Response(serializer.data)
@@ -3,11 +3,14 @@ Serializers for task APIs
 """
 from rest_framework import serializers
 
-from core.models import Task
+from core.models import ID_MAX, Task, Track
 
 
 class TaskSerializer(serializers.ModelSerializer):
     """Serializer for tasks."""
+    track_id = serializers.PrimaryKeyRelatedField(
+        source='track', queryset=Track.objects.all(),
+    )
 
     class Meta:
         model = Task
@@ -23,3 +26,18 @@ class TaskDetailSerializer(TaskSerializer):
 
     class Meta(TaskSerializer.Meta):
         fields = TaskSerializer.Meta.fields + ['references']
+
+
+class TaskImportSerializer(serializers.ModelSerializer):
+    """Serializer for a task row of a bulk import.
+
+    Tracks are checked for a whole batch at once by the importer.
+    """
+    track_id = serializers.IntegerField(min_value=1, max_value=ID_MAX)
+
+    class Meta:
+        model = Task
+        fields = [
+            'track_id', 'order_major', 'order_minor', 'task_name', 'ranges',
+            'learning_time', 'guideline', 'references',
+        ]
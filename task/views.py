@@ -2,24 +2,30 @@
 Views for the profile APIs
 """
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 
+from core.fieldsets import SparseFieldsetMixin
 from core.models import Task
+from core.pagination import TaskCursorPagination
+from user.authentication import CachedTokenAuthentication
 from task import serializers
 # Create your views here.
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """View for manage task APIs."""
     serializer_class = serializers.TaskDetailSerializer
     queryset = Task.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskCursorPagination
 
     def get_queryset(self):
-        """Retrieve profiles for authenticated user."""
-        return self.queryset.filter(user=self.request.user).order_by('-id')
+        """Retrieve tasks of the tracks led by the authenticated user."""
+        return super().get_queryset().filter(
+            track__leader=self.request.user,
+        ).order_by('-id')
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
@@ -29,5 +35,8 @@ class TaskViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
     def perform_create(self, serializer):
-        """Create a new task."""
-        serializer.save(user=self.request.user)
\ No newline at end of file
+        """Create a new task in a track led by the authenticated user."""
+        track = serializer.validated_data['track']
+        if track.leader_id != self.request.user.id:
+            raise PermissionDenied('Track is not led by you.')
+        serializer.save()
\ No newline at end of file
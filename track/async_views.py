@@ -0,0 +1,9 @@
+"""
+Async views for the track catalog.
+"""
+from core.asynchronous import async_view
+from track.views import TrackAllViewSet
+
+
+track_list = async_view(TrackAllViewSet.as_view({'get': 'list'}))
+track_detail = async_view(TrackAllViewSet.as_view({'get': 'retrieve'}))
@@ -0,0 +1,200 @@
+"""
+Background processing of track images.
+"""
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.cache import invalidate_tracks
+from core.models import Track
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.TRACK_IMAGE_WORKERS,
+    thread_name_prefix='track-image',
+)
+
+
+# EXIF tag holding the rotation the camera recorded.
+ORIENTATION_TAG = 0x0112
+
+# Formats accepted as originals, the ones strip_metadata can clean.
+ORIGINAL_FORMATS = ('JPEG', 'PNG', 'WEBP')
+
+
+def get_formats():
+    """Return the formats variants are encoded to."""
+    Image.init()
+    return [fmt for fmt in ('webp', 'avif') if fmt.upper() in Image.SAVE]
+
+
+def variant_name(name, label, fmt):
+    """Return the storage name of a variant of image name."""
+    root = os.path.splitext(name)[0]
+
+    return f'{root}_{label}.{fmt}'
+
+
+def _encode(image, fmt):
+    """Encode image to fmt without any EXIF metadata."""
+    buffer = BytesIO()
+    image.save(
+        buffer, format=fmt.upper(), quality=settings.TRACK_IMAGE_QUALITY,
+    )
+
+    return ContentFile(buffer.getvalue())
+
+
+def strip_metadata(upload):
+    """Return upload re-saved without its EXIF, XMP and comment metadata.
+
+    The stored original is served as is, so GPS positions and camera
+    details must not reach it. The EXIF orientation is applied to the
+    pixels first. JPEGs that need no rotation keep their quantization
+    tables, so they are not degraded by the round trip. ICC profiles are
+    kept since they only describe colors.
+    """
+    with Image.open(upload) as image:
+        fmt = image.format
+        if fmt not in ORIGINAL_FORMATS:
+            raise ValueError(f'Cannot strip the metadata of {fmt} images.')
+        params = {'icc_profile': image.info.get('icc_profile')}
+        image.info.pop('comment', None)
+        if image.getexif().get(ORIENTATION_TAG, 1) != 1:
+            image = ImageOps.exif_transpose(image)
+            if fmt != 'PNG':
+                params['quality'] = settings.TRACK_IMAGE_ORIGINAL_QUALITY
+        elif fmt == 'JPEG':
+            params['quality'] = 'keep'
+        elif fmt == 'WEBP':
+            params['lossless'] = True
+        buffer = BytesIO()
+        image.save(buffer, format=fmt, **params)
+
+    return ContentFile(buffer.getvalue(), name=upload.name)
+
+
+def _strip_stored_metadata(name):
+    """Store a copy of image name without metadata and return its name.
+
+    Names are content addressed, so the copy gets a name of its own and
+    identical uploads are stripped to the same file.
+    """
+    with default_storage.open(name) as source:
+        stripped = strip_metadata(source)
+
+    return default_storage.save(name, stripped)
+
+
+def _create_variants(name):
+    """Encode the variants of image name and return their names."""
+    with default_storage.open(name) as source, Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ('RGBA', 'LA', 'P')
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        variants = {}
+        for label, size in settings.TRACK_IMAGE_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail((size, size))
+            for fmt in get_formats():
+                variants.setdefault(label, {})[fmt] = default_storage.save(
+                    variant_name(name, label, fmt), _encode(resized, fmt),
+                )
+
+    return variants
+
+
+def process_track_image(name):
+    """Strip an uploaded image and create its resized variants.
+
+    The upload request only streams the original to storage. Here the
+    original is replaced by a copy without metadata and the tracks are
+    pointed at it; the unstripped file is released like a replaced
+    image. Tracks sharing the same stored image share its variants, so
+    an image that was already processed for another track is not
+    encoded again.
+    """
+    if not Track.objects.filter(image=name).exists():
+        # Already processed for a track that uploaded the same file.
+        return None
+    stripped = _strip_stored_metadata(name)
+
+    stored = Track.objects.filter(image=stripped).values_list(
+        'image_variants', flat=True,
+    )
+    variants = next((v for v in stored if v), None)
+    if variants is None:
+        variants = _create_variants(stripped)
+
+    tracks = Track.objects.filter(image__in={name, stripped})
+    track_ids = list(tracks.values_list('pk', flat=True))
+    tracks.update(image=stripped, image_variants=variants)
+    invalidate_tracks(track_ids)
+    if stripped != name:
+        release_track_image(name)
+
+    return variants
+
+
+def image_reference_counts():
+    """Return how many tracks reference each stored image and variant."""
+    counts = Counter()
+    rows = Track.objects.exclude(image='').exclude(image__isnull=True)
+    for image, variants in rows.values_list(
+        'image', 'image_variants',
+    ).iterator():
+        counts[image] += 1
+        for names in variants.values():
+            for variant in set(names.values()):
+                counts[variant] += 1
+
+    return counts
+
+
+def is_past_grace_period(name):
+    """Return True if stored file name is older than the GC grace period."""
+    age = timezone.now() - default_storage.get_modified_time(name)
+
+    return age.total_seconds() > settings.MEDIA_GC_GRACE_SECONDS
+
+
+def release_track_image(name):
+    """Delete a stored image once no track references it any more.
+
+    Files touched within the grace period are left to the gc_media
+    command, since a new upload may be about to reference them.
+    """
+    if not name or Track.objects.filter(image=name).exists():
+        return
+    if default_storage.exists(name) and is_past_grace_period(name):
+        default_storage.delete(name)
+
+
+def _run_in_worker(name):
+    """Process an image on a worker thread and release its connection."""
+    try:
+        process_track_image(name)
+    finally:
+        connection.close()
+
+
+def schedule_track_image(name):
+    """Process an image once the current transaction commits.
+
+    The work runs on a bounded thread pool unless TRACK_IMAGE_ASYNC is
+    off, in which case it runs inline.
+    """
+    if settings.TRACK_IMAGE_ASYNC:
+        transaction.on_commit(lambda: _executor.submit(_run_in_worker, name))
+    else:
+        transaction.on_commit(lambda: process_track_image(name))
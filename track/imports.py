@@ -0,0 +1,236 @@
+"""
+Bulk import of books and tasks from CSV and JSON files.
+"""
+import csv
+import io
+import itertools
+import json
+import re
+
+from django.conf import settings
+from django.db import transaction
+
+from book.serializers import BookImportSerializer, normalize_isbn
+from core.bulk import bulk_insert
+from core.cache import CATALOG_NAMESPACE, bump_version
+from core.models import Book, Search_Document, Task, Track
+from search.index import build_document
+from task.serializers import TaskImportSerializer
+
+
+FILE_FORMATS = ['csv', 'json', 'ndjson']
+JSON_SEPARATORS = re.compile(r'[\s,\[\]]*')
+
+
+def iter_csv(stream):
+    """Yield the rows of a CSV file with a header, without empty cells."""
+    for row in csv.DictReader(stream):
+        yield {
+            name: value for name, value in row.items()
+            if name is not None and value not in ('', None)
+        }
+
+
+def iter_json(stream, chunk_size=64 * 1024):
+    """Yield the values of a JSON array or of JSON lines from stream.
+
+    The stream is decoded one chunk at a time, so large files are never
+    loaded whole.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+    while True:
+        pos = JSON_SEPARATORS.match(buffer, pos).end()
+        if pos < len(buffer):
+            try:
+                value, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield value
+                continue
+        elif eof:
+            return
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer, pos = buffer[pos:] + chunk, 0
+
+
+def read_rows(file, file_format):
+    """Yield the rows of a binary file in file_format."""
+    stream = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    if file_format == 'csv':
+        return iter_csv(stream)
+
+    return iter_json(stream)
+
+
+def guess_format(name):
+    """Return the file format matching the extension of name, if any."""
+    extension = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    if extension == 'jsonl':
+        return 'ndjson'
+
+    return extension if extension in FILE_FORMATS else None
+
+
+class Importer:
+    """Validate rows in batches and insert the valid ones.
+
+    Each batch is inserted in its own transaction, so an import that
+    fails half way keeps the batches already done. Bulk inserts send no
+    signals, so the search index and the catalog cache are updated here.
+    """
+    model = None
+    serializer_class = None
+
+    def __init__(self, user=None, batch_size=None, max_errors=None):
+        self.user = user
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.max_errors = max_errors or settings.IMPORT_MAX_ERRORS
+        self.report = {
+            'rows': 0, 'created': 0, 'skipped': 0, 'failed': 0, 'errors': [],
+        }
+
+    def add_error(self, row, errors):
+        """Record the errors of a row, keeping the first max_errors."""
+        self.report['failed'] += 1
+        if len(self.report['errors']) < self.max_errors:
+            self.report['errors'].append({'row': row, 'errors': errors})
+
+    def validate(self, row, data):
+        """Return the validated data of a row or None if it is invalid."""
+        serializer = self.serializer_class(data=data)
+        if not serializer.is_valid():
+            self.add_error(row, serializer.errors)
+            return None
+
+        return serializer.validated_data
+
+    def filter_batch(self, batch):
+        """Return the (row, data) pairs of batch that should be created."""
+        return batch
+
+    def create(self, batch):
+        """Insert the validated rows of a batch and return the objects."""
+        objs = [self.model(**data) for _, data in batch]
+        bulk_insert(self.model, objs, self.batch_size)
+
+        return objs
+
+    def numbered(self, rows):
+        """Yield (row, data) pairs, ending with an error if parsing fails."""
+        row = 0
+        try:
+            for row, data in enumerate(rows, start=1):
+                yield row, data
+        except (csv.Error, ValueError) as exc:
+            self.add_error(row + 1, {
+                'non_field_errors': [f'Cannot parse the file: {exc}'],
+            })
+
+    def run(self, rows):
+        """Import rows and return the report.
+
+        Parsing stops at the first malformed row; the rows before it are
+        still imported.
+        """
+        rows = self.numbered(rows)
+        while True:
+            chunk = list(itertools.islice(rows, self.batch_size))
+            if not chunk:
+                break
+            self.report['rows'] += len(chunk)
+            batch = []
+            for row, data in chunk:
+                data = self.validate(row, data)
+                if data is not None:
+                    batch.append((row, data))
+            batch = self.filter_batch(batch)
+            if not batch:
+                continue
+            with transaction.atomic():
+                objs = self.create(batch)
+                bulk_insert(
+                    Search_Document,
+                    [build_document(obj) for obj in objs],
+                    self.batch_size,
+                )
+            self.report['created'] += len(objs)
+
+        if self.report['created']:
+            bump_version(CATALOG_NAMESPACE)
+
+        return self.report
+
+
+class BookImporter(Importer):
+    """Import books, skipping ISBNs already stored or seen in the file.
+
+    Books created through the API keep their ISBNs as typed, with or
+    without separators, so the stored ISBNs are normalized once before
+    the first batch instead of being looked up as they are.
+    """
+    model = Book
+    serializer_class = BookImportSerializer
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.seen = None
+
+    def filter_batch(self, batch):
+        if self.seen is None:
+            self.seen = {
+                normalize_isbn(isbn)
+                for isbn in Book.objects.values_list(
+                    'isbn', flat=True,
+                ).iterator(chunk_size=self.batch_size)
+            }
+        kept = []
+        for row, data in batch:
+            if data['isbn'] in self.seen:
+                self.report['skipped'] += 1
+                continue
+            self.seen.add(data['isbn'])
+            kept.append((row, data))
+
+        return kept
+
+
+class TaskImporter(Importer):
+    """Import tasks into tracks led by the importing user."""
+    model = Task
+    serializer_class = TaskImportSerializer
+
+    def filter_batch(self, batch):
+        track_ids = {data['track_id'] for _, data in batch}
+        tracks = Track.objects.filter(pk__in=track_ids)
+        if self.user is not None and not self.user.is_staff:
+            tracks = tracks.filter(leader=self.user)
+        allowed = set(tracks.values_list('pk', flat=True))
+
+        kept = []
+        for row, data in batch:
+            if data['track_id'] in allowed:
+                kept.append((row, data))
+            else:
+                self.add_error(row, {'track_id': [
+                    'Track does not exist or is not led by you.',
+                ]})
+
+        return kept
+
+    def create(self, batch):
+        objs = [Task(**data) for _, data in batch]
+        for obj in objs:
+            obj.set_order_keys()
+        bulk_insert(Task, objs, self.batch_size)
+
+        return objs
+
+
+IMPORTERS = {
+    'books': BookImporter,
+    'tasks': TaskImporter,
+}
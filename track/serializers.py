@@ -1,6 +1,10 @@
 """
 Serializers for recipe APIs
 """
+from django.core.files.storage import default_storage
+
+from drf_spectacular.utils import extend_schema_field
+
 from rest_framework import serializers
 
 from core.models import (
@@ -13,6 +17,8 @@ from core.models import (
 from book import serializers as bookserializers
 from task import serializers as taskserializers
 from profiles import serializers as profileserializers
+from track.images import ORIGINAL_FORMATS
+from track.imports import FILE_FORMATS, guess_format
 
 '''class BookSerializer(serializers.ModelSerializer):
     """Serializer for tag_subject_majors."""
@@ -50,20 +56,41 @@ class Tag_Target_GradeSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']'''
 
 
+class ImageVariantsField(serializers.ReadOnlyField):
+    """Field for the URLs of the processed track image variants."""
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        urls = {}
+        for label, names in value.items():
+            urls[label] = {}
+            for fmt, name in names.items():
+                url = default_storage.url(name)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                urls[label][fmt] = url
+
+        return urls
+
+
 class TrackSerializer(serializers.ModelSerializer):
     """Serializer for tracks."""
     profile = profileserializers.ProfileDetailSerializer(read_only=True)
     book = bookserializers.BookDetailSerializer(required=False)
-    task = taskserializers.TaskDetailSerializer(required=False)
+    task = taskserializers.TaskDetailSerializer(
+        source='tasks', many=True, required=False,
+    )
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Track
         fields = [
             'id', 'profile', 'subject_major', 'subject_minor', 'target_test',
             'target_grade', 'track_name', 'book', 'link',
-            'followers_num', 'rating_avg', 'task', 'image', 'published_date',
+            'followers_num', 'rating_avg', 'task', 'image', 'image_variants',
+            'published_date',
         ]
-        read_only_fields = ['id']
+        read_only_fields = ['id', 'followers_num', 'rating_avg']
 
 
 class TrackDetailSerializer(TrackSerializer):
@@ -122,11 +149,105 @@ class TrackDetailSerializer(TrackSerializer):
         return instance
 
 
-class TrackmageSerializer(serializers.ModelSerializer):
+class TrackBundleTaskSerializer(taskserializers.TaskDetailSerializer):
+    """Serializer for a task of a track bundle with the caller's state."""
+    is_done = serializers.BooleanField(read_only=True)
+
+    class Meta(taskserializers.TaskDetailSerializer.Meta):
+        fields = taskserializers.TaskDetailSerializer.Meta.fields + [
+            'is_done',
+        ]
+
+
+class TrackBundleProgressSerializer(serializers.Serializer):
+    """Serializer for the caller's completion of a track."""
+    completed = serializers.IntegerField()
+    total = serializers.IntegerField()
+    percent = serializers.FloatField()
+
+
+class TrackBundleSerializer(serializers.ModelSerializer):
+    """Serializer for a track with everything its screen shows."""
+    profile = profileserializers.ProfileDetailSerializer(read_only=True)
+    book = bookserializers.BookDetailSerializer(read_only=True)
+    tasks = TrackBundleTaskSerializer(many=True, read_only=True)
+    image_variants = ImageVariantsField()
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Track
+        fields = [
+            'id', 'profile', 'subject_major', 'subject_minor', 'target_test',
+            'target_grade', 'track_name', 'description', 'book', 'link',
+            'followers_num', 'rating_avg', 'image', 'image_variants',
+            'published_date', 'tasks', 'progress',
+        ]
+        read_only_fields = fields
+
+    @extend_schema_field(TrackBundleProgressSerializer)
+    def get_progress(self, track):
+        """Return the completion of the annotated tasks of track."""
+        tasks = track.tasks.all()
+        completed = sum(1 for task in tasks if task.is_done)
+        total = len(tasks)
+
+        return {
+            'completed': completed,
+            'total': total,
+            'percent': round(completed * 100 / total, 2) if total else 0.0,
+        }
+
+
+class TrackImageSerializer(serializers.ModelSerializer):
     """Serializer for uploading images to tracks."""
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Track
-        fields = ['id', 'image']
+        fields = ['id', 'image', 'image_variants']
         read_only_fields = ['id']
         extra_kwargs = {'image': {'required': 'True'}}
+
+    def validate_image(self, value):
+        """Only accept formats whose metadata can be stripped."""
+        if value.image.format not in ORIGINAL_FORMATS:
+            raise serializers.ValidationError(
+                'Upload a JPEG, PNG or WEBP image.',
+            )
+
+        return value
+
+
+class TrackImportSerializer(serializers.Serializer):
+    """Serializer for uploading a file of books or tasks to import."""
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(
+        choices=FILE_FORMATS, required=False,
+        help_text='Defaults to the extension of the file.',
+    )
+
+    def validate(self, attrs):
+        if 'file_format' not in attrs:
+            file_format = guess_format(attrs['file'].name)
+            if file_format is None:
+                raise serializers.ValidationError(
+                    {'file_format': 'Cannot tell the format of the file.'},
+                )
+            attrs['file_format'] = file_format
+
+        return attrs
+
+
+class TrackImportErrorSerializer(serializers.Serializer):
+    """Serializer for the errors of one imported row."""
+    row = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
+class TrackImportReportSerializer(serializers.Serializer):
+    """Serializer for the outcome of an import."""
+    rows = serializers.IntegerField()
+    created = serializers.IntegerField()
+    skipped = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    errors = TrackImportErrorSerializer(many=True)
@@ -0,0 +1,18 @@
+"""
+Signal handlers for track media.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete
+
+from core.models import Track
+from track.images import release_track_image
+
+
+def release_deleted_track_image(sender, instance, **kwargs):
+    """Release the image of a deleted track."""
+    name = instance.image.name
+    if name:
+        transaction.on_commit(lambda: release_track_image(name))
+
+
+post_delete.connect(release_deleted_track_image, sender=Track)
@@ -0,0 +1,724 @@
+"""
+Tests for the track APIs.
+"""
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.cache import CATALOG_NAMESPACE, bump_version, bump_versions
+from core.models import (
+    Book,
+    Profile,
+    Task,
+    Track,
+    Track_Follow,
+    User_Data,
+)
+from core.prefetch import get_eager_loading
+from core.tests.utils import QueryCountMixin
+from track.serializers import TrackDetailSerializer
+
+
+TRACKS_URL = reverse('track:track-list')
+TASKS_URL = reverse('track:task-list')
+BOOKS_URL = reverse('track:book-list')
+TRACK_ALLS_URL = reverse('track:track-all-list')
+ASYNC_TRACK_ALLS_URL = reverse('track:async-track-all-list')
+
+
+def detail_url(track_id):
+    """Create and return a track catalog detail URL."""
+    return reverse('track:track-all-detail', args=[track_id])
+
+
+def async_detail_url(track_id):
+    """Create and return an async track catalog detail URL."""
+    return reverse('track:async-track-all-detail', args=[track_id])
+
+
+def curriculum_url(track_id):
+    """Create and return a track curriculum URL."""
+    return reverse('track:track-all-curriculum', args=[track_id])
+
+
+def bundle_url(track_id):
+    """Create and return a track bundle URL."""
+    return reverse('track:track-all-bundle', args=[track_id])
+
+
+def follow_url(track_id):
+    """Create and return a track follow URL."""
+    return reverse('track:track-all-follow', args=[track_id])
+
+
+def committed(test, func):
+    """Return func wrapped to run its on_commit callbacks."""
+    def run():
+        with test.captureOnCommitCallbacks(execute=True):
+            return func()
+
+    return run
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_track(user, tasks=2, **params):
+    """Create and return a track with its profile, book and tasks."""
+    profile, _ = Profile.objects.get_or_create(
+        user=user,
+        defaults={
+            'nickname': 'leader',
+            'role': Profile.LEADER,
+            'subjects': 'math',
+            'image_url': 'http://example.com/profile.png',
+        },
+    )
+    book = Book.objects.create(
+        title='Sample book',
+        sub_title='Sample sub title',
+        author='Author',
+        image_url='http://example.com/book.png',
+        isbn='9780000000000',
+        publisher='Publisher',
+    )
+    defaults = {
+        'subject_major': 'math',
+        'subject_minor': 'algebra',
+        'target_test': 'sat',
+        'target_grade': '12',
+        'track_name': 'Sample track',
+        'followers_num': 0,
+        'rating_avg': Decimal('0.00'),
+    }
+    defaults.update(params)
+    track = Track.objects.create(
+        leader=user, profile=profile, book=book, **defaults,
+    )
+    for index in range(tasks):
+        Task.objects.create(
+            track_id=track.id,
+            order_major='1',
+            order_minor=str(index + 1),
+            task_name=f'Task {index + 1}',
+            ranges='1-10',
+            learning_time='30',
+            guideline='Read',
+            references='None',
+        )
+
+    return track
+
+
+class EagerLoadingTests(TestCase):
+    """Test the eager loading plan for the track serializers."""
+
+    def test_track_serializer_plan(self):
+        """Test nested track relations are selected or prefetched."""
+        select_related, prefetch_related = get_eager_loading(
+            TrackDetailSerializer(),
+        )
+
+        self.assertEqual(sorted(select_related), ['book', 'profile'])
+        self.assertEqual(prefetch_related, ['tasks'])
+
+
+class PublicTrackApiTests(QueryCountMixin, TestCase):
+    """Test the public track catalog."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user()
+
+    def test_list_tracks(self):
+        """Test listing tracks includes nested relations."""
+        create_track(self.user)
+
+        res = self.client.get(TRACK_ALLS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(len(res.data['results'][0]['task']), 2)
+        self.assertEqual(
+            res.data['results'][0]['book']['title'], 'Sample book',
+        )
+
+    def test_list_tracks_paginated(self):
+        """Test tracks are paginated with a cursor."""
+        tracks = [create_track(self.user, tasks=0) for _ in range(3)]
+
+        res = self.client.get(TRACK_ALLS_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [track['id'] for track in res.data['results']],
+            [tracks[2].id, tracks[1].id],
+        )
+        self.assertIsNotNone(res.data['next'])
+
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(
+            [track['id'] for track in res.data['results']],
+            [tracks[0].id],
+        )
+        self.assertIsNone(res.data['next'])
+
+    def test_list_tracks_constant_queries(self):
+        """Test listing tracks does not run a query per track."""
+        create_track(self.user)
+
+        self.assertConstantQueries(
+            lambda: self.client.get(TRACK_ALLS_URL),
+            committed(self, lambda: create_track(self.user, tasks=3)),
+        )
+
+    def test_list_tracks_cached(self):
+        """Test a repeated catalog request is served from the cache."""
+        create_track(self.user)
+        self.client.get(TRACK_ALLS_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(TRACK_ALLS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_cache_timeout_read_per_request(self):
+        """Test the response cache timeout follows the settings."""
+        create_track(self.user)
+        self.client.get(TRACK_ALLS_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(TRACK_ALLS_URL)
+
+        self.assertGreater(len(queries), 0)
+
+    def test_cache_invalidated_on_change(self):
+        """Test saving a track invalidates the cached catalog."""
+        track = create_track(self.user)
+        self.client.get(detail_url(track.id))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            track.track_name = 'Renamed track'
+            track.save()
+            res = self.client.get(detail_url(track.id))
+            self.assertEqual(res.data['track_name'], 'Sample track')
+        for callback in callbacks:
+            callback()
+        res = self.client.get(detail_url(track.id))
+
+        self.assertEqual(res.data['track_name'], 'Renamed track')
+
+    def test_cache_invalidated_per_track(self):
+        """Test following a track keeps other tracks cached."""
+        track, other = create_track(self.user), create_track(self.user)
+        self.client.get(detail_url(track.id))
+        self.client.get(detail_url(other.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Track_Follow.objects.create(user=self.user, track=track)
+
+        with self.assertNumQueries(0):
+            self.client.get(detail_url(other.id))
+        res = self.client.get(detail_url(track.id))
+        self.assertEqual(res.data['followers_num'], 1)
+
+    def test_follow_keeps_lists_cached(self):
+        """Test a follow only drops the responses of its track."""
+        track = create_track(self.user)
+        self.client.get(TRACK_ALLS_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Track_Follow.objects.create(user=self.user, track=track)
+
+        with self.assertNumQueries(0):
+            self.client.get(TRACK_ALLS_URL)
+        res = self.client.get(detail_url(track.id))
+        self.assertEqual(res.data['followers_num'], 1)
+
+    def test_cache_invalidated_on_task_delete(self):
+        """Test deleting a task drops the cached responses of its track."""
+        track = create_track(self.user, tasks=2)
+        self.client.get(detail_url(track.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.filter(track=track).first().delete()
+
+        res = self.client.get(detail_url(track.id))
+        self.assertEqual(len(res.data['task']), 1)
+
+    @override_settings(CACHE_VERSION_TIMEOUT=600)
+    def test_versions_expire(self):
+        """Test versions are stored with CACHE_VERSION_TIMEOUT."""
+        with patch('core.cache.cache') as mock_cache:
+            bump_version(CATALOG_NAMESPACE)
+            bump_versions([CATALOG_NAMESPACE])
+
+        self.assertEqual(mock_cache.set.call_args.args[2], 600)
+        self.assertEqual(mock_cache.set_many.call_args.args[1], 600)
+
+    def test_etag_list_matched_exactly(self):
+        """Test If-None-Match is parsed as a list of entity tags."""
+        track = create_track(self.user)
+        etag = self.client.get(detail_url(track.id))['ETag']
+
+        for header, code in [
+            (f'"other", W/{etag}', status.HTTP_304_NOT_MODIFIED),
+            ('*', status.HTTP_304_NOT_MODIFIED),
+            (f'"x{etag[1:]}', status.HTTP_200_OK),
+            (etag[:-2] + '"', status.HTTP_200_OK),
+        ]:
+            res = self.client.get(
+                detail_url(track.id), HTTP_IF_NONE_MATCH=header,
+            )
+            self.assertEqual(res.status_code, code, header)
+
+    def test_etag_not_modified(self):
+        """Test a matching If-None-Match returns 304."""
+        track = create_track(self.user)
+        res = self.client.get(detail_url(track.id))
+        etag = res['ETag']
+
+        res = self.client.get(detail_url(track.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        task = Task.objects.filter(track_id=track.id).first()
+        task.task_name = 'Renamed task'
+        with self.captureOnCommitCallbacks(execute=True):
+            task.save()
+        res = self.client.get(detail_url(track.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_list_tracks_by_popularity(self):
+        """Test tracks can be sorted by followers_num."""
+        popular = create_track(self.user, tasks=0, followers_num=5)
+        create_track(self.user, tasks=0, followers_num=1)
+
+        res = self.client.get(TRACK_ALLS_URL, {'ordering': '-followers_num'})
+
+        self.assertEqual(res.data['results'][0]['id'], popular.id)
+
+    def test_popularity_pages_break_ties_by_id(self):
+        """Test tied tracks are paged by id without an OFFSET."""
+        tracks = [
+            create_track(self.user, tasks=0, followers_num=1)
+            for _ in range(5)
+        ]
+        params = {'ordering': '-followers_num', 'page_size': 2}
+
+        seen = []
+        res = self.client.get(TRACK_ALLS_URL, params)
+        seen += [track['id'] for track in res.data['results']]
+        while res.data['next']:
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.get(res.data['next'])
+            seen += [track['id'] for track in res.data['results']]
+            self.assertFalse(any(
+                'OFFSET' in query['sql'] for query in queries.captured_queries
+            ))
+
+        self.assertEqual(
+            seen, sorted((track.id for track in tracks), reverse=True),
+        )
+
+    def test_follow_auth_required(self):
+        """Test auth is required to follow a track."""
+        track = create_track(self.user, tasks=0)
+
+        res = self.client.post(follow_url(track.id))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_curriculum_natural_order(self):
+        """Test curriculum tasks are sorted numerically, not as text."""
+        track = create_track(self.user, tasks=0)
+        for major, minor in [('10', '1'), ('2', '10'), ('2', '9'), ('1', '1')]:
+            Task.objects.create(
+                track_id=track.id,
+                order_major=major,
+                order_minor=minor,
+                task_name=f'Task {major}-{minor}',
+                ranges='1-10',
+                learning_time='30',
+                guideline='Read',
+                references='None',
+            )
+
+        res = self.client.get(curriculum_url(track.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(t['order_major'], t['order_minor']) for t in res.data],
+            [('1', '1'), ('2', '9'), ('2', '10'), ('10', '1')],
+        )
+
+    def test_curriculum_missing_track(self):
+        """Test the curriculum of a missing track returns 404."""
+        res = self.client.get(curriculum_url(0))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_curriculum_invalid_track_id(self):
+        """Test a non integer track id returns 404."""
+        res = self.client.get('/api/track/track_alls/abc/curriculum/')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SparseFieldsetTests(QueryCountMixin, TestCase):
+    """Test trimming track responses with fields and expand."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user()
+        self.track = create_track(self.user)
+
+    def test_fields(self):
+        """Test only the requested fields are returned."""
+        res = self.client.get(
+            TRACK_ALLS_URL, {'fields': 'id,track_name,image'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(res.data['results'][0]), {'id', 'track_name', 'image'},
+        )
+
+    def test_nested_fields(self):
+        """Test dotted fields trim nested serializers."""
+        res = self.client.get(
+            detail_url(self.track.id), {'fields': 'id,book.title'},
+        )
+
+        self.assertEqual(res.data, {
+            'id': self.track.id,
+            'book': {'title': 'Sample book'},
+        })
+
+    def test_expand(self):
+        """Test relations not expanded are returned as IDs."""
+        res = self.client.get(detail_url(self.track.id), {'expand': 'profile'})
+
+        self.assertEqual(res.data['book'], self.track.book_id)
+        self.assertCountEqual(
+            res.data['task'],
+            list(self.track.tasks.values_list('id', flat=True)),
+        )
+        self.assertEqual(res.data['profile']['nickname'], 'leader')
+
+    def test_fields_narrow_sql(self):
+        """Test sparse responses load fewer columns and relations."""
+        with CaptureQueriesContext(connection) as full:
+            self.client.get(TRACK_ALLS_URL)
+        cache.clear()
+        with CaptureQueriesContext(connection) as sparse:
+            self.client.get(TRACK_ALLS_URL, {'fields': 'id,track_name'})
+
+        self.assertLess(len(sparse), len(full))
+        select = sparse.captured_queries[-1]['sql']
+        self.assertIn('track_name', select)
+        self.assertNotIn('description', select)
+        self.assertNotIn('core_book', select)
+
+    def test_fields_constant_queries(self):
+        """Test narrowed querysets still load relations up front."""
+        self.assertConstantQueries(
+            lambda: self.client.get(
+                TRACK_ALLS_URL, {'fields': 'id,book.title,task.task_name'},
+            ),
+            committed(self, lambda: create_track(self.user, tasks=3)),
+        )
+
+
+class AsyncTrackApiTests(TransactionTestCase):
+    """Test the async track catalog views.
+
+    The async views query from worker threads, on connections that only
+    see committed rows.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.track = create_track(self.user)
+        self.popular = create_track(self.user, tasks=0, followers_num=5)
+
+    async def test_list_matches_sync_view(self):
+        """Test the async catalog returns the sync catalog payload."""
+        res = await self.async_client.get(ASYNC_TRACK_ALLS_URL)
+        sync_res = await self.async_client.get(TRACK_ALLS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), sync_res.json())
+
+    async def test_list_ordering(self):
+        """Test the async catalog honours the ordering parameter."""
+        res = await self.async_client.get(
+            f'{ASYNC_TRACK_ALLS_URL}?ordering=followers_num',
+        )
+
+        followers = [track['followers_num'] for track in res.json()['results']]
+        self.assertEqual(followers, [0, 5])
+
+    async def test_retrieve(self):
+        """Test retrieving a track through the async view."""
+        res = await self.async_client.get(async_detail_url(self.track.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['id'], self.track.id)
+        self.assertEqual(len(res.json()['task']), 2)
+
+    async def test_retrieve_missing_track(self):
+        """Test retrieving a missing track returns 404."""
+        res = await self.async_client.get(async_detail_url(0))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_invalid_cursor(self):
+        """Test an invalid cursor returns 404 like the sync catalog."""
+        res = await self.async_client.get(
+            f'{ASYNC_TRACK_ALLS_URL}?cursor=zzz',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res.json()['detail'], 'Invalid cursor')
+
+    async def test_sparse_fieldset(self):
+        """Test the async catalog honours the fields parameter."""
+        res = await self.async_client.get(f'{ASYNC_TRACK_ALLS_URL}?fields=id')
+
+        self.assertEqual(
+            res.json()['results'],
+            [{'id': self.popular.id}, {'id': self.track.id}],
+        )
+
+    async def test_write_not_allowed(self):
+        """Test the async catalog is read only."""
+        res = await self.async_client.post(ASYNC_TRACK_ALLS_URL, {})
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class PrivateTrackApiTests(QueryCountMixin, TestCase):
+    """Test authenticated track API requests."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+
+    def test_list_own_tracks(self):
+        """Test listing tracks is limited to the authenticated leader."""
+        create_track(self.user)
+        create_track(create_user(email='other@example.com'))
+
+        res = self.client.get(TRACKS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_follow_and_unfollow_track(self):
+        """Test following a track updates its follower count."""
+        track = create_track(create_user(email='leader@example.com'))
+
+        res = self.client.post(follow_url(track.id))
+        self.client.post(follow_url(track.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['followers_num'], 1)
+        self.assertTrue(
+            Track_Follow.objects.filter(user=self.user, track=track).exists()
+        )
+
+        res = self.client.delete(follow_url(track.id))
+
+        self.assertEqual(res.data['followers_num'], 0)
+
+    def test_list_own_tracks_constant_queries(self):
+        """Test listing own tracks does not run a query per track."""
+        create_track(self.user)
+
+        self.assertConstantQueries(
+            lambda: self.client.get(TRACKS_URL),
+            lambda: create_track(self.user),
+        )
+
+    def test_list_own_tasks(self):
+        """Test listing tasks is limited to the tracks of the user."""
+        track = create_track(self.user, tasks=3)
+        create_track(create_user(email='other@example.com'))
+
+        res = self.client.get(TASKS_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+        res = self.client.get(res.data['next'])
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertIsNone(res.data['next'])
+        self.assertEqual(res.data['results'][0]['track_id'], track.id)
+
+    def test_list_own_books(self):
+        """Test listing books is limited to the tracks of the user."""
+        track = create_track(self.user)
+        create_track(create_user(email='other@example.com'))
+
+        res = self.client.get(BOOKS_URL, {'fields': 'id'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [{'id': track.book_id}])
+
+
+class TrackBundleApiTests(QueryCountMixin, TestCase):
+    """Test the track bundle API."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        self.track = create_track(create_user(email='leader@example.com'))
+
+    def complete(self, task, user=None):
+        """Record task as done by user."""
+        return User_Data.objects.create(
+            user=user or self.user,
+            track=self.track,
+            order_major=task.order_major,
+            order_minor=task.order_minor,
+            is_done=True,
+        )
+
+    def test_auth_required(self):
+        """Test the bundle requires authentication."""
+        res = APIClient().get(bundle_url(self.track.id))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bundle(self):
+        """Test the bundle embeds book, leader, tasks and completion."""
+        first = self.track.tasks.order_by('order_minor_key').first()
+        self.complete(first)
+        self.complete(
+            self.track.tasks.last(), user=create_user('other@example.com'),
+        )
+
+        with self.assertNumQueries(2):
+            res = self.client.get(bundle_url(self.track.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['book']['title'], 'Sample book')
+        self.assertEqual(res.data['profile']['nickname'], 'leader')
+        self.assertEqual(
+            [(task['id'], task['is_done']) for task in res.data['tasks']],
+            [(task.id, task.id == first.id) for task in Task.objects.filter(
+                track=self.track,
+            )],
+        )
+        self.assertEqual(
+            res.data['progress'],
+            {'completed': 1, 'total': 2, 'percent': 50.0},
+        )
+
+    def test_bundle_constant_queries(self):
+        """Test the bundle query count does not grow with tasks."""
+        index = iter(range(3, 10))
+
+        def add_task():
+            task = Task.objects.create(
+                track=self.track,
+                order_major='1',
+                order_minor=str(next(index)),
+                task_name='Task',
+                ranges='1-10',
+                learning_time='30',
+                guideline='Read',
+                references='None',
+            )
+            self.complete(task)
+
+        self.assertConstantQueries(
+            lambda: self.client.get(bundle_url(self.track.id)),
+            committed(self, add_task),
+        )
+
+    def test_bundle_cached_per_user(self):
+        """Test bundles are cached per user and dropped on progress."""
+        self.client.get(bundle_url(self.track.id))
+
+        with self.assertNumQueries(0):
+            res = self.client.get(bundle_url(self.track.id))
+        self.assertEqual(res.data['progress']['completed'], 0)
+
+        other = APIClient()
+        other.force_authenticate(create_user(email='other@example.com'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.complete(self.track.tasks.first())
+
+        res = self.client.get(bundle_url(self.track.id))
+        self.assertEqual(res.data['progress']['completed'], 1)
+        res = other.get(bundle_url(self.track.id))
+        self.assertEqual(res.data['progress']['completed'], 0)
+
+    def test_bundle_private(self):
+        """Test bundles are marked private and vary on the token."""
+        etag = self.client.get(bundle_url(self.track.id))['ETag']
+
+        for res in [
+            self.client.get(bundle_url(self.track.id)),
+            self.client.get(
+                bundle_url(self.track.id), HTTP_IF_NONE_MATCH=etag,
+            ),
+        ]:
+            self.assertIn('private', res['Cache-Control'])
+            self.assertIn('Authorization', res['Vary'])
+
+    def test_bundle_cache_dropped_on_bulk_progress(self):
+        """Test a bulk userdata upsert refreshes the cached bundle."""
+        self.client.get(bundle_url(self.track.id))
+        task = self.track.tasks.first()
+
+        self.client.post(
+            reverse('userdata:user_data-bulk'),
+            [{
+                'track_id': self.track.id,
+                'order_major': task.order_major,
+                'order_minor': task.order_minor,
+                'is_done': True,
+            }],
+            format='json',
+        )
+
+        res = self.client.get(bundle_url(self.track.id))
+        self.assertEqual(res.data['progress']['completed'], 1)
+
+    def test_bundle_not_found(self):
+        """Test a missing track returns 404."""
+        res = self.client.get(bundle_url(self.track.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bundle_invalid_track_id(self):
+        """Test non integer and out of range track ids return 404."""
+        for pk in ('abc', '1.5', '9' * 20):
+            res = self.client.get(f'/api/track/track_alls/{pk}/bundle/')
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
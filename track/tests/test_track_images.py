@@ -0,0 +1,234 @@
+"""
+Tests for the track image upload pipeline.
+"""
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest.mock import patch
+
+from PIL import Image
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from track.images import process_track_image
+from track.tests.test_track_api import create_track
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_file(color='red'):
+    """Return an in memory JPEG upload."""
+    buffer = BytesIO()
+    Image.new('RGB', (200, 100), color).save(buffer, format='JPEG')
+
+    return SimpleUploadedFile(
+        'upload.jpg', buffer.getvalue(), content_type='image/jpeg',
+    )
+
+
+def image_upload_url(track_id):
+    """Create and return an image upload URL."""
+    return reverse('track:track-upload-image', args=[track_id])
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    TRACK_IMAGE_ASYNC=False,
+    TRACK_IMAGE_SIZES={'thumbnail': 32, 'small': 64},
+)
+class ImageUploadTests(TestCase):
+    """Tests for the image upload API."""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+        self.track = create_track(self.user, tasks=0)
+
+    def test_upload_image_creates_variants(self):
+        """Test uploading an image creates stripped, resized variants."""
+        with tempfile.NamedTemporaryFile(suffix='.jpg') as image_file:
+            exif = Image.Exif()
+            exif[0x010F] = 'Camera maker'
+            Image.new('RGB', (200, 100)).save(
+                image_file, format='JPEG', exif=exif,
+            )
+            image_file.seek(0)
+            with self.captureOnCommitCallbacks(execute=True):
+                res = self.client.post(
+                    image_upload_url(self.track.id),
+                    {'image': image_file},
+                    format='multipart',
+                )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.track.refresh_from_db()
+        self.assertTrue(os.path.exists(self.track.image.path))
+        variants = self.track.image_variants
+        self.assertEqual(set(variants), {'thumbnail', 'small'})
+        thumbnail = os.path.join(MEDIA_ROOT, variants['thumbnail']['webp'])
+        with Image.open(thumbnail) as image:
+            self.assertEqual(image.size, (32, 16))
+            self.assertEqual(len(image.getexif()), 0)
+        with Image.open(self.track.image.path) as image:
+            self.assertEqual(len(image.getexif()), 0)
+
+    def test_upload_image_applies_orientation(self):
+        """Test the stored original is rotated as its EXIF asked."""
+        buffer = BytesIO()
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        Image.new('RGB', (200, 100)).save(buffer, format='JPEG', exif=exif)
+
+        self.upload(self.track, SimpleUploadedFile(
+            'upload.jpg', buffer.getvalue(), content_type='image/jpeg',
+        ))
+
+        self.track.refresh_from_db()
+        with Image.open(self.track.image.path) as image:
+            self.assertEqual(image.size, (100, 200))
+            self.assertEqual(len(image.getexif()), 0)
+
+    def test_upload_image_stripped_in_background(self):
+        """Test the request stores the upload and the task strips it."""
+        buffer = BytesIO()
+        exif = Image.Exif()
+        exif[0x010F] = 'Camera maker'
+        Image.new('RGB', (200, 100)).save(buffer, format='JPEG', exif=exif)
+        upload = SimpleUploadedFile(
+            'upload.jpg', buffer.getvalue(), content_type='image/jpeg',
+        )
+
+        with patch('track.views.schedule_track_image') as schedule:
+            self.upload(self.track, upload)
+
+        self.track.refresh_from_db()
+        name = self.track.image.name
+        schedule.assert_called_once_with(name)
+        with Image.open(self.track.image.path) as image:
+            self.assertEqual(len(image.getexif()), 1)
+
+        process_track_image(name)
+
+        self.track.refresh_from_db()
+        self.assertNotEqual(self.track.image.name, name)
+        with Image.open(self.track.image.path) as image:
+            self.assertEqual(len(image.getexif()), 0)
+
+    def test_upload_image_unsupported_format(self):
+        """Test formats whose metadata is not stripped are rejected."""
+        buffer = BytesIO()
+        Image.new('RGB', (200, 100)).save(buffer, format='TIFF')
+
+        res = self.upload(self.track, SimpleUploadedFile(
+            'upload.tiff', buffer.getvalue(), content_type='image/tiff',
+        ))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('image', res.data)
+
+    def test_upload_image_resets_variants(self):
+        """Test the variants of the replaced image are not kept."""
+        self.upload(self.track, image_file('red'))
+
+        with patch('track.views.schedule_track_image'):
+            res = self.upload(self.track, image_file('blue'))
+
+        self.assertEqual(res.data['image_variants'], {})
+        self.track.refresh_from_db()
+        self.assertEqual(self.track.image_variants, {})
+
+    def test_upload_image_bad_request(self):
+        """Test uploading an invalid image."""
+        res = self.client.post(
+            image_upload_url(self.track.id),
+            {'image': 'notanimage'},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def upload(self, track, image):
+        """Upload image to track and run the processing callbacks."""
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                image_upload_url(track.id),
+                {'image': image},
+                format='multipart',
+            )
+
+    def test_identical_uploads_stored_once(self):
+        """Test the same image uploaded to two tracks is stored once."""
+        other = create_track(self.user, tasks=0)
+
+        self.upload(self.track, image_file())
+        with patch('track.images._create_variants') as create_variants:
+            self.upload(other, image_file())
+
+        create_variants.assert_not_called()
+        self.track.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.track.image.name, other.image.name)
+        self.assertEqual(self.track.image_variants, other.image_variants)
+
+    def test_storage_names_by_content(self):
+        """Test stored names are derived from the SHA-256 of the content."""
+        name = default_storage.save('uploads/track/a.txt', ContentFile(b'x'))
+
+        self.assertEqual(
+            name,
+            'uploads/track/2d/71/'
+            '2d711642b726b04401627ca9fbac32f5c8530fb1903cc4db02258717921a4881'
+            '.txt',
+        )
+        self.assertEqual(
+            default_storage.save('uploads/track/b.txt', ContentFile(b'x')),
+            name,
+        )
+
+    @override_settings(MEDIA_GC_GRACE_SECONDS=-1)
+    def test_replaced_image_released(self):
+        """Test an image no track references is deleted on replacement."""
+        self.upload(self.track, image_file('red'))
+        self.track.refresh_from_db()
+        old_name = self.track.image.name
+
+        self.upload(self.track, image_file('blue'))
+
+        self.assertFalse(default_storage.exists(old_name))
+
+    @override_settings(MEDIA_GC_GRACE_SECONDS=-1)
+    def test_gc_media_deletes_orphans(self):
+        """Test gc_media deletes only unreferenced files."""
+        self.upload(self.track, image_file())
+        self.track.refresh_from_db()
+        orphan = default_storage.save(
+            'uploads/track/orphan.jpg', ContentFile(b'orphan'),
+        )
+
+        call_command('gc_media', stdout=StringIO())
+
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertTrue(default_storage.exists(self.track.image.name))
+        for names in self.track.image_variants.values():
+            for name in names.values():
+                self.assertTrue(default_storage.exists(name))
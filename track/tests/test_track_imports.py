@@ -0,0 +1,278 @@
+"""
+Tests for the bulk import of books and tasks.
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Book, Search_Document, Task, Track
+from track.imports import iter_json
+from track.tests.test_track_api import create_track, create_user
+
+
+BOOK_HEADER = 'title,sub_title,author,isbn,publisher,published_date\n'
+
+
+def import_url(kind):
+    """Create and return a bulk import URL."""
+    return reverse('track:import', args=[kind])
+
+
+def book_line(isbn, title='Book'):
+    """Return a CSV line of a book."""
+    return f'{title},Sub,Author,{isbn},Publisher,2024-01-01T00:00:00Z\n'
+
+
+def task_row(track_id, index=1, **params):
+    """Return the import data of a task."""
+    row = {
+        'track_id': track_id,
+        'order_major': '1',
+        'order_minor': str(index),
+        'task_name': f'Imported {index}',
+        'ranges': '1-10',
+        'learning_time': '30',
+        'guideline': 'Read',
+        'references': 'None',
+    }
+    row.update(params)
+
+    return row
+
+
+def upload(name, content):
+    """Return an uploaded file with content."""
+    return SimpleUploadedFile(name, content.encode())
+
+
+class IterJsonTests(TestCase):
+    """Test the streaming JSON parser."""
+
+    def test_array_and_lines_across_chunks(self):
+        """Test arrays and JSON lines split across reads are parsed."""
+        values = [{'n': index, 'text': 'x' * index} for index in range(50)]
+        array = json.dumps(values)
+        lines = ''.join(json.dumps(value) + '\n' for value in values)
+
+        for text in (array, lines):
+            stream = StringIO(text)
+            self.assertEqual(list(iter_json(stream, chunk_size=7)), values)
+
+
+class TrackImportApiTests(TestCase):
+    """Test the bulk import endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.track = create_track(self.user, tasks=0)
+        self.client.force_authenticate(self.user)
+
+    def test_import_books_csv(self):
+        """Test books are created and ISBNs deduplicated."""
+        content = BOOK_HEADER + ''.join([
+            book_line('978-0-00-000000-0'),
+            book_line('0-306-40615-2'),
+            book_line('0306406152'),
+            book_line('not an isbn'),
+            book_line('9781111111111'),
+        ])
+
+        with override_settings(IMPORT_BATCH_SIZE=2):
+            res = self.client.post(
+                import_url('books'),
+                {'file': upload('books.csv', content)},
+                format='multipart',
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['rows'], 5)
+        self.assertEqual(res.data['created'], 2)
+        self.assertEqual(res.data['skipped'], 2)
+        self.assertEqual(res.data['failed'], 1)
+        self.assertEqual(res.data['errors'][0]['row'], 4)
+        self.assertIn('isbn', res.data['errors'][0]['errors'])
+        self.assertEqual(
+            set(Book.objects.values_list('isbn', flat=True)),
+            {'9780000000000', '0306406152', '9781111111111'},
+        )
+        book = Book.objects.get(isbn='0306406152')
+        self.assertTrue(Search_Document.objects.filter(
+            kind=Search_Document.BOOK, object_id=book.pk,
+        ).exists())
+
+    def test_import_books_skips_stored_isbn_with_separators(self):
+        """Test stored ISBNs are compared once normalized."""
+        Book.objects.create(
+            title='Stored', sub_title='', author='', image_url='',
+            isbn='0-306-40615-2', publisher='',
+        )
+        content = BOOK_HEADER + book_line('0306406152') + book_line(
+            '9781111111111',
+        )
+
+        res = self.client.post(
+            import_url('books'),
+            {'file': upload('books.csv', content)},
+            format='multipart',
+        )
+
+        self.assertEqual(res.data['created'], 1)
+        self.assertEqual(res.data['skipped'], 1)
+        self.assertEqual(Book.objects.filter(isbn='0306406152').count(), 0)
+
+    def test_import_books_documents_point_at_books(self):
+        """Test every search document gets the key of its book."""
+        content = BOOK_HEADER + ''.join(
+            book_line(f'978{index:010d}', title=f'Book {index}')
+            for index in range(5)
+        )
+
+        with override_settings(IMPORT_BATCH_SIZE=2):
+            self.client.post(
+                import_url('books'),
+                {'file': upload('books.csv', content)},
+                format='multipart',
+            )
+
+        documents = Search_Document.objects.filter(kind=Search_Document.BOOK)
+        books = Book.objects.filter(isbn__startswith='978')
+        self.assertEqual(books.count(), 5)
+        self.assertEqual(
+            {(doc.object_id, doc.title) for doc in documents},
+            set(books.values_list('pk', 'title')),
+        )
+
+    def test_import_tasks_json(self):
+        """Test tasks are created in the track with their order keys."""
+        rows = [task_row(self.track.id, index) for index in range(1, 4)]
+        rows.append(task_row(self.track.id, 4, task_name=''))
+
+        res = self.client.post(
+            import_url('tasks'),
+            {'file': upload('tasks.json', json.dumps(rows))},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 3)
+        self.assertEqual(res.data['failed'], 1)
+        self.assertEqual(res.data['errors'][0]['row'], 4)
+        tasks = Task.objects.filter(track=self.track).order_by('pk')
+        self.assertEqual(
+            [task.order_minor_key for task in tasks], [1, 2, 3],
+        )
+
+    def test_import_tasks_other_leader_track(self):
+        """Test tasks cannot be imported into tracks of other leaders."""
+        other = create_track(create_user(email='other@example.com'), tasks=0)
+        content = json.dumps(task_row(other.id)) + '\n'
+
+        res = self.client.post(
+            import_url('tasks'),
+            {'file': upload('tasks.ndjson', content)},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 0)
+        self.assertIn('track_id', res.data['errors'][0]['errors'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_import_tasks_out_of_range_track(self):
+        """Test a track_id too large for the column is a row error."""
+        content = json.dumps(task_row(10 ** 20)) + '\n'
+
+        res = self.client.post(
+            import_url('tasks'),
+            {'file': upload('tasks.ndjson', content)},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['failed'], 1)
+        self.assertIn('track_id', res.data['errors'][0]['errors'])
+
+    def test_malformed_json_keeps_earlier_rows(self):
+        """Test parsing stops at a malformed row with an error."""
+        content = json.dumps(task_row(self.track.id)) + '\n{"broken\n'
+
+        res = self.client.post(
+            import_url('tasks'),
+            {'file': upload('tasks.ndjson', content)},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 1)
+        self.assertEqual(res.data['errors'][0]['row'], 2)
+
+    def test_unknown_format_rejected(self):
+        """Test a file without a known extension needs file_format."""
+        res = self.client.post(
+            import_url('books'),
+            {'file': upload('books.txt', BOOK_HEADER)},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('file_format', res.data)
+
+    def test_unknown_kind_not_found(self):
+        """Test importing an unknown kind returns 404."""
+        res = self.client.post(
+            import_url('tracks'),
+            {'file': upload('tracks.csv', BOOK_HEADER)},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_import_requires_leader(self):
+        """Test users without the leader role cannot import."""
+        client = APIClient()
+        client.force_authenticate(create_user(email='plain@example.com'))
+
+        res = client.post(
+            import_url('books'),
+            {'file': upload('books.csv', BOOK_HEADER)},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ImportCurriculumCommandTests(TestCase):
+    """Test the import_curriculum command."""
+
+    def test_import_tasks(self):
+        """Test the command imports tasks from a CSV file."""
+        track = create_track(create_user(), tasks=0)
+        header = ','.join(task_row(track.id))
+        lines = [
+            ','.join(map(str, task_row(track.id, index).values()))
+            for index in range(1, 6)
+        ]
+        with tempfile.NamedTemporaryFile(
+            'w', suffix='.csv', delete=False,
+        ) as file:
+            file.write('\n'.join([header] + lines))
+        self.addCleanup(os.remove, file.name)
+
+        out = StringIO()
+        call_command(
+            'import_curriculum', 'tasks', file.name,
+            user='user@example.com', batch_size=2, stdout=out,
+        )
+
+        self.assertIn('created 5', out.getvalue())
+        self.assertEqual(Task.objects.filter(track=track).count(), 5)
@@ -8,17 +8,32 @@ from django.urls import (
 
 from rest_framework.routers import DefaultRouter
 
-from track import views
+from track import async_views, views
 
 
 router = DefaultRouter()
 router.register('tracks', views.TrackViewSet)
 router.register('books', views.BookViewSet)
 router.register('tasks', views.TaskViewSet)
-router.register('track_alls', views.TrackAllViewSet)
+router.register('track_alls', views.TrackAllViewSet, basename='track-all')
 
 app_name = 'track'
 
 urlpatterns = [
+    path(
+        'async/track_alls/',
+        async_views.track_list,
+        name='async-track-all-list',
+    ),
+    path(
+        'async/track_alls/<int:pk>/',
+        async_views.track_detail,
+        name='async-track-all-detail',
+    ),
+    path(
+        'import/<str:kind>/',
+        views.TrackImportView.as_view(),
+        name='import',
+    ),
     path('', include(router.urls)),
 ]
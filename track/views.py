@@ -1,6 +1,11 @@
 """
 Views for the track APIs
 """
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch
+from django.http import Http404
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from django_filters.rest_framework import DjangoFilterBackend
 
 from drf_spectacular.utils import (
@@ -15,18 +20,28 @@ from rest_framework import (
     mixins,
     status,
 )
+from rest_framework.generics import get_object_or_404
 from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 from core.models import (
     Track,
+    Track_Follow,
     Book,
     Task,
+    User_Data,
 )
+from core.cache import CachedResponseMixin, get_version, progress_namespace
+from core.pagination import KeysetPagination, TrackCursorPagination
+from core.fieldsets import SparseFieldsetMixin
+from core.permissions import IsLeader
+from user.authentication import CachedTokenAuthentication
 from track import serializers
+from track.images import release_track_image, schedule_track_image
+from track.imports import IMPORTERS, read_rows
 from task import serializers as taskserializers
 from book import serializers as bookserializers
 
@@ -44,29 +59,147 @@ from book import serializers as bookserializers
                 OpenApiTypes.STR,
                 description='Comma separated list of task IDs to filter',
             ),
+            OpenApiParameter(
+                'ordering',
+                OpenApiTypes.STR,
+                enum=[
+                    '-published_date', '-followers_num', '-rating_avg',
+                ],
+                description='Sort tracks by date or popularity.',
+            ),
+            OpenApiParameter(
+                'fields',
+                OpenApiTypes.STR,
+                description=(
+                    'Comma separated fields to return, dotted for nested '
+                    'fields, e.g. id,track_name,book.title'
+                ),
+            ),
+            OpenApiParameter(
+                'expand',
+                OpenApiTypes.STR,
+                description=(
+                    'Comma separated relations to embed, the others are '
+                    'returned as IDs, e.g. profile,book'
+                ),
+            ),
         ]
     )
 )
 
 
-class TrackAllViewSet(viewsets.ModelViewSet):
+class TrackAllViewSet(CachedResponseMixin,
+                      SparseFieldsetMixin,
+                      viewsets.ModelViewSet):
     queryset = Track.objects.all()
-    filter_backends = [DjangoFilterBackend]
+    # Non integer ids, and ids too large for a 64 bit column, 404 in the
+    # router instead of failing in a lookup.
+    lookup_value_regex = r'\d{1,18}'
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['subject_major', 'subject_minor', 'target_test', 'target_grade']
+    ordering_fields = ['published_date', 'followers_num', 'rating_avg']
+    ordering = ['-published_date']
+    pagination_class = TrackCursorPagination
 
     def get_serializer_class(self):
         if self.action == 'list' or 'retrieve':
             return serializers.TrackDetailSerializer
 
+    @action(
+        methods=['POST', 'DELETE'],
+        detail=True,
+        url_path='follow',
+        authentication_classes=[CachedTokenAuthentication],
+        permission_classes=[IsAuthenticated],
+    )
+    def follow(self, request, pk=None):
+        """Follow or unfollow a track."""
+        track = self.get_object()
+        if request.method == 'POST':
+            Track_Follow.objects.get_or_create(user=request.user, track=track)
+        else:
+            Track_Follow.objects.filter(
+                user=request.user, track=track,
+            ).delete()
+
+        track.refresh_from_db(fields=['followers_num'])
+        return Response({'followers_num': track.followers_num})
+
+    def get_cache_key(self, request):
+        """Key bundles on the caller and the version of their progress."""
+        key = super().get_cache_key(request)
+        if self.action == 'bundle':
+            version = get_version(progress_namespace(request.user.pk))
+            key = f'{key}:{request.user.pk}:{version}'
+
+        return key
 
-class TrackViewSet(viewsets.ModelViewSet):
+    @extend_schema(responses=serializers.TrackBundleSerializer)
+    @action(
+        methods=['GET'],
+        detail=True,
+        url_path='bundle',
+        authentication_classes=[CachedTokenAuthentication],
+        permission_classes=[IsAuthenticated],
+    )
+    def bundle(self, request, pk=None):
+        """Return a track with its book, leader, tasks and progress.
+
+        The bundle holds the caller's progress, so shared caches must not
+        store it or serve it to another token.
+        """
+        response = self.cached_response(self._bundle, request, pk=pk)
+        patch_cache_control(response, private=True)
+        patch_vary_headers(response, ['Authorization'])
+
+        return response
+
+    def _bundle(self, request, pk=None):
+        """Build the bundle in two queries: the track and its tasks."""
+        done = User_Data.objects.filter(
+            user=request.user,
+            track=OuterRef('track'),
+            order_major=OuterRef('order_major'),
+            order_minor=OuterRef('order_minor'),
+            is_done=True,
+        )
+        tasks = Task.objects.annotate(is_done=Exists(done)).order_by(
+            'order_major_key', 'order_minor_key', 'id',
+        )
+        track = get_object_or_404(
+            Track.objects.select_related('profile', 'book').prefetch_related(
+                Prefetch('tasks', queryset=tasks),
+            ),
+            pk=pk,
+        )
+
+        serializer = serializers.TrackBundleSerializer(
+            track, context=self.get_serializer_context(),
+        )
+        return Response(serializer.data)
+
+    @action(methods=['GET'], detail=True, url_path='curriculum')
+    def curriculum(self, request, pk=None):
+        """List the tasks of a track in teaching order."""
+        if not Track.objects.filter(pk=pk).exists():
+            raise Http404
+        tasks = Task.objects.filter(track_id=pk).order_by(
+            'order_major_key', 'order_minor_key', 'id',
+        )
+
+        serializer = taskserializers.TaskDetailSerializer(tasks, many=True)
+        return Response(serializer.data)
+
+
+class TrackViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """View for manage track APIs."""
     serializer_class = serializers.TrackDetailSerializer
     queryset = Track.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['subject_major', 'subject_minor', 'target_test', 'target_grade']
+    pagination_class = KeysetPagination
 
     def _params_to_ints(self, qs):
         """Convert a list of strings to integers."""
@@ -76,16 +209,16 @@ class TrackViewSet(viewsets.ModelViewSet):
         """Retrieve tracks for authenticated user."""
         books = self.request.query_params.get('books')
         tasks = self.request.query_params.get('tasks')
-        queryset = self.queryset
+        queryset = super().get_queryset()
         if books:
             book_ids = self._params_to_ints(books)
-            queryset = queryset.filter(books__id__in=book_ids)
+            queryset = queryset.filter(book__id__in=book_ids)
         if tasks:
             task_ids = self._params_to_ints(tasks)
             queryset = queryset.filter(tasks__id__in=task_ids)
 
         return queryset.filter(
-            user=self.request.user
+            leader=self.request.user
         ).order_by('-id').distinct()
 
     def get_serializer_class(self):
@@ -99,16 +232,27 @@ class TrackViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """Create a new track."""
-        serializer.save(user=self.request.user)
+        serializer.save(leader=self.request.user)
 
     @action(methods=['POST'], detail=True, url_path='upload-image')
     def upload_image(self, request, pk=None):
         """Upload an image to track."""
+        request._request.upload_handlers = [
+            TemporaryFileUploadHandler(request._request),
+        ]
         track = self.get_object()
+        previous_image = track.image.name
         serializer = self.get_serializer(track, data=request.data)
 
         if serializer.is_valid():
-            serializer.save()
+            # The variants of the previous image must not be served for
+            # the new one while it is processed.
+            track = serializer.save(image_variants={})
+            schedule_track_image(track.image.name)
+            if previous_image and previous_image != track.image.name:
+                transaction.on_commit(
+                    lambda: release_track_image(previous_image),
+                )
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -125,26 +269,32 @@ class TrackViewSet(viewsets.ModelViewSet):
         ]
     )
 )
-class BaseTrackAttrViewSet(mixins.DestroyModelMixin,
+class BaseTrackAttrViewSet(SparseFieldsetMixin,
+                            mixins.DestroyModelMixin,
                             mixins.UpdateModelMixin,
                             mixins.ListModelMixin,
                             viewsets.GenericViewSet):
-    """Base viewset for recipe attributes."""
-    authentication_classes = [TokenAuthentication]
+    """Base viewset for recipe attributes.
+
+    Tasks and books have no owner of their own; users see those of the
+    tracks they lead.
+    """
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        """Filter queryset to authenticated user."""
+        """Filter queryset to the tracks of the authenticated user."""
         assigned_only = bool(
             int(self.request.query_params.get('assigned_only', 0))
         )
-        queryset = self.queryset
+        queryset = super().get_queryset()
         if assigned_only:
             queryset = queryset.filter(track__isnull=False)
 
         return queryset.filter(
-            user=self.request.user
-        ).order_by('-track_name').distinct()
+            track__leader=self.request.user
+        ).order_by('-id').distinct()
 
 
 class TaskViewSet(BaseTrackAttrViewSet):
@@ -157,3 +307,30 @@ class BookViewSet(BaseTrackAttrViewSet):
     """Manage books in the database."""
     serializer_class = bookserializers.BookSerializer
     queryset = Book.objects.all()
+
+
+class TrackImportView(APIView):
+    """Bulk import books or tasks from a CSV, JSON or NDJSON file."""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated, IsLeader]
+
+    @extend_schema(
+        request={
+            'multipart/form-data': serializers.TrackImportSerializer,
+        },
+        responses=serializers.TrackImportReportSerializer,
+    )
+    def post(self, request, kind):
+        """Import the rows of the uploaded file and return a report."""
+        if kind not in IMPORTERS:
+            raise Http404
+        request._request.upload_handlers = [
+            TemporaryFileUploadHandler(request._request),
+        ]
+        serializer = serializers.TrackImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        file = serializer.validated_data['file']
+        rows = read_rows(file, serializer.validated_data['file_format'])
+        report = IMPORTERS[kind](user=request.user).run(rows)
+
+        return Response(report, status=status.HTTP_200_OK)
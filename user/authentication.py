@@ -0,0 +1,144 @@
+"""
+Cached token authentication for the APIs.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+
+class TokenCache:
+    """Bounded LRU cache of token owners by key with a time to live.
+
+    The field values of the owner are kept rather than model instances,
+    so each request builds its own user and requests do not share
+    mutable objects. Entries live in the memory of each process. Signals
+    drop them in the process that saved or deleted the token or the
+    user, and the TTL bounds how long other processes, and changes made
+    without signals such as queryset updates, may keep serving them.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached (user_id, db, values, created) of key or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+
+            return value
+
+    def set(self, key, token):
+        """Cache the owner of token, evicting the least recently used."""
+        expires_at = time.monotonic() + settings.TOKEN_CACHE_TTL
+        user = token.user
+        values = {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+        }
+        value = (user.pk, user._state.db, values, token.created)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Drop the entry for key."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_user(self, user_id):
+        """Drop every entry belonging to user_id."""
+        with self._lock:
+            for key, (value, _) in list(self._entries.items()):
+                if value[0] == user_id:
+                    del self._entries[key]
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
+
+
+def is_token_expired(token):
+    """Return True if token is older than TOKEN_EXPIRE_SECONDS."""
+    if not settings.TOKEN_EXPIRE_SECONDS:
+        return False
+    age = timedelta(seconds=settings.TOKEN_EXPIRE_SECONDS)
+
+    return token.created + age <= timezone.now()
+
+
+def rotate_token(token):
+    """Replace token with a new token for the same user."""
+    with transaction.atomic():
+        token.delete()
+        return Token.objects.create(user=token.user)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication serving tokens and their users from memory.
+
+    A cache hit builds the user from the cached field values without a
+    query, the same way a row loaded from the database is built.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, token)
+        else:
+            db, values, created = cached[1:]
+            user = get_user_model().from_db(
+                db, list(values), list(values.values()),
+            )
+            if not user.is_active:
+                token_cache.delete(key)
+                raise AuthenticationFailed(_('User inactive or deleted.'))
+            token = Token(key=key, user=user, created=created)
+
+        if is_token_expired(token):
+            token.delete()
+            raise AuthenticationFailed(_('Token has expired.'))
+
+        return token.user, token
+
+
+def invalidate_token(sender, instance, **kwargs):
+    """Drop a deleted token from the cache."""
+    token_cache.delete(instance.key)
+
+
+def invalidate_user_tokens(sender, instance, **kwargs):
+    """Drop the tokens of a changed or deleted user from the cache."""
+    token_cache.delete_user(instance.pk)
+
+
+post_delete.connect(invalidate_token, sender=Token)
+post_save.connect(invalidate_user_tokens, sender=get_user_model())
+post_delete.connect(invalidate_user_tokens, sender=get_user_model())
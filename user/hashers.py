@@ -0,0 +1,22 @@
+"""
+Password hashers with costs read from the settings.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class TunedPBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2 with PBKDF2_ITERATIONS iterations."""
+    iterations = settings.PBKDF2_ITERATIONS
+
+
+class TunedArgon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2 with the ARGON2_* time, memory and parallelism costs."""
+    time_cost = settings.ARGON2_TIME_COST
+    memory_cost = settings.ARGON2_MEMORY_COST
+    parallelism = settings.ARGON2_PARALLELISM
+
+
+class TunedBCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    """bcrypt with BCRYPT_ROUNDS rounds."""
+    rounds = settings.BCRYPT_ROUNDS
@@ -0,0 +1,154 @@
+"""
+Tests for the cached token authentication.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.tests.utils import QueryBudgetMixin
+from user.authentication import CachedTokenAuthentication, token_cache
+
+
+ME_URL = reverse('user:me')
+TOKEN_URL = reverse('user:token')
+TOKEN_ROTATE_URL = reverse('user:token-rotate')
+
+
+class CachedTokenAuthenticationTests(QueryBudgetMixin, TestCase):
+    """Test requests authenticated with cached tokens."""
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test Name',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_cached_token_skips_queries(self):
+        """Test a repeated request authenticates without a query."""
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+
+    def test_deleted_token_rejected(self):
+        """Test a cached token stops working once deleted."""
+        self.client.get(ME_URL)
+
+        self.token.delete()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected(self):
+        """Test a cached token stops working once its user is inactive."""
+        self.client.get(ME_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_rejected(self):
+        """Test a cached token stops working once its user is deleted."""
+        self.client.get(ME_URL)
+
+        self.user.delete()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(TOKEN_CACHE_TTL=0)
+    def test_user_deactivated_without_signal_rejected(self):
+        """Test a queryset update is seen once the cache entry expires."""
+        self.client.get(ME_URL)
+
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False,
+        )
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_user_saves(self):
+        """Test a user built from the cache saves without losing fields."""
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(self.token.key)
+
+        user, _ = auth.authenticate_credentials(self.token.key)
+        user.name = 'New Name'
+        user.save()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, 'New Name')
+        self.assertTrue(self.user.check_password('testpass123'))
+
+    def test_cached_users_not_shared(self):
+        """Test requests hitting the cache get their own user instance."""
+        auth = CachedTokenAuthentication()
+
+        first, _ = auth.authenticate_credentials(self.token.key)
+        second, _ = auth.authenticate_credentials(self.token.key)
+
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+    @override_settings(TOKEN_EXPIRE_SECONDS=60)
+    def test_expired_token_rejected(self):
+        """Test tokens older than TOKEN_EXPIRE_SECONDS are rejected."""
+        Token.objects.filter(pk=self.token.pk).update(
+            created=timezone.now() - timedelta(minutes=2),
+        )
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(Token.objects.filter(pk=self.token.pk).exists())
+
+    @override_settings(TOKEN_EXPIRE_SECONDS=60)
+    def test_login_replaces_expired_token(self):
+        """Test logging in returns a new token once the old one expired."""
+        Token.objects.filter(pk=self.token.pk).update(
+            created=timezone.now() - timedelta(minutes=2),
+        )
+
+        res = APIClient().post(TOKEN_URL, {
+            'email': 'test@example.com',
+            'password': 'testpass123',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res.data['token'], self.token.key)
+
+    def test_rotate_token(self):
+        """Test rotating replaces the token used for the request."""
+        self.client.get(ME_URL)
+
+        res = self.client.post(TOKEN_ROTATE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res.data['token'], self.token.key)
+        self.assertEqual(
+            self.client.get(ME_URL).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        new_token = res.data['token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {new_token}')
+        self.assertEqual(
+            self.client.get(ME_URL).status_code, status.HTTP_200_OK,
+        )
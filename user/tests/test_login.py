@@ -0,0 +1,80 @@
+"""
+Tests for password hashing and throttling of the token endpoint.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.tests.utils import QueryBudgetMixin
+from user.throttles import LoginEmailThrottle, LoginIPThrottle
+
+
+TOKEN_URL = reverse('user:token')
+
+
+class LoginTests(QueryBudgetMixin, TestCase):
+    """Test logging in through the token endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com', 'testpass123',
+        )
+
+    def login(self, email='user@example.com', password='testpass123',
+              **extra):
+        return self.client.post(
+            TOKEN_URL, {'email': email, 'password': password}, **extra,
+        )
+
+    def test_hash_upgraded_on_login(self):
+        """Test passwords stored with an older hasher are rehashed."""
+        self.user.password = make_password(
+            'testpass123', hasher='pbkdf2_sha1',
+        )
+        self.user.save()
+
+        res = self.login()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+        self.assertTrue(self.user.check_password('testpass123'))
+
+    @patch.dict(
+        LoginEmailThrottle.THROTTLE_RATES, {'login_email': '2/min'},
+    )
+    def test_email_throttled(self):
+        """Test login attempts for an email are limited."""
+        self.login(password='wrong', REMOTE_ADDR='10.0.0.1')
+        self.login(password='wrong', REMOTE_ADDR='10.0.0.2')
+
+        with patch('user.serializers.authenticate') as authenticate:
+            res = self.login(REMOTE_ADDR='10.0.0.3')
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', res)
+        authenticate.assert_not_called()
+        other = self.login(email='other@example.com', REMOTE_ADDR='10.0.0.3')
+        self.assertEqual(other.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch.dict(LoginIPThrottle.THROTTLE_RATES, {'login_ip': '2/min'})
+    def test_ip_throttled(self):
+        """Test login attempts from a client address are limited."""
+        self.login(email='a@example.com', REMOTE_ADDR='10.0.0.1')
+        self.login(email='b@example.com', REMOTE_ADDR='10.0.0.1')
+
+        res = self.login(REMOTE_ADDR='10.0.0.1')
+        other = self.login(REMOTE_ADDR='10.0.0.2')
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
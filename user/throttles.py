@@ -0,0 +1,70 @@
+"""
+Throttles for the token endpoint.
+"""
+from django.core.cache import cache
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class CacheCounterThrottle(SimpleRateThrottle):
+    """Fixed window throttle counting requests in the shared cache.
+
+    Each window is a single counter incremented with cache.incr, which
+    is atomic on the shared backends, instead of the request history
+    list SimpleRateThrottle reads and rewrites on every request.
+    """
+    cache = cache
+
+    def get_window(self):
+        """Return the index of the current window."""
+        return int(self.now // self.duration)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        ident = self.get_cache_key(request, view)
+        if ident is None:
+            return True
+
+        self.now = self.timer()
+        key = f'{ident}:{self.get_window()}'
+        self.cache.add(key, 0, self.duration)
+        try:
+            count = self.cache.incr(key)
+        except ValueError:
+            # The counter expired between add and incr.
+            self.cache.set(key, 1, self.duration)
+            count = 1
+
+        return count <= self.num_requests
+
+    def wait(self):
+        return self.duration - self.now % self.duration
+
+
+class LoginIPThrottle(CacheCounterThrottle):
+    """Limit the login attempts from a client address."""
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+
+class LoginEmailThrottle(CacheCounterThrottle):
+    """Limit the login attempts for an email address."""
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if hasattr(
+            request.data, 'get',
+        ) else None
+        if not email:
+            return None
+
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': str(email).strip().lower(),
+        }
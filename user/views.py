@@ -1,15 +1,24 @@
 """
 Views for the user API.
 """
-from rest_framework import generics, authentication, permissions
+from rest_framework import generics, permissions
+from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 from core.models import User_Data
 
+from user.authentication import (
+    CachedTokenAuthentication,
+    is_token_expired,
+    rotate_token,
+)
 from user.serializers import (
     UserSerializer,
     AuthTokenSerializer,
 )
+from user.throttles import LoginEmailThrottle, LoginIPThrottle
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -25,12 +34,36 @@ class CreateTokenView(ObtainAuthToken):
     """Create a new auth token for user."""
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
+
+    def post(self, request, *args, **kwargs):
+        """Return the user's token, replacing it once it has expired."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.validated_data['user']
+        token, created = Token.objects.get_or_create(user=user)
+        if is_token_expired(token):
+            token = rotate_token(token)
+
+        return Response({'token': token.key})
+
+
+class RotateTokenView(APIView):
+    """Replace the auth token used for the request with a new one."""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        """Return the new token."""
+        token = rotate_token(request.auth)
+
+        return Response({'token': token.key})
 
 
 class ManageUserView(generics.RetrieveUpdateAPIView):
     """Manage the authenticated user."""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
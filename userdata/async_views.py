@@ -0,0 +1,8 @@
+"""
+Async views for the userdata APIs.
+"""
+from core.asynchronous import async_view
+from userdata.views import UserDataViewSet
+
+
+user_data_list = async_view(UserDataViewSet.as_view({'get': 'list'}))
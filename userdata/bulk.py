@@ -0,0 +1,87 @@
+"""
+Bulk upsert of userdata events.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from core.cache import bump_version, progress_namespace
+from core.models import User_Data
+
+
+UPDATE_FIELDS = ['is_done', 'action_date']
+
+
+def _step_key(track_id, order_major, order_minor):
+    """Return the key identifying a step of a track."""
+    return (track_id, order_major, order_minor)
+
+
+def lock_user_data(user):
+    """Make other writers of the userdata of user wait for this transaction.
+
+    Steps not stored yet have no row to lock, so the user row is locked
+    instead. Django 3.2 has no bulk upsert, and with the writers queued
+    the rows read afterwards stay current until the commit. SQLite runs
+    one writer at a time anyway.
+    """
+    list(
+        get_user_model().objects.select_for_update().filter(
+            pk=user.pk,
+        ).values_list('pk', flat=True)
+    )
+
+
+def upsert_user_data(user, events):
+    """Insert or update the events of user keyed on track and order.
+
+    Events for a step that is already stored only replace it when they
+    are at least as recent, so retried, reordered or concurrent batches
+    leave the latest event behind. Returns the number of created and
+    updated rows.
+    """
+    now = timezone.now()
+    latest = {}
+    for event in events:
+        event = {'action_date': now, 'is_done': False, **event}
+        key = _step_key(
+            event['track_id'], event['order_major'], event['order_minor'],
+        )
+        if key not in latest or (
+            event['action_date'] >= latest[key]['action_date']
+        ):
+            latest[key] = event
+
+    track_ids = {key[0] for key in latest}
+    with transaction.atomic():
+        lock_user_data(user)
+        existing = {
+            _step_key(obj.track_id, obj.order_major, obj.order_minor): obj
+            for obj in User_Data.objects.select_for_update().filter(
+                user=user,
+                track_id__in=track_ids,
+            )
+        }
+
+        to_create, to_update = [], []
+        for key, event in latest.items():
+            obj = existing.get(key)
+            if obj is None:
+                obj = User_Data(user=user, **event)
+                obj.set_order_keys()
+                to_create.append(obj)
+            elif event['action_date'] >= obj.action_date:
+                for field in UPDATE_FIELDS:
+                    setattr(obj, field, event[field])
+                to_update.append(obj)
+
+        # No other writer can have stored these steps since they were
+        # read, so every row is inserted.
+        User_Data.objects.bulk_create(to_create)
+        User_Data.objects.bulk_update(to_update, UPDATE_FIELDS)
+
+    # Bulk writes send no signals, so drop the cached progress here.
+    if to_create or to_update:
+        bump_version(progress_namespace(user.pk))
+
+    return len(to_create), len(to_update)
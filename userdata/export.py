@@ -0,0 +1,59 @@
+"""
+Streaming export of userdata history.
+"""
+import csv
+import json
+
+from django.conf import settings
+
+
+EXPORT_FIELDS = [
+    'id', 'user_id', 'track_id', 'action_date', 'order_major', 'order_minor',
+    'is_done',
+]
+
+
+class _Echo:
+    """File-like object returning what is written, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size=None):
+    """Yield the export values of queryset one row at a time, in order.
+
+    Rows are read as tuples through iterator(), which uses a server-side
+    cursor where the database supports one, so neither model instances
+    nor the full result set are ever held in memory.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    rows = queryset.values_list(*EXPORT_FIELDS).iterator(
+        chunk_size=chunk_size,
+    )
+    date_index = EXPORT_FIELDS.index('action_date')
+    for row in rows:
+        row = list(row)
+        row[date_index] = row[date_index].isoformat()
+        yield row
+
+
+def render_csv(rows):
+    """Yield the lines of a CSV document with a header row."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def render_ndjson(rows):
+    """Yield one JSON object per line."""
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row))) + '\n'
+
+
+# format: (renderer, content type)
+EXPORT_FORMATS = {
+    'csv': (render_csv, 'text/csv'),
+    'ndjson': (render_ndjson, 'application/x-ndjson'),
+}
@@ -0,0 +1,49 @@
+"""
+Django command to export userdata history as NDJSON or CSV.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User_Data
+from userdata.export import EXPORT_FORMATS, export_rows
+
+
+class Command(BaseCommand):
+    """Django command to stream userdata history to a file or stdout."""
+
+    help = (
+        'Export the userdata history of one user, or of every user, '
+        'streaming rows so memory use does not grow with the history.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Email of the user to export.')
+        parser.add_argument(
+            '--export-format', choices=list(EXPORT_FORMATS), default='ndjson',
+        )
+        parser.add_argument('--output', help='Write the export to a file.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Rows fetched per round trip, EXPORT_CHUNK_SIZE by default.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        queryset = User_Data.objects.order_by('id')
+        if options['user']:
+            try:
+                user = get_user_model().objects.get(email=options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'No user with email {options["user"]}.')
+            queryset = queryset.filter(user=user).order_by('action_date', 'id')
+
+        render, _ = EXPORT_FORMATS[options['export_format']]
+        lines = render(export_rows(queryset, options['chunk_size']))
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        with open(options['output'], 'w', newline='') as output:
+            output.writelines(lines)
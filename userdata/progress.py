@@ -0,0 +1,62 @@
+"""
+Progress aggregation over userdata events.
+"""
+from django.db.models import Case, Count, Exists, OuterRef, When
+
+from core.models import Task, User_Data
+
+
+def _percent(completed, total):
+    """Return completed as a percentage of total."""
+    if not total:
+        return 0.0
+
+    return round(completed * 100 / total, 2)
+
+
+def get_progress(user, track_id=None):
+    """Return completed/total counts per track and order_major chapter.
+
+    The total is the number of tasks of the chapter and a task counts as
+    completed when user marked its step done, as in the track bundle.
+    Only tracks user has recorded events for are listed. The counts come
+    from a single grouped query, so the cost depends on the number of
+    chapters rather than on the number of events.
+    """
+    events = User_Data.objects.filter(user=user)
+    if track_id is not None:
+        events = events.filter(track_id=track_id)
+    done = events.filter(
+        track_id=OuterRef('track_id'),
+        order_major=OuterRef('order_major'),
+        order_minor=OuterRef('order_minor'),
+        is_done=True,
+    )
+    rows = Task.objects.filter(
+        track_id__in=events.values('track_id'),
+    ).values('track_id', 'order_major').annotate(
+        total=Count('id'),
+        completed=Count(Case(When(Exists(done), then='id'))),
+    ).order_by('track_id', 'order_major_key', 'order_major')
+
+    tracks = {}
+    for row in rows:
+        track = tracks.setdefault(row['track_id'], {
+            'track_id': row['track_id'],
+            'completed': 0,
+            'total': 0,
+            'chapters': [],
+        })
+        track['completed'] += row['completed']
+        track['total'] += row['total']
+        track['chapters'].append({
+            'order_major': row['order_major'],
+            'completed': row['completed'],
+            'total': row['total'],
+            'percent': _percent(row['completed'], row['total']),
+        })
+
+    for track in tracks.values():
+        track['percent'] = _percent(track['completed'], track['total'])
+
+    return list(tracks.values())
@@ -1,15 +1,43 @@
 """
 Serializers for profile APIs
 """
+from django.db import transaction
+
 from rest_framework import serializers
 
-from core.models import User_Data
+from core.models import ID_MAX, Track, User_Data
 from track.serializers import TrackSerializer
+from userdata.bulk import lock_user_data
+
+
+TRACK_DOES_NOT_EXIST = 'Invalid pk "{pk_value}" - object does not exist.'
+
+
+class UserDataListSerializer(serializers.ListSerializer):
+    """Serializer for batches of userdata, checking tracks in one query."""
+
+    def validate(self, attrs):
+        track_ids = {item['track_id'] for item in attrs}
+        missing = track_ids - set(
+            Track.objects.filter(pk__in=track_ids).values_list(
+                'pk', flat=True,
+            )
+        )
+        if missing:
+            raise serializers.ValidationError({
+                'track_id': [
+                    TRACK_DOES_NOT_EXIST.format(pk_value=pk)
+                    for pk in sorted(missing)
+                ],
+            })
+
+        return attrs
 
 
 class UserDataSerializer(serializers.ModelSerializer):
     """Serializer for userdatas."""
     #track = TrackSerializer()
+    track_id = serializers.IntegerField(min_value=1, max_value=ID_MAX)
 
     class Meta:
         model = User_Data
@@ -18,10 +46,67 @@ class UserDataSerializer(serializers.ModelSerializer):
             'is_done',
          ]
         read_only_fields = ['id']
+        list_serializer_class = UserDataListSerializer
+
+    def validate_track_id(self, value):
+        """Check the track exists, unless the whole batch is checked."""
+        if not isinstance(self.parent, serializers.ListSerializer) and (
+            not Track.objects.filter(pk=value).exists()
+        ):
+            raise serializers.ValidationError(
+                TRACK_DOES_NOT_EXIST.format(pk_value=value),
+            )
+
+        return value
+
+    def create(self, validated_data):
+        """Create the userdata or update the stored step."""
+        user = validated_data.pop('user')
+        with transaction.atomic():
+            lock_user_data(user)
+            user_data, created = User_Data.objects.update_or_create(
+                user=user,
+                track_id=validated_data.pop('track_id'),
+                order_major=validated_data.pop('order_major'),
+                order_minor=validated_data.pop('order_minor'),
+                defaults=validated_data,
+            )
+
+        return user_data
 
 
 class UserDataDetailSerializer(UserDataSerializer):
     """Serializer for UserData detail view."""
 
     class Meta(UserDataSerializer.Meta):
-        fields = UserDataSerializer.Meta.fields + ['is_done']
\ No newline at end of file
+        fields = UserDataSerializer.Meta.fields + ['is_done']
+
+
+class UserDataBulkResultSerializer(serializers.Serializer):
+    """Serializer for the result of a bulk userdata upsert."""
+    created = serializers.IntegerField()
+    updated = serializers.IntegerField()
+
+
+class ChapterProgressSerializer(serializers.Serializer):
+    """Serializer for the progress of an order_major chapter."""
+    order_major = serializers.CharField()
+    completed = serializers.IntegerField()
+    total = serializers.IntegerField()
+    percent = serializers.FloatField()
+
+
+class TrackProgressSerializer(serializers.Serializer):
+    """Serializer for the progress of a track."""
+    track_id = serializers.IntegerField()
+    completed = serializers.IntegerField()
+    total = serializers.IntegerField()
+    percent = serializers.FloatField()
+    chapters = ChapterProgressSerializer(many=True)
+
+
+class UserDataProgressQuerySerializer(serializers.Serializer):
+    """Serializer for the query parameters of the progress API."""
+    track_id = serializers.IntegerField(
+        min_value=1, max_value=ID_MAX, required=False, allow_null=True,
+    )
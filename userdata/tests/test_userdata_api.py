@@ -0,0 +1,504 @@
+"""
+Tests for the userdata APIs.
+"""
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from rest_framework.authtoken.models import Token
+
+from core.models import Book, Profile, Task, Track, User_Data
+
+
+USERDATAS_URL = reverse('userdata:user_data-list')
+BULK_URL = reverse('userdata:user_data-bulk')
+PROGRESS_URL = reverse('userdata:user_data-progress')
+EXPORT_URL = reverse('userdata:user_data-export')
+ASYNC_USERDATAS_URL = reverse('userdata:async-user_data-list')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_track(pk):
+    """Create and return a track with the given id."""
+    leader = create_user(email=f'leader{pk}@example.com')
+    profile = Profile.objects.create(
+        user=leader,
+        nickname='leader',
+        subjects='math',
+        image_url='http://example.com/profile.png',
+    )
+    book = Book.objects.create(
+        title='Sample book',
+        sub_title='Sample sub title',
+        author='Author',
+        image_url='http://example.com/book.png',
+        isbn='9780000000000',
+        publisher='Publisher',
+    )
+
+    return Track.objects.create(
+        pk=pk,
+        leader=leader,
+        profile=profile,
+        book=book,
+        subject_major='math',
+        subject_minor='algebra',
+        target_test='sat',
+        target_grade='12',
+        track_name='Sample track',
+    )
+
+
+def create_task(track_id, order_major='1', order_minor='1'):
+    """Create and return a task of the given track."""
+    return Task.objects.create(
+        track_id=track_id,
+        order_major=order_major,
+        order_minor=order_minor,
+        task_name='Task',
+        ranges='1-10',
+        learning_time='30',
+        guideline='Read',
+        references='None',
+    )
+
+
+def create_user_data(user, **params):
+    """Create and return a userdata event."""
+    defaults = {
+        'track_id': 1,
+        'order_major': '1',
+        'order_minor': '1',
+        'is_done': False,
+    }
+    defaults.update(params)
+
+    return User_Data.objects.create(user=user, **defaults)
+
+
+class PublicUserDataApiTests(TestCase):
+    """Test unauthenticated userdata API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        """Test auth is required to call the API."""
+        res = self.client.get(USERDATAS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateUserDataApiTests(TestCase):
+    """Test authenticated userdata API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        create_track(1)
+
+    def test_list_limited_to_user(self):
+        """Test listing userdata only returns the user's own events."""
+        create_user_data(self.user)
+        create_user_data(create_user(email='other@example.com'))
+
+        res = self.client.get(USERDATAS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_list_sparse_fields(self):
+        """Test listing userdata with a sparse fieldset."""
+        create_user_data(self.user, is_done=True)
+
+        res = self.client.get(USERDATAS_URL, {'fields': 'track_id,is_done'})
+
+        self.assertEqual(
+            res.data['results'], [{'track_id': 1, 'is_done': True}],
+        )
+
+    def test_list_paginated_by_id(self):
+        """Test userdata pages stay stable when events are rewritten."""
+        now = timezone.now()
+        events = [
+            create_user_data(
+                self.user,
+                order_minor=str(index),
+                action_date=now - timedelta(days=index),
+            )
+            for index in range(3)
+        ]
+
+        res = self.client.get(USERDATAS_URL, {'page_size': 2})
+
+        self.assertEqual(
+            [event['id'] for event in res.data['results']],
+            [events[2].id, events[1].id],
+        )
+
+        User_Data.objects.filter(pk=events[0].pk).update(
+            action_date=now + timedelta(days=1),
+        )
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(
+            [event['id'] for event in res.data['results']],
+            [events[0].id],
+        )
+        self.assertIsNone(res.data['next'])
+
+
+class AsyncUserDataApiTests(TransactionTestCase):
+    """Test the async userdata views.
+
+    The async views query from worker threads, on connections that only
+    see committed rows.
+    """
+
+    def setUp(self):
+        self.user = create_user()
+        self.token = Token.objects.create(user=self.user)
+        create_track(1)
+        create_user_data(self.user)
+        create_user_data(create_user(email='other@example.com'))
+
+    async def test_auth_required(self):
+        """Test auth is required to call the async view."""
+        res = await self.async_client.get(ASYNC_USERDATAS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_list_limited_to_user(self):
+        """Test the async view lists only the user's userdata."""
+        res = await self.async_client.get(
+            ASYNC_USERDATAS_URL,
+            authorization=f'Token {self.token.key}',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.json()['results']), 1)
+
+    async def test_invalid_cursor(self):
+        """Test an invalid cursor returns 404 instead of failing."""
+        res = await self.async_client.get(
+            f'{ASYNC_USERDATAS_URL}?cursor=zzz',
+            authorization=f'Token {self.token.key}',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class UserDataProgressApiTests(TestCase):
+    """Test the userdata progress API."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        create_track(1)
+        create_track(2)
+
+    def test_progress_per_track_and_chapter(self):
+        """Test progress counts the tasks of each track and chapter."""
+        for minor in ('1', '2', '3'):
+            create_task(1, order_minor=minor)
+        create_task(1, order_major='2')
+        create_task(2)
+        create_user_data(self.user, order_minor='1', is_done=True)
+        create_user_data(self.user, order_minor='2', is_done=True)
+        create_user_data(self.user, order_major='2', is_done=False)
+        create_user_data(self.user, track_id=2, is_done=True)
+        create_user_data(
+            create_user(email='other@example.com'),
+            order_minor='3',
+            is_done=True,
+        )
+
+        with self.assertNumQueries(1):
+            res = self.client.get(PROGRESS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+        track = res.data[0]
+        self.assertEqual(track['track_id'], 1)
+        self.assertEqual(track['completed'], 2)
+        self.assertEqual(track['total'], 4)
+        self.assertEqual(track['percent'], 50.0)
+        self.assertEqual(
+            [(c['order_major'], c['percent']) for c in track['chapters']],
+            [('1', 66.67), ('2', 0.0)],
+        )
+        self.assertEqual(res.data[1]['percent'], 100.0)
+
+    def test_progress_matches_bundle(self):
+        """Test progress and the track bundle report the same totals."""
+        create_task(1, order_minor='1')
+        create_task(1, order_minor='2')
+        create_user_data(self.user, order_minor='1', is_done=True)
+        bundle_url = reverse('track:track-all-bundle', args=[1])
+
+        progress = self.client.get(PROGRESS_URL).data[0]
+        bundle = self.client.get(bundle_url).data['progress']
+
+        self.assertEqual(
+            (progress['completed'], progress['total'], progress['percent']),
+            (bundle['completed'], bundle['total'], bundle['percent']),
+        )
+
+    def test_progress_filtered_by_track(self):
+        """Test progress can be limited to one track."""
+        create_task(1)
+        create_task(2)
+        create_user_data(self.user, track_id=1)
+        create_user_data(self.user, track_id=2)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(PROGRESS_URL, {'track_id': 2})
+
+        self.assertEqual([t['track_id'] for t in res.data], [2])
+
+    def test_progress_invalid_track_id(self):
+        """Test a non integer track_id is rejected."""
+        res = self.client.get(PROGRESS_URL, {'track_id': 'abc'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('track_id', res.data)
+
+    def test_progress_out_of_range_track_id(self):
+        """Test a track_id too large for the column is rejected."""
+        res = self.client.get(
+            PROGRESS_URL, {'track_id': '100000000000000000000'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('track_id', res.data)
+
+
+class UserDataBulkApiTests(TestCase):
+    """Test the userdata bulk upsert API."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        create_track(1)
+
+    def _events(self, count, is_done=True, action_date=None):
+        """Return a payload of count events for one track."""
+        action_date = action_date or timezone.now()
+        return [
+            {
+                'track_id': 1,
+                'order_major': '1',
+                'order_minor': str(index),
+                'is_done': is_done,
+                'action_date': action_date.isoformat(),
+            }
+            for index in range(count)
+        ]
+
+    def test_bulk_create(self):
+        """Test a batch of events is created."""
+        res = self.client.post(BULK_URL, self._events(3), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'created': 3, 'updated': 0})
+        self.assertEqual(
+            User_Data.objects.filter(user=self.user, is_done=True).count(),
+            3,
+        )
+
+    def test_bulk_retry_is_idempotent(self):
+        """Test retrying a batch does not create duplicate rows."""
+        payload = self._events(3)
+        self.client.post(BULK_URL, payload, format='json')
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.data, {'created': 0, 'updated': 3})
+        self.assertEqual(User_Data.objects.filter(user=self.user).count(), 3)
+
+    def test_bulk_stale_event_ignored(self):
+        """Test an older event does not overwrite a newer one."""
+        now = timezone.now()
+        self.client.post(
+            BULK_URL, self._events(1, action_date=now), format='json',
+        )
+
+        res = self.client.post(
+            BULK_URL,
+            self._events(1, is_done=False, action_date=now - timedelta(1)),
+            format='json',
+        )
+
+        self.assertEqual(res.data, {'created': 0, 'updated': 0})
+        self.assertTrue(User_Data.objects.get(user=self.user).is_done)
+
+    def test_bulk_invalid_batch_rejected(self):
+        """Test a batch with an invalid event writes nothing."""
+        payload = self._events(2)
+        payload[1]['track_id'] = 'invalid'
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User_Data.objects.exists())
+
+    def test_bulk_unknown_track_rejected(self):
+        """Test a batch referencing a missing track writes nothing."""
+        payload = self._events(2)
+        payload[1]['track_id'] = 999
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User_Data.objects.exists())
+
+    def test_create_unknown_track_rejected(self):
+        """Test creating userdata for a missing track is rejected."""
+        payload = {'track_id': 999, 'order_major': '1', 'order_minor': '1'}
+
+        res = self.client.post(USERDATAS_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('track_id', res.data)
+
+    def test_track_id_out_of_range_rejected(self):
+        """Test track ids too large for the database are rejected."""
+        payload = self._events(1)
+        payload[0]['track_id'] = 10 ** 20
+
+        res = self.client.post(BULK_URL, payload, format='json')
+        single = self.client.post(USERDATAS_URL, payload[0], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(single.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('track_id', single.data)
+        self.assertFalse(User_Data.objects.exists())
+
+    def test_bulk_batch_size_limited(self):
+        """Test a batch larger than the limit is rejected."""
+        res = self.client.post(BULK_URL, self._events(501), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User_Data.objects.exists())
+
+    def test_create_existing_step_updates(self):
+        """Test posting a recorded step updates it instead of failing."""
+        create_user_data(self.user, is_done=False)
+        payload = {
+            'track_id': 1,
+            'order_major': '1',
+            'order_minor': '1',
+            'is_done': True,
+        }
+
+        res = self.client.post(USERDATAS_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(User_Data.objects.get(user=self.user).is_done)
+
+
+class UserDataExportTests(TestCase):
+    """Test the streaming userdata export."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        create_track(1)
+        now = timezone.now()
+        self.events = [
+            create_user_data(
+                self.user,
+                order_minor=str(index),
+                action_date=now - timedelta(days=index),
+                is_done=index == 0,
+            )
+            for index in range(3)
+        ]
+        self.other = create_user(email='other@example.com')
+        create_user_data(self.other)
+
+    def read(self, res):
+        """Return the body of a streaming response."""
+        self.assertTrue(res.streaming)
+
+        return b''.join(res.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        """Test the user's history is streamed as NDJSON, oldest first."""
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.read(res).splitlines()]
+        self.assertEqual(
+            [row['id'] for row in rows],
+            [event.id for event in reversed(self.events)],
+        )
+        self.assertEqual(rows[-1]['track_id'], 1)
+        self.assertTrue(rows[-1]['is_done'])
+        self.assertEqual(
+            rows[-1]['action_date'], self.events[0].action_date.isoformat(),
+        )
+
+    def test_export_csv(self):
+        """Test the history is streamed as CSV with a header row."""
+        res = self.client.get(EXPORT_URL, {'export_format': 'csv'})
+
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        self.assertIn('attachment', res['Content-Disposition'])
+        rows = list(csv.DictReader(StringIO(self.read(res))))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['id'], str(self.events[2].id))
+        self.assertEqual(rows[0]['user_id'], str(self.user.id))
+
+    def test_export_unknown_format(self):
+        """Test an unknown export format is rejected."""
+        res = self.client.get(EXPORT_URL, {'export_format': 'xml'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_other_user_staff_only(self):
+        """Test only staff can export the history of another user."""
+        res = self.client.get(EXPORT_URL, {'user': self.other.id})
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get(EXPORT_URL, {'user': self.other.id})
+
+        rows = self.read(res).splitlines()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(json.loads(rows[0])['user_id'], self.other.id)
+
+    def test_export_command(self):
+        """Test the command exports the history of a user."""
+        out = StringIO()
+
+        call_command(
+            'export_user_data', user=self.user.email, export_format='csv',
+            chunk_size=2, stdout=out,
+        )
+
+        rows = list(csv.DictReader(StringIO(out.getvalue())))
+        self.assertEqual(
+            [int(row['id']) for row in rows],
+            [event.id for event in reversed(self.events)],
+        )
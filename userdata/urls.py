@@ -8,7 +8,7 @@ from django.urls import (
 
 from rest_framework.routers import DefaultRouter
 
-from userdata import views
+from userdata import async_views, views
 
 
 router = DefaultRouter()
@@ -17,5 +17,10 @@ router.register('userdatas', views.UserDataViewSet)
 app_name = 'userdata'
 
 urlpatterns = [
+    path(
+        'async/userdatas/',
+        async_views.user_data_list,
+        name='async-user_data-list',
+    ),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,33 +1,158 @@
 """
 Views for the userdata APIs
 """
-from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
+from django.db import router
+from django.http import StreamingHttpResponse
+
+from drf_spectacular.utils import (
+    extend_schema,
+    OpenApiParameter,
+    OpenApiTypes,
+)
+
+from rest_framework import (
+    viewsets,
+    status,
+)
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
+from core.fieldsets import SparseFieldsetMixin
 from core.models import User_Data
+from core.pagination import UserDataCursorPagination
+from user.authentication import CachedTokenAuthentication
 from userdata import serializers
+from userdata.bulk import upsert_user_data
+from userdata.export import EXPORT_FORMATS, export_rows
+from userdata.progress import get_progress
 # Create your views here.
 
 
-class UserDataViewSet(viewsets.ModelViewSet):
+class UserDataViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """View for manage userdata APIs."""
     serializer_class = serializers.UserDataDetailSerializer
     queryset = User_Data.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = UserDataCursorPagination
+    bulk_max_size = 500
 
     def get_queryset(self):
         """Retrieve profiles for authenticated user."""
-        return self.queryset.filter(user=self.request.user).order_by('-id')
+        return super().get_queryset().filter(
+            user=self.request.user,
+        ).order_by('-id')
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
         if self.action == 'list':
             return serializers.UserDataSerializer
+        elif self.action == 'bulk':
+            return serializers.UserDataSerializer
+        elif self.action == 'progress':
+            return serializers.TrackProgressSerializer
 
         return self.serializer_class
 
     def perform_create(self, serializer):
         """Create a new userdata."""
-        serializer.save(user=self.request.user)
\ No newline at end of file
+        serializer.save(user=self.request.user)
+
+    @extend_schema(
+        request=serializers.UserDataSerializer(many=True),
+        responses=serializers.UserDataBulkResultSerializer,
+    )
+    @action(methods=['POST'], detail=False, url_path='bulk')
+    def bulk(self, request):
+        """Create or update a batch of userdata events."""
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            max_length=self.bulk_max_size,
+        )
+        serializer.is_valid(raise_exception=True)
+        created, updated = upsert_user_data(
+            request.user, serializer.validated_data,
+        )
+
+        result = serializers.UserDataBulkResultSerializer(
+            {'created': created, 'updated': updated},
+        )
+        return Response(result.data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'track_id',
+                OpenApiTypes.INT,
+                description='Only return the progress of this track.',
+            ),
+        ]
+    )
+    @action(methods=['GET'], detail=False, url_path='progress')
+    def progress(self, request):
+        """Return the user's progress per track and chapter."""
+        params = serializers.UserDataProgressQuerySerializer(
+            data=request.query_params,
+        )
+        params.is_valid(raise_exception=True)
+        progress = get_progress(
+            request.user, params.validated_data.get('track_id'),
+        )
+
+        serializer = self.get_serializer(progress, many=True)
+        return Response(serializer.data)
+
+    def get_export_user_id(self, request):
+        """Return the user to export, staff may name any user."""
+        user_id = request.query_params.get('user')
+        if user_id is None:
+            return request.user.pk
+        if not request.user.is_staff:
+            raise PermissionDenied('Only staff can export other users.')
+        try:
+            return int(user_id)
+        except ValueError:
+            raise ValidationError({'user': 'A valid integer is required.'})
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'export_format',
+                OpenApiTypes.STR,
+                enum=list(EXPORT_FORMATS),
+                description='Format of the export, ndjson by default.',
+            ),
+            OpenApiParameter(
+                'user',
+                OpenApiTypes.INT,
+                description='Export the history of this user, staff only.',
+            ),
+        ],
+        responses={200: OpenApiTypes.BINARY},
+    )
+    @action(methods=['GET'], detail=False, url_path='export')
+    def export(self, request):
+        """Stream the userdata history as NDJSON or CSV."""
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({
+                'export_format': f'Choose one of {", ".join(EXPORT_FORMATS)}.',
+            })
+        user_id = self.get_export_user_id(request)
+        # Rows are read while streaming, after the request has left the
+        # replica routing, so the database is chosen here.
+        queryset = User_Data.objects.using(
+            router.db_for_read(User_Data),
+        ).filter(user_id=user_id).order_by('action_date', 'id')
+
+        render, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(
+            render(export_rows(queryset)), content_type=content_type,
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="userdata-{user_id}.{export_format}"'
+        )
+        return response